@@ -0,0 +1,37 @@
+"""Per-stage timings of video processing jobs
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_stats",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("video_id", UUID(as_uuid=True), sa.ForeignKey("videos.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("model_tier", sa.String(20)),
+        sa.Column("cache_hit", sa.Boolean, nullable=False, server_default="false"),
+        sa.Column("frame_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("wall_s", sa.Float, nullable=False),
+        sa.Column("stages", JSONB, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("idx_job_stats_video_id", "job_stats", ["video_id"])
+    op.create_index("idx_job_stats_created_at", "job_stats", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("job_stats")
@@ -0,0 +1,70 @@
+"""Store pose_frames.landmarks as packed float32 bytea
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16
+
+Each frame's 33 (x, y, z, visibility) landmarks become 528 bytes of
+little-endian float32 instead of a JSONB array of objects. Existing rows
+are converted in batches.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+FIELDS = ("x", "y", "z", "visibility")
+
+
+def _convert(source: str, target: str, target_type: sa.types.TypeEngine, convert) -> None:
+    """Fill ``target`` from ``source`` for every row, keyset-paginated by id."""
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        query = f"SELECT id, {source} FROM pose_frames"
+        if last_id is not None:
+            query += " WHERE id > :last_id"
+        query += " ORDER BY id LIMIT :limit"
+        rows = conn.execute(sa.text(query), {"last_id": last_id, "limit": BATCH_SIZE}).all()
+        if not rows:
+            break
+        conn.execute(
+            sa.text(f"UPDATE pose_frames SET {target} = :value WHERE id = :id").bindparams(
+                sa.bindparam("value", type_=target_type),
+            ),
+            [{"id": row_id, "value": convert(value)} for row_id, value in rows],
+        )
+        last_id = rows[-1][0]
+
+
+def _pack(landmarks: list[dict]) -> bytes:
+    return np.array([[lm[f] for f in FIELDS] for lm in landmarks], dtype="<f4").tobytes()
+
+
+def _unpack(data: bytes) -> list[dict]:
+    return [
+        dict(zip(FIELDS, values))
+        for values in np.frombuffer(data, dtype="<f4").reshape(-1, len(FIELDS)).tolist()
+    ]
+
+
+def upgrade() -> None:
+    op.add_column("pose_frames", sa.Column("landmarks_packed", sa.LargeBinary))
+    _convert("landmarks", "landmarks_packed", sa.LargeBinary(), _pack)
+    op.drop_column("pose_frames", "landmarks")
+    op.alter_column("pose_frames", "landmarks_packed", new_column_name="landmarks", nullable=False)
+
+
+def downgrade() -> None:
+    op.add_column("pose_frames", sa.Column("landmarks_json", JSONB))
+    _convert("landmarks", "landmarks_json", JSONB(), _unpack)
+    op.drop_column("pose_frames", "landmarks")
+    op.alter_column("pose_frames", "landmarks_json", new_column_name="landmarks", nullable=False)
@@ -0,0 +1,30 @@
+"""Tombstone columns for asynchronous deletes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("sessions", "videos"):
+        op.add_column(table, sa.Column("deleted_at", sa.DateTime(timezone=True)))
+        op.create_index(
+            f"idx_{table}_deleted_at", table, ["deleted_at"],
+            postgresql_where=sa.text("deleted_at IS NOT NULL"),
+        )
+
+
+def downgrade() -> None:
+    for table in ("sessions", "videos"):
+        op.drop_index(f"idx_{table}_deleted_at", table_name=table)
+        op.drop_column(table, "deleted_at")
@@ -1,9 +1,14 @@
 import sys
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 
+_import_start = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 # Ensure the kinstretch package is importable from the project root
@@ -11,14 +16,23 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from app.config import settings
 from app.routers import measurements, poses, sessions, users, videos, ws
+from app.services import pose_service, purger, startup, track_cache
+
+startup.phase_timings["import_app"] = round(time.perf_counter() - _import_start, 4)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Download MediaPipe model on startup if not present
-    from kinstretch.pose_extraction import download_model
-    download_model(settings.MODEL_DIR)
+    # Model download and warm-up run in the background; /api/ready reports
+    # when they are done so the server can take requests immediately.
+    with startup.timed_phase("lifespan_startup"):
+        startup.start_model_preparation()
+        if settings.PURGER_ENABLED:
+            purger.start_purger()
     yield
+    if settings.PURGER_ENABLED:
+        purger.stop_purger()
+    pose_service.close_model_pool()
 
 
 app = FastAPI(
@@ -27,6 +41,17 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+class _GZipExceptUploads(GZipMiddleware):
+    """GZip responses other than /uploads, whose media is already compressed and served with Range requests."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/uploads/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(_GZipExceptUploads, minimum_size=settings.GZIP_MIN_SIZE, compresslevel=settings.GZIP_LEVEL)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -48,3 +73,33 @@ app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads"
 @app.get("/api/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/api/ready")
+async def ready():
+    if not startup.models_ready.is_set():
+        return JSONResponse({"status": "starting"}, status_code=503)
+    if startup.models_error is not None:
+        return JSONResponse({"status": "failed", "error": startup.models_error}, status_code=503)
+    return {"status": "ready"}
+
+
+@app.get("/api/health/startup")
+def startup_report(imports: bool = False):
+    """Startup phase timings; ``?imports=true`` adds a per-module import-time report."""
+    report = {"phases": startup.phase_timings}
+    if imports:
+        report["imports"] = startup.cached_import_time_report()
+    return report
+
+
+@app.get("/api/health/purge")
+def purge_report():
+    """Background purge counters: rows deleted, files and bytes reclaimed, pending tombstones."""
+    return purger.metrics()
+
+
+@app.get("/api/health/track-cache")
+def track_cache_report():
+    """Pose track cache counters: hits, misses, evictions, entries and bytes used."""
+    return track_cache.metrics()
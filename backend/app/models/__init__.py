@@ -0,0 +1,18 @@
+from app.models.job_stats import JobStats
+from app.models.measurement import Measurement
+from app.models.pose_frame import PoseFrame
+from app.models.pose_track import PoseTrack
+from app.models.session import AnalysisSession
+from app.models.user import User
+from app.models.video import SourceType, Video
+
+__all__ = [
+    "AnalysisSession",
+    "JobStats",
+    "Measurement",
+    "PoseFrame",
+    "PoseTrack",
+    "SourceType",
+    "User",
+    "Video",
+]
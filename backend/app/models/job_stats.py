@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class JobStats(Base):
+    __tablename__ = "job_stats"
+    __table_args__ = (
+        Index("idx_job_stats_video_id", "video_id"),
+        Index("idx_job_stats_created_at", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"),
+    )
+    video_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False,
+    )
+    status: Mapped[str] = mapped_column(String(50), nullable=False)
+    model_tier: Mapped[str | None] = mapped_column(String(20))
+    cache_hit: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
+    frame_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    wall_s: Mapped[float] = mapped_column(Float, nullable=False)
+    # {stage: {total_s, count, mean_ms, max_ms}} from kinstretch.timing.StageTimer
+    stages: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class Measurement(Base):
+    __tablename__ = "measurements"
+    __table_args__ = (
+        Index("idx_measurements_session_id", "session_id"),
+        Index("idx_measurements_video_id", "video_id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"),
+    )
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False,
+    )
+    video_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False,
+    )
+    frame_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    frame_timestamp_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    joint_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    edge_a: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    edge_b: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    angle_degrees: Mapped[float] = mapped_column(Float, nullable=False)
+    label: Mapped[str | None] = mapped_column(String(255))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,27 @@
+import uuid
+
+from sqlalchemy import ForeignKey, Index, Integer, LargeBinary, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class PoseFrame(Base):
+    __tablename__ = "pose_frames"
+    __table_args__ = (
+        UniqueConstraint("video_id", "frame_index"),
+        Index("idx_pose_frames_video_id", "video_id"),
+        Index("idx_pose_frames_video_ts", "video_id", "timestamp_ms"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"),
+    )
+    video_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False,
+    )
+    frame_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    timestamp_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    # 33 packed (x, y, z, visibility) float32 tuples; see app.services.landmark_codec
+    landmarks: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
@@ -0,0 +1,46 @@
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class SourceType(str, enum.Enum):
+    upload = "upload"
+    youtube = "youtube"
+    webcam = "webcam"
+
+
+class Video(Base):
+    __tablename__ = "videos"
+    __table_args__ = (
+        Index("idx_videos_session_id", "session_id"),
+        Index("idx_videos_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"),
+    )
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False,
+    )
+    # Stored as plain VARCHAR (no Postgres enum type)
+    source_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    url: Mapped[str | None] = mapped_column(Text)
+    file_path: Mapped[str | None] = mapped_column(Text)
+    title: Mapped[str | None] = mapped_column(String(500))
+    creator: Mapped[str | None] = mapped_column(String(255))
+    duration_ms: Mapped[int | None] = mapped_column(Integer)
+    frame_count: Mapped[int | None] = mapped_column(Integer)
+    status: Mapped[str] = mapped_column(String(50), nullable=False, default="pending", server_default="pending")
+    error_message: Mapped[str | None] = mapped_column(Text)
+    # Bumped whenever pose frames or the track file are written; part of the
+    # poses endpoints' ETag
+    pose_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Set by DELETE; the purger removes pose frames, files and the row later
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -6,8 +6,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.measurement import Measurement
-from app.models.pose_frame import PoseFrame
+from app.models.video import Video
 from app.schemas.measurement import AngleCalcRequest, AngleCalcResponse, MeasurementCreate, MeasurementRead
+from app.services import landmark_codec, track_store
 from app.services.angle_service import JOINT_NAMES, calculate_angle, get_edge_name
 
 router = APIRouter()
@@ -15,18 +16,14 @@ router = APIRouter()
 
 @router.post("/calculate", response_model=AngleCalcResponse)
 async def calculate_angle_endpoint(body: AngleCalcRequest, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(PoseFrame).where(
-            PoseFrame.video_id == body.video_id,
-            PoseFrame.frame_index == body.frame_index,
-        )
-    )
-    frame = result.scalar_one_or_none()
-    if not frame:
+    frame = await track_store.load_frame(db, body.video_id, body.frame_index)
+    if frame is None:
         raise HTTPException(404, "Pose frame not found")
 
     try:
-        joint_idx, angle_deg = calculate_angle(frame.landmarks, body.edge_a, body.edge_b)
+        joint_idx, angle_deg = calculate_angle(
+            landmark_codec.to_dicts(frame[1]), body.edge_a, body.edge_b,
+        )
     except ValueError as e:
         raise HTTPException(400, str(e))
 
@@ -64,7 +61,12 @@ async def list_measurements(
     video_id: uuid.UUID | None = Query(None),
     db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(Measurement).order_by(Measurement.created_at.desc())
+    stmt = (
+        select(Measurement)
+        .join(Video, Video.id == Measurement.video_id)
+        .where(Video.deleted_at.is_(None))
+        .order_by(Measurement.created_at.desc())
+    )
     if session_id:
         stmt = stmt.where(Measurement.session_id == session_id)
     if video_id:
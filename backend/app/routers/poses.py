@@ -1,76 +1,236 @@
+import asyncio
+import hashlib
+import json
 import uuid
+from collections.abc import AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+import numpy as np
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
-from app.models.pose_frame import PoseFrame
 from app.models.video import Video
 from app.schemas.pose import PoseDataResponse, PoseFrameRead
+from app.services import landmark_codec, pose_payload, pose_service, track_store
 
 router = APIRouter()
 
+# Upper bound on ``limit`` for one page of GET /videos/{id}/poses
+MAX_PAGE_FRAMES = 10_000
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _cache_headers(video: Video, representation: str) -> dict[str, str]:
+    """ETag and Cache-Control for pose data of ``video`` in one representation.
+
+    The ETag combines the video id, its ``pose_version`` (bumped on every
+    frame or track write) and the representation (format and query). It is
+    weak because GZipMiddleware sends the same body gzipped or not, and a
+    strong validator would have to differ between the two codings.
+    Completed uploads and YouTube imports don't change after processing, so
+    caches may reuse them for POSE_HTTP_MAX_AGE_S; anything still being
+    processed, and webcam videos, which can record another take at any
+    time, must be revalidated on every use.
+    """
+    headers = {"Vary": "Accept"}
+    if video.status != "completed":
+        headers["Cache-Control"] = "no-cache"
+        return headers
+    version = f"{video.id}:{video.pose_version}:{representation}"
+    headers["ETag"] = 'W/"' + hashlib.blake2b(version.encode(), digest_size=16).hexdigest() + '"'
+    if video.source_type == "webcam":
+        headers["Cache-Control"] = "no-cache"
+    else:
+        headers["Cache-Control"] = f"public, max-age={settings.POSE_HTTP_MAX_AGE_S}"
+    return headers
+
+
+def _not_modified(if_none_match: str | None, headers: dict[str, str]) -> Response | None:
+    """A 304 response if ``If-None-Match`` matches the ETag in ``headers``."""
+    etag = headers.get("ETag")
+    if etag is None or if_none_match is None:
+        return None
+    # If-None-Match uses weak comparison
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    if etag.removeprefix("W/") in tags or "*" in tags:
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def _ndjson_lines(frames: list[dict]) -> list[str]:
+    return [json.dumps(f, separators=(",", ":")) + "\n" for f in frames]
+
+
+async def _stream_track(
+    video_id: uuid.UUID, limit: int | None = None, paged: bool = False, **kwargs,
+) -> AsyncIterator[str]:
+    """Stream a track as NDJSON; a paged read ends with a ``{"next_cursor": ...}`` line."""
+    sent = 0
+    last_frame = next_cursor = None
+    async for frame_indices, timestamps_ms, landmarks in track_store.iter_track(
+        video_id, limit=None if limit is None else limit + 1, **kwargs,
+    ):
+        if limit is not None and sent + len(frame_indices) > limit:
+            # The extra frame only tells that another page follows
+            keep = limit - sent
+            frame_indices, timestamps_ms, landmarks = frame_indices[:keep], timestamps_ms[:keep], landmarks[:keep]
+            next_cursor = int(frame_indices[-1]) if keep else last_frame
+        if len(frame_indices):
+            sent += len(frame_indices)
+            last_frame = int(frame_indices[-1])
+            yield "".join(_ndjson_lines(pose_service.track_records(frame_indices, timestamps_ms, landmarks)))
+    if paged:
+        yield json.dumps({"next_cursor": next_cursor}) + "\n"
+
+
+def _render(
+    video_id: uuid.UUID,
+    frame_indices: np.ndarray,
+    timestamps_ms: np.ndarray,
+    landmarks: np.ndarray,
+    rate_hz: float | None,
+    smooth: bool,
+    stride: int,
+    next_cursor: int | None,
+    fmt: str,
+) -> PoseDataResponse | bytes | list[str]:
+    """Smooth/resample a loaded track and serialize it as ``fmt`` (json, binary or ndjson)."""
+    frame_indices, timestamps_ms, landmarks = pose_service.transform_track(
+        frame_indices, timestamps_ms, landmarks, rate_hz=rate_hz, smooth=smooth,
+    )
+    if smooth and rate_hz is None:
+        frame_indices, timestamps_ms, landmarks = (
+            frame_indices[::stride], timestamps_ms[::stride], landmarks[::stride]
+        )
+    if fmt == "binary":
+        return pose_payload.encode(frame_indices, timestamps_ms, landmarks, next_cursor)
+    frames = pose_service.track_records(frame_indices, timestamps_ms, landmarks)
+    if fmt == "ndjson":
+        return _ndjson_lines(frames)
+    return PoseDataResponse(
+        video_id=video_id,
+        frame_count=len(frames),
+        frames=[PoseFrameRead(**f) for f in frames],
+        next_cursor=next_cursor,
+    )
+
 
 @router.get("/videos/{video_id}/poses", response_model=PoseDataResponse)
 async def get_poses(
     video_id: uuid.UUID,
+    response: Response,
     start_ms: int | None = Query(None),
     stop_ms: int | None = Query(None),
     stride: int = Query(1, ge=1),
+    rate_hz: float | None = Query(None, gt=0, le=240),
+    smooth: bool = Query(False),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_FRAMES),
+    cursor: int | None = Query(None, description="Return frames after this frame_index"),
+    accept: str | None = Header(None),
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
+    """Return the stored pose track, optionally smoothed and/or resampled.
+
+    ``rate_hz`` interpolates the sparse stored frames onto a regular grid at
+    that rate (``stride`` is then ignored); ``smooth`` filters landmark jitter.
+    ``limit`` and ``cursor`` page through the raw (optionally strided) track:
+    pass the response's ``next_cursor`` back as ``cursor`` until it is null.
+
+    With ``Accept: application/x-ndjson`` the frames are streamed instead,
+    one ``PoseFrameRead`` JSON object per line, as they are read from the
+    track file or a server-side cursor over ``pose_frames``; with ``limit``
+    or ``cursor`` the stream ends with a ``{"next_cursor": ...}`` line. With
+    ``Accept: application/vnd.kinstretch.poses`` (or
+    ``application/octet-stream``) the track is sent in the binary layout of
+    :mod:`app.services.pose_payload`.
+
+    Responses for completed videos carry an ETag; a matching
+    ``If-None-Match`` gets a 304 before any pose data is read.
+    """
     video = await db.get(Video, video_id)
-    if not video:
+    if not video or video.deleted_at is not None:
         raise HTTPException(404, "Video not found")
 
-    stmt = (
-        select(PoseFrame)
-        .where(PoseFrame.video_id == video_id)
-        .order_by(PoseFrame.frame_index)
+    paged = limit is not None or cursor is not None
+    if paged and (smooth or rate_hz is not None):
+        raise HTTPException(400, "limit and cursor cannot be combined with smooth or rate_hz")
+
+    accept = accept or ""
+    stream = NDJSON_MEDIA_TYPE in accept
+    binary_type = None if stream else next((t for t in pose_payload.ACCEPTED_MEDIA_TYPES if t in accept), None)
+    binary = binary_type is not None
+    fmt = "ndjson" if stream else binary_type if binary else "json"
+    headers = _cache_headers(
+        video, f"poses:{fmt}:{start_ms}:{stop_ms}:{stride}:{rate_hz}:{smooth}:{limit}:{cursor}",
     )
-    if start_ms is not None:
-        stmt = stmt.where(PoseFrame.timestamp_ms >= start_ms)
-    if stop_ms is not None:
-        stmt = stmt.where(PoseFrame.timestamp_ms <= stop_ms)
+    if (not_modified := _not_modified(if_none_match, headers)) is not None:
+        return not_modified
 
-    result = await db.execute(stmt)
-    all_frames = result.scalars().all()
+    if stream and rate_hz is None and not smooth:
+        return StreamingResponse(
+            _stream_track(
+                video_id, limit=limit, paged=paged, start_ms=start_ms, stop_ms=stop_ms,
+                stride=stride, after_frame=cursor,
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
 
-    # Apply stride
-    frames = all_frames[::stride]
+    if rate_hz is None and not smooth:
+        # Stride and paging are applied while loading, so skipped frames are never read
+        frame_indices, timestamps_ms, landmarks = await track_store.load_track(
+            db, video_id, start_ms, stop_ms,
+            stride=stride, after_frame=cursor, limit=None if limit is None else limit + 1,
+        )
+    else:
+        frame_indices, timestamps_ms, landmarks = await track_store.load_track(db, video_id, start_ms, stop_ms)
 
-    return PoseDataResponse(
-        video_id=video_id,
-        frame_count=len(frames),
-        frames=[
-            PoseFrameRead(
-                frame_index=f.frame_index,
-                timestamp_ms=f.timestamp_ms,
-                landmarks=f.landmarks,
-            )
-            for f in frames
-        ],
+    next_cursor = None
+    if limit is not None and len(frame_indices) > limit:
+        frame_indices, timestamps_ms, landmarks = frame_indices[:limit], timestamps_ms[:limit], landmarks[:limit]
+        next_cursor = int(frame_indices[-1])
+
+    # Smoothing and serializing a long track is CPU-bound; keep it off the event loop
+    body = await asyncio.to_thread(
+        _render, video_id, frame_indices, timestamps_ms, landmarks,
+        rate_hz, smooth, stride, next_cursor, "binary" if binary else "ndjson" if stream else "json",
     )
+    if binary:
+        return Response(body, media_type=binary_type, headers=headers)
+    if stream:
+        # Smoothing and resampling need the whole range, so only the
+        # serialization is streamed
+        return StreamingResponse(iter(body), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    response.headers.update(headers)
+    return body
 
 
 @router.get("/videos/{video_id}/poses/{frame_index}", response_model=PoseFrameRead)
 async def get_single_frame(
     video_id: uuid.UUID,
     frame_index: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(PoseFrame).where(
-            PoseFrame.video_id == video_id,
-            PoseFrame.frame_index == frame_index,
-        )
-    )
-    frame = result.scalar_one_or_none()
-    if not frame:
+    video = await db.get(Video, video_id)
+    if not video or video.deleted_at is not None:
+        raise HTTPException(404, "Video not found")
+    headers = _cache_headers(video, f"frame:{frame_index}")
+    if (not_modified := _not_modified(if_none_match, headers)) is not None:
+        return not_modified
+
+    frame = await track_store.load_frame(db, video_id, frame_index)
+    if frame is None:
         raise HTTPException(404, "Frame not found")
+    timestamp_ms, landmarks = frame
+    response.headers.update(headers)
     return PoseFrameRead(
-        frame_index=frame.frame_index,
-        timestamp_ms=frame.timestamp_ms,
-        landmarks=frame.landmarks,
+        frame_index=frame_index,
+        timestamp_ms=timestamp_ms,
+        landmarks=landmark_codec.to_dicts(landmarks),
     )
@@ -1,13 +1,14 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.session import AnalysisSession
 from app.models.video import Video
 from app.schemas.session import SessionCreate, SessionRead, SessionUpdate
+from app.services import purger, track_cache
 
 router = APIRouter()
 
@@ -36,7 +37,8 @@ async def list_sessions(user_id: uuid.UUID | None = None, db: AsyncSession = Dep
             AnalysisSession,
             func.count(Video.id).label("video_count"),
         )
-        .outerjoin(Video, Video.session_id == AnalysisSession.id)
+        .outerjoin(Video, (Video.session_id == AnalysisSession.id) & Video.deleted_at.is_(None))
+        .where(AnalysisSession.deleted_at.is_(None))
         .group_by(AnalysisSession.id)
         .order_by(AnalysisSession.created_at.desc())
     )
@@ -62,10 +64,10 @@ async def list_sessions(user_id: uuid.UUID | None = None, db: AsyncSession = Dep
 @router.get("/{session_id}", response_model=SessionRead)
 async def get_session(session_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     session = await db.get(AnalysisSession, session_id)
-    if not session:
+    if not session or session.deleted_at is not None:
         raise HTTPException(404, "Session not found")
     count_result = await db.execute(
-        select(func.count(Video.id)).where(Video.session_id == session_id)
+        select(func.count(Video.id)).where(Video.session_id == session_id, Video.deleted_at.is_(None))
     )
     video_count = count_result.scalar() or 0
     return SessionRead(
@@ -82,7 +84,7 @@ async def get_session(session_id: uuid.UUID, db: AsyncSession = Depends(get_db))
 @router.patch("/{session_id}", response_model=SessionRead)
 async def update_session(session_id: uuid.UUID, body: SessionUpdate, db: AsyncSession = Depends(get_db)):
     session = await db.get(AnalysisSession, session_id)
-    if not session:
+    if not session or session.deleted_at is not None:
         raise HTTPException(404, "Session not found")
     if body.title is not None:
         session.title = body.title
@@ -103,8 +105,18 @@ async def update_session(session_id: uuid.UUID, body: SessionUpdate, db: AsyncSe
 
 @router.delete("/{session_id}", status_code=204)
 async def delete_session(session_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Tombstone the session and its videos; they are purged in the background."""
     session = await db.get(AnalysisSession, session_id)
-    if not session:
+    if not session or session.deleted_at is not None:
         raise HTTPException(404, "Session not found")
-    await db.delete(session)
+    session.deleted_at = func.now()
+    video_ids = (await db.execute(
+        update(Video)
+        .where(Video.session_id == session_id, Video.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+        .returning(Video.id)
+    )).scalars().all()
     await db.commit()
+    for video_id in video_ids:
+        track_cache.invalidate(video_id)
+    purger.wake()
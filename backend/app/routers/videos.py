@@ -2,19 +2,27 @@ import uuid
 from pathlib import Path
 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, UploadFile
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.models.job_stats import JobStats
 from app.models.video import SourceType, Video
-from app.schemas.video import TaskStatusResponse, VideoRead, VideoUpdateRequest, WebcamCreateRequest, YouTubeImportRequest
-from app.services import video_service
+from app.schemas.video import JobStatsRead, ModelTier, TaskStatusResponse, VideoRead, VideoUpdateRequest, WebcamCreateRequest, YouTubeImportRequest
+from app.services import model_tiers, purger, track_cache, video_service
 from app.services.task_manager import TaskStatus, create_task, get_task
 from app.tasks.video_processing import process_video_task
 
 router = APIRouter()
 
 
+def _check_model_tier(model_tier: str | None) -> None:
+    try:
+        model_tiers.check_tier(model_tier)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
 @router.post("/upload", response_model=VideoRead, status_code=201)
 async def upload_video(
     background_tasks: BackgroundTasks,
@@ -22,9 +30,11 @@ async def upload_video(
     title: str | None = Form(None),
     start_s: float | None = Form(None),
     stop_s: float | None = Form(None),
+    model_tier: ModelTier | None = Form(None),
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
 ):
+    _check_model_tier(model_tier)
     file_bytes = await file.read()
     file_path = video_service.save_upload(file_bytes, file.filename or "video.mp4")
 
@@ -43,7 +53,10 @@ async def upload_video(
     await db.refresh(video)
 
     create_task(video.id)
-    background_tasks.add_task(process_video_task, video.id, "upload", None, str(file_path), start_s, stop_s)
+    background_tasks.add_task(
+        process_video_task, video.id, "upload", None, str(file_path), start_s, stop_s,
+        model_tier=model_tier,
+    )
 
     return video
 
@@ -54,6 +67,7 @@ async def import_youtube(
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
+    _check_model_tier(body.model_tier)
     video = Video(
         session_id=body.session_id,
         source_type=SourceType.youtube,
@@ -66,7 +80,10 @@ async def import_youtube(
     await db.refresh(video)
 
     create_task(video.id)
-    background_tasks.add_task(process_video_task, video.id, "youtube", body.url, None, body.start_s, body.stop_s)
+    background_tasks.add_task(
+        process_video_task, video.id, "youtube", body.url, None, body.start_s, body.stop_s,
+        model_tier=body.model_tier,
+    )
 
     return video
 
@@ -87,7 +104,7 @@ async def create_webcam_video(body: WebcamCreateRequest, db: AsyncSession = Depe
 
 @router.get("", response_model=list[VideoRead])
 async def list_videos(session_id: uuid.UUID | None = None, db: AsyncSession = Depends(get_db)):
-    stmt = select(Video).order_by(Video.created_at.desc())
+    stmt = select(Video).where(Video.deleted_at.is_(None)).order_by(Video.created_at.desc())
     if session_id:
         stmt = stmt.where(Video.session_id == session_id)
     result = await db.execute(stmt)
@@ -97,7 +114,7 @@ async def list_videos(session_id: uuid.UUID | None = None, db: AsyncSession = De
 @router.get("/{video_id}", response_model=VideoRead)
 async def get_video(video_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     video = await db.get(Video, video_id)
-    if not video:
+    if not video or video.deleted_at is not None:
         raise HTTPException(404, "Video not found")
     return video
 
@@ -111,10 +128,11 @@ async def get_video_status(video_id: uuid.UUID, db: AsyncSession = Depends(get_d
             status=task.status.value,
             progress_pct=task.progress_pct,
             error=task.error,
+            model_tier=task.model_tier,
         )
     # Fallback to DB status
     video = await db.get(Video, video_id)
-    if not video:
+    if not video or video.deleted_at is not None:
         raise HTTPException(404, "Video not found")
     return TaskStatusResponse(
         video_id=video_id,
@@ -124,10 +142,22 @@ async def get_video_status(video_id: uuid.UUID, db: AsyncSession = Depends(get_d
     )
 
 
+@router.get("/{video_id}/stats", response_model=list[JobStatsRead])
+async def get_video_stats(video_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Per-stage timings of every processing run of this video, newest first."""
+    video = await db.get(Video, video_id)
+    if not video or video.deleted_at is not None:
+        raise HTTPException(404, "Video not found")
+    result = await db.execute(
+        select(JobStats).where(JobStats.video_id == video_id).order_by(JobStats.created_at.desc())
+    )
+    return result.scalars().all()
+
+
 @router.patch("/{video_id}", response_model=VideoRead)
 async def update_video(video_id: uuid.UUID, body: VideoUpdateRequest, db: AsyncSession = Depends(get_db)):
     video = await db.get(Video, video_id)
-    if not video:
+    if not video or video.deleted_at is not None:
         raise HTTPException(404, "Video not found")
     if body.title is not None:
         video.title = body.title
@@ -138,8 +168,11 @@ async def update_video(video_id: uuid.UUID, body: VideoUpdateRequest, db: AsyncS
 
 @router.delete("/{video_id}", status_code=204)
 async def delete_video(video_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Tombstone the video; its pose frames and files are purged in the background."""
     video = await db.get(Video, video_id)
-    if not video:
+    if not video or video.deleted_at is not None:
         raise HTTPException(404, "Video not found")
-    await db.delete(video)
+    video.deleted_at = func.now()
     await db.commit()
+    track_cache.invalidate(video_id)
+    purger.wake()
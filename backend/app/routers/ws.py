@@ -1,14 +1,39 @@
 import uuid
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_sync_db
-from app.models.pose_frame import PoseFrame as PoseFrameORM
+from app.models.pose_frame import PoseFrame
 from app.models.video import Video as VideoORM
+from app.services import frame_writer, landmark_codec, track_cache
 
 router = APIRouter()
 
 
+def _update_totals(db: Session, video: VideoORM) -> None:
+    """Set frame_count and duration_ms from every stored frame, not just the last buffer."""
+    frame_count, duration_ms = db.execute(
+        select(func.count(), func.max(PoseFrame.timestamp_ms)).where(PoseFrame.video_id == video.id)
+    ).one()
+    video.frame_count = frame_count
+    video.duration_ms = duration_ms or 0
+
+
+def _parse_frame(data: dict) -> dict:
+    """Validate a pose_frame message and pack its landmarks; raises ValueError if malformed."""
+    try:
+        return {
+            "frame_index": int(data["frame_index"]),
+            "timestamp_ms": int(data["timestamp_ms"]),
+            "landmarks": landmark_codec.to_array(data["landmarks"]),
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid pose_frame: {e!r}") from e
+
+
 @router.websocket("/ws/pose-stream/{video_id}")
 async def pose_stream(websocket: WebSocket, video_id: uuid.UUID):
     await websocket.accept()
@@ -32,47 +57,41 @@ async def pose_stream(websocket: WebSocket, video_id: uuid.UUID):
                 # Bulk insert buffered frames using sync session (runs in thread)
                 db = get_sync_db()
                 try:
-                    for f in frames_buffer:
-                        db.add(PoseFrameORM(
-                            video_id=video_id,
-                            frame_index=f["frame_index"],
-                            timestamp_ms=f["timestamp_ms"],
-                            landmarks=f["landmarks"],
-                        ))
+                    frame_writer.insert_frames(db, video_id, frames_buffer)
                     video = db.get(VideoORM, video_id)
+                    totals = {"frame_count": 0, "duration_ms": 0}
                     if video:
-                        video.frame_count = len(frames_buffer)
-                        video.duration_ms = frames_buffer[-1]["timestamp_ms"] if frames_buffer else 0
+                        _update_totals(db, video)
                         video.status = "completed"
+                        totals = {"frame_count": video.frame_count, "duration_ms": video.duration_ms}
                     db.commit()
                 finally:
                     db.close()
+                track_cache.invalidate(video_id)
 
-                await websocket.send_json({
-                    "type": "recording_stopped",
-                    "frame_count": len(frames_buffer),
-                    "duration_ms": frames_buffer[-1]["timestamp_ms"] if frames_buffer else 0,
-                })
+                await websocket.send_json({"type": "recording_stopped", **totals})
                 frames_buffer = []
 
             elif msg_type == "pose_frame":
+                # A malformed frame is dropped, not allowed to fail the
+                # buffer's insert and close the socket
+                try:
+                    frame = _parse_frame(data)
+                except ValueError as e:
+                    await websocket.send_json({"type": "error", "message": str(e)})
+                    continue
                 frame_count += 1
                 if recording:
-                    frames_buffer.append(data)
+                    frames_buffer.append(frame)
                     # Periodic flush for long sessions
-                    if len(frames_buffer) >= 500:
+                    if len(frames_buffer) >= settings.POSE_INSERT_BATCH_SIZE:
                         db = get_sync_db()
                         try:
-                            for f in frames_buffer:
-                                db.add(PoseFrameORM(
-                                    video_id=video_id,
-                                    frame_index=f["frame_index"],
-                                    timestamp_ms=f["timestamp_ms"],
-                                    landmarks=f["landmarks"],
-                                ))
+                            frame_writer.insert_frames(db, video_id, frames_buffer)
                             db.commit()
                         finally:
                             db.close()
+                        track_cache.invalidate(video_id)
                         frames_buffer = []
 
                 if frame_count % 30 == 0:
@@ -83,17 +102,12 @@ async def pose_stream(websocket: WebSocket, video_id: uuid.UUID):
         if frames_buffer:
             db = get_sync_db()
             try:
-                for f in frames_buffer:
-                    db.add(PoseFrameORM(
-                        video_id=video_id,
-                        frame_index=f["frame_index"],
-                        timestamp_ms=f["timestamp_ms"],
-                        landmarks=f["landmarks"],
-                    ))
+                frame_writer.insert_frames(db, video_id, frames_buffer)
                 video = db.get(VideoORM, video_id)
                 if video:
-                    video.frame_count = (video.frame_count or 0) + len(frames_buffer)
+                    _update_totals(db, video)
                     video.status = "completed"
                 db.commit()
             finally:
                 db.close()
+            track_cache.invalidate(video_id)
@@ -22,3 +22,5 @@ class PoseDataResponse(BaseModel):
     video_id: uuid.UUID
     frame_count: int
     frames: list[PoseFrameRead]
+    # frame_index to pass as ``cursor`` for the next page; None on the last page
+    next_cursor: int | None = None
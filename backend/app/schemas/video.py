@@ -1,8 +1,11 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel
 
+ModelTier = Literal["auto", "lite", "full", "heavy"]
+
 
 class YouTubeImportRequest(BaseModel):
     session_id: uuid.UUID
@@ -10,6 +13,7 @@ class YouTubeImportRequest(BaseModel):
     title: str | None = None
     start_s: float | None = None
     stop_s: float | None = None
+    model_tier: ModelTier | None = None
 
 
 class VideoUpdateRequest(BaseModel):
@@ -43,3 +47,25 @@ class TaskStatusResponse(BaseModel):
     status: str
     progress_pct: float
     error: str | None = None
+    model_tier: str | None = None
+
+
+class StageTiming(BaseModel):
+    total_s: float
+    count: int
+    mean_ms: float
+    max_ms: float
+
+
+class JobStatsRead(BaseModel):
+    id: uuid.UUID
+    video_id: uuid.UUID
+    status: str
+    model_tier: str | None
+    cache_hit: bool
+    frame_count: int
+    wall_s: float
+    stages: dict[str, StageTiming]
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import io
+import uuid
+from collections.abc import Iterable
+from typing import Literal
+
+import numpy as np
+from sqlalchemy import text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.pose_frame import PoseFrame
+from app.models.video import Video
+from app.services import landmark_codec
+
+Strategy = Literal["insert", "copy"]
+
+# Postgres allows at most 65535 bind parameters per statement; each row
+# of a multi-row INSERT uses four
+_MAX_INSERT_ROWS = 65535 // 4
+
+
+def bump_pose_version(db: Session, video_id: uuid.UUID) -> None:
+    """Mark the video's pose data as changed, so cached HTTP responses revalidate."""
+    db.execute(update(Video).where(Video.id == video_id).values(pose_version=Video.pose_version + 1))
+
+
+def _rows(video_id: uuid.UUID, frames: Iterable[dict]) -> list[dict]:
+    """Encode frames for insertion, keeping the last of any repeated frame_index.
+
+    ``ON CONFLICT DO UPDATE`` cannot touch the same row twice in one
+    statement, so duplicates within a batch are collapsed here.
+    """
+    rows = {}
+    for f in frames:
+        rows[f["frame_index"]] = {
+            "video_id": video_id,
+            "frame_index": f["frame_index"],
+            "timestamp_ms": f["timestamp_ms"],
+            "landmarks": landmark_codec.encode(f["landmarks"]),
+        }
+    return list(rows.values())
+
+
+def _insert_values(db: Session, rows: list[dict], batch_size: int) -> None:
+    batch_size = min(batch_size, _MAX_INSERT_ROWS)
+    for start in range(0, len(rows), batch_size):
+        stmt = pg_insert(PoseFrame).values(rows[start:start + batch_size])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[PoseFrame.video_id, PoseFrame.frame_index],
+            set_={"timestamp_ms": stmt.excluded.timestamp_ms, "landmarks": stmt.excluded.landmarks},
+        ))
+
+
+def _copy(db: Session, rows: list[dict]) -> None:
+    """COPY rows into a session-local staging table, then upsert them in one statement."""
+    db.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS pose_frames_staging "
+        "(video_id uuid, frame_index integer, timestamp_ms integer, landmarks bytea) "
+        "ON COMMIT DELETE ROWS"
+    ))
+    buf = io.StringIO()
+    for r in rows:
+        # Text format: the bytea hex prefix's backslash must itself be escaped
+        buf.write(f"{r['video_id']}\t{r['frame_index']}\t{r['timestamp_ms']}\t\\\\x{r['landmarks'].hex()}\n")
+    buf.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            "COPY pose_frames_staging (video_id, frame_index, timestamp_ms, landmarks) FROM STDIN",
+            buf,
+        )
+    finally:
+        cursor.close()
+    db.execute(text(
+        "INSERT INTO pose_frames (video_id, frame_index, timestamp_ms, landmarks) "
+        "SELECT video_id, frame_index, timestamp_ms, landmarks FROM pose_frames_staging "
+        "ON CONFLICT (video_id, frame_index) DO UPDATE "
+        "SET timestamp_ms = EXCLUDED.timestamp_ms, landmarks = EXCLUDED.landmarks"
+    ))
+    db.execute(text("TRUNCATE pose_frames_staging"))
+
+
+def insert_frames(
+    db: Session,
+    video_id: uuid.UUID,
+    frames: Iterable[dict],
+    strategy: Strategy | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """Upsert pose frames for one video without going through the ORM unit of work.
+
+    ``frames`` are dicts with frame_index, timestamp_ms and landmarks (33
+    dicts or a (33, 4) array). Rows that already exist for
+    ``(video_id, frame_index)`` are overwritten, so retries are safe.
+    ``strategy`` is "insert" (multi-row ``INSERT ... VALUES`` in batches of
+    ``batch_size``) or "copy" (``COPY`` into a staging table); both default
+    to the settings. Bumps the video's ``pose_version``. The caller commits.
+    Returns the number of rows written.
+    """
+    written = _write_rows(db, _rows(video_id, frames), strategy, batch_size)
+    if written:
+        bump_pose_version(db, video_id)
+    return written
+
+
+def insert_track(
+    db: Session,
+    video_id: uuid.UUID,
+    frame_indices: np.ndarray,
+    timestamps_ms: np.ndarray,
+    landmarks: np.ndarray,
+    strategy: Strategy | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """Upsert a whole track held as arrays, committing every ``batch_size`` frames.
+
+    ``landmarks`` is (N, 33, 4); each frame is stored as its float32 bytes
+    without going through per-landmark dicts. Returns the number of rows written.
+    """
+    batch_size = batch_size or settings.POSE_INSERT_BATCH_SIZE
+    landmarks = np.ascontiguousarray(landmarks, dtype=landmark_codec.DTYPE)
+    written = 0
+    for start in range(0, len(timestamps_ms), batch_size):
+        stop = start + batch_size
+        rows = [
+            {"video_id": video_id, "frame_index": fi, "timestamp_ms": ts, "landmarks": lm.tobytes()}
+            for fi, ts, lm in zip(
+                np.asarray(frame_indices[start:stop]).tolist(),
+                np.asarray(timestamps_ms[start:stop]).tolist(),
+                landmarks[start:stop],
+            )
+        ]
+        written += _write_rows(db, rows, strategy, batch_size)
+        bump_pose_version(db, video_id)
+        db.commit()
+    return written
+
+
+def _write_rows(db: Session, rows: list[dict], strategy: Strategy | None, batch_size: int | None) -> int:
+    if not rows:
+        return 0
+    strategy = strategy or settings.POSE_BULK_INSERT_STRATEGY
+    if strategy == "copy":
+        _copy(db, rows)
+    elif strategy == "insert":
+        _insert_values(db, rows, batch_size or settings.POSE_INSERT_BATCH_SIZE)
+    else:
+        raise ValueError(f"Unknown bulk insert strategy {strategy!r}")
+    return len(rows)
+
+
+class FrameWriter:
+    """Buffers streamed frames and writes them with :func:`insert_frames`.
+
+    Each full batch of ``batch_size`` frames is written and committed, so
+    memory stays flat and committed progress is visible to readers.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        video_id: uuid.UUID,
+        batch_size: int | None = None,
+        strategy: Strategy | None = None,
+    ):
+        self.db = db
+        self.video_id = video_id
+        self.batch_size = batch_size or settings.POSE_INSERT_BATCH_SIZE
+        self.strategy = strategy
+        self._pending: list[dict] = []
+
+    def add(self, frame_index: int, timestamp_ms: int, landmarks: np.ndarray) -> None:
+        self._pending.append({"frame_index": frame_index, "timestamp_ms": timestamp_ms, "landmarks": landmarks})
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write and commit the buffered frames."""
+        if self._pending:
+            insert_frames(self.db, self.video_id, self._pending, self.strategy, self.batch_size)
+            self._pending = []
+        self.db.commit()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+# Stored layout of pose_frames.landmarks: 33 (x, y, z, visibility)
+# little-endian float32 tuples, 528 bytes per frame
+NUM_LANDMARKS = 33
+FIELDS = ("x", "y", "z", "visibility")
+DTYPE = np.dtype("<f4")
+FRAME_BYTES = NUM_LANDMARKS * len(FIELDS) * DTYPE.itemsize
+
+
+def to_array(landmarks: Sequence[dict] | Sequence[Sequence[float]] | np.ndarray) -> np.ndarray:
+    """Return landmarks as a (33, 4) float32 array.
+
+    Accepts the API/WebSocket layout (a list of ``{x, y, z, visibility}``
+    dicts), a list of 4-tuples, or an array.
+    """
+    if isinstance(landmarks, np.ndarray):
+        arr = landmarks.astype(DTYPE, copy=False)
+    elif landmarks and isinstance(landmarks[0], dict):
+        arr = np.array([[lm[f] for f in FIELDS] for lm in landmarks], dtype=DTYPE)
+    else:
+        arr = np.asarray(landmarks, dtype=DTYPE)
+    if arr.shape != (NUM_LANDMARKS, len(FIELDS)):
+        raise ValueError(f"Expected {NUM_LANDMARKS} landmarks with {len(FIELDS)} values, got shape {arr.shape}")
+    return arr
+
+
+def encode(landmarks: Sequence[dict] | Sequence[Sequence[float]] | np.ndarray) -> bytes:
+    """Pack one frame's landmarks for storage."""
+    return to_array(landmarks).tobytes()
+
+
+def decode(data: bytes) -> np.ndarray:
+    """Unpack one stored frame into a read-only (33, 4) float32 array."""
+    if len(data) != FRAME_BYTES:
+        raise ValueError(f"Expected {FRAME_BYTES} bytes of landmarks, got {len(data)}")
+    return np.frombuffer(data, dtype=DTYPE).reshape(NUM_LANDMARKS, len(FIELDS))
+
+
+def decode_many(blobs: Iterable[bytes]) -> np.ndarray:
+    """Unpack stored frames into one (N, 33, 4) float32 array with a single copy."""
+    joined = b"".join(blobs)
+    if len(joined) % FRAME_BYTES:
+        raise ValueError(f"Landmark data is not a whole number of {FRAME_BYTES}-byte frames")
+    return np.frombuffer(joined, dtype=DTYPE).reshape(-1, NUM_LANDMARKS, len(FIELDS))
+
+
+def to_dicts(landmarks: np.ndarray) -> list[dict]:
+    """Convert a (33, 4) array to the API layout: 33 ``{x, y, z, visibility}`` dicts."""
+    return [
+        {"x": x, "y": y, "z": z, "visibility": v} for x, y, z, v in landmarks.tolist()
+    ]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+from app.config import settings
+from app.services import task_manager
+
+# Same order as kinstretch.pose_extraction.MODEL_TIERS (fastest first); kept
+# here so choosing a tier doesn't import mediapipe
+TIERS = ("lite", "full", "heavy")
+
+# Sampled frames per second of extraction assumed for each tier until jobs
+# on this host have been measured
+DEFAULT_FPS = {"lite": 40.0, "full": 25.0, "heavy": 8.0}
+
+# Weight of the newest measurement in the moving average
+EWMA_ALPHA = 0.3
+
+_lock = threading.Lock()
+_profile: dict[str, float] | None = None
+
+
+def _profile_path() -> Path:
+    return settings.MODEL_DIR / "tier_profile.json"
+
+
+def fps_profile() -> dict[str, float]:
+    """Return the measured extraction rate (frames/s) for each tier.
+
+    Loaded from ``MODEL_DIR/tier_profile.json`` on first use, so the profile
+    survives restarts; tiers without measurements use ``DEFAULT_FPS``.
+    """
+    global _profile
+    with _lock:
+        if _profile is None:
+            _profile = dict(DEFAULT_FPS)
+            try:
+                saved = json.loads(_profile_path().read_text())
+                _profile.update({k: float(v) for k, v in saved.items() if k in DEFAULT_FPS})
+            except (OSError, ValueError, AttributeError):
+                pass
+        return dict(_profile)
+
+
+def record_throughput(tier: str, frames: int, seconds: float) -> None:
+    """Fold one finished job's extraction rate into the tier's moving average.
+
+    ``seconds`` must cover the extraction alone (decode and inference), not
+    storing the results, since :func:`choose_tier` divides inference frames by it.
+    """
+    if tier not in DEFAULT_FPS or frames <= 0 or seconds <= 0:
+        return
+    fps_profile()
+    with _lock:
+        _profile[tier] = (1 - EWMA_ALPHA) * _profile[tier] + EWMA_ALPHA * frames / seconds
+        snapshot = dict(_profile)
+    try:
+        _profile_path().write_text(json.dumps(snapshot))
+    except OSError:
+        pass
+
+
+def available_tiers() -> list[str]:
+    """Tiers enabled by ``settings.POSE_MODEL_TIERS``, fastest first."""
+    return [t for t in TIERS if t in settings.POSE_MODEL_TIERS] or ["heavy"]
+
+
+def default_tier() -> str:
+    """The tier to pre-load: the configured one, or the most accurate for auto."""
+    if settings.POSE_MODEL_TIER == "auto":
+        return available_tiers()[-1]
+    return settings.POSE_MODEL_TIER
+
+
+def choose_tier(n_frames: int, queue_depth: int | None = None) -> str:
+    """Pick the most accurate tier expected to finish within the time budget.
+
+    ``n_frames`` is the number of frames the job will run inference on and
+    ``queue_depth`` the number of jobs sharing the host (default: the active
+    jobs in the task manager, this one included). Concurrent jobs split the
+    CPU, so each is assumed to get ``1 / queue_depth`` of a tier's measured
+    rate. Falls back to the fastest tier when none fits
+    ``settings.POSE_AUTO_TIME_BUDGET_S``.
+    """
+    if queue_depth is None:
+        queue_depth = task_manager.active_task_count()
+    profile = fps_profile()
+    tiers = available_tiers()
+    for tier in reversed(tiers):
+        expected_s = n_frames * max(queue_depth, 1) / profile[tier]
+        if expected_s <= settings.POSE_AUTO_TIME_BUDGET_S:
+            return tier
+    return tiers[0]
+
+
+def check_tier(requested: str | None) -> None:
+    """Raise ValueError unless ``requested`` is None, ``"auto"`` or a tier whose model is downloaded.
+
+    Only the tiers in ``settings.POSE_MODEL_TIERS`` are downloaded at startup.
+    """
+    if requested is None or requested == "auto":
+        return
+    if requested not in TIERS:
+        raise ValueError(f"Unknown model tier {requested!r}")
+    if requested not in available_tiers():
+        raise ValueError(
+            f"Model tier {requested!r} is not enabled on this server; choose one of {available_tiers()} or 'auto'"
+        )
+
+
+def resolve_tier(requested: str | None, n_frames: int) -> str:
+    """Turn a requested tier (None for the default, or ``"auto"``) into a concrete one."""
+    tier = requested or settings.POSE_MODEL_TIER
+    if tier == "auto":
+        return choose_tier(n_frames)
+    check_tier(tier)
+    return tier
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from app.config import settings
+from app.services import landmark_codec
+
+_CHUNK_BYTES = 1 << 20
+
+# (path, size, mtime) -> sha256, so the model file is hashed once per process
+_file_digests: dict[tuple[str, int, float], str] = {}
+
+
+def file_digest(path: str | Path) -> str:
+    """Return the sha256 hex digest of a file's contents."""
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime)
+    digest = _file_digests.get(memo_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            while chunk := f.read(_CHUNK_BYTES):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _file_digests[memo_key] = digest
+    return digest
+
+
+def cache_key(
+    source_id: str,
+    model_path: str | Path,
+    frame_stride: int,
+    sample_hz: float | None,
+    start_s: float | None,
+    stop_s: float | None,
+    enhance_depth: bool = False,
+    depth_model_name: str | None = None,
+    options: dict | None = None,
+) -> str:
+    """Build the cache key for one extraction.
+
+    ``source_id`` identifies the video content, e.g. ``"youtube:<id>"`` or
+    ``"sha256:<digest>"``. Every option that changes the extracted poses is
+    part of the key, including a digest of the model file itself;
+    ``options`` holds the remaining extraction options (adaptive sampling,
+    downscaling, subject crop).
+    """
+    parts = {
+        "source": source_id,
+        "model": file_digest(model_path),
+        "frame_stride": frame_stride,
+        "sample_hz": sample_hz,
+        "start_s": start_s,
+        "stop_s": stop_s,
+        "enhance_depth": enhance_depth,
+        "depth_model": depth_model_name if enhance_depth else None,
+        "options": options,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return settings.POSE_CACHE_DIR / key[:2] / f"{key}.npz"
+
+
+def get(key: str) -> tuple[np.ndarray, np.ndarray] | None:
+    """Return ``(timestamps_ms, landmarks)`` for a cached extraction, or None.
+
+    A hit refreshes the entry's mtime, which eviction uses as its LRU clock.
+    """
+    path = _entry_path(key)
+    try:
+        with np.load(path) as data:
+            entry = data["timestamps_ms"], data["landmarks"]
+        os.utime(path)
+    except (FileNotFoundError, KeyError, ValueError, OSError):
+        return None
+    return entry
+
+
+def put(key: str, timestamps_ms: np.ndarray, landmarks: np.ndarray) -> None:
+    """Store an extraction and evict old entries if the cache is over budget.
+
+    The entry is written to a temporary file and renamed into place, so
+    processes sharing the cache directory never read a partial entry.
+    """
+    path = _entry_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, timestamps_ms=timestamps_ms, landmarks=landmarks)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    evict(settings.POSE_CACHE_MAX_BYTES)
+
+
+def evict(max_bytes: int) -> int:
+    """Delete least recently used entries until the cache fits in ``max_bytes``.
+
+    Returns the number of bytes removed. Entries another process removes
+    concurrently are skipped.
+    """
+    entries = []
+    for path in settings.POSE_CACHE_DIR.glob("*/*.npz"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += size
+    return removed
+
+
+class CacheWriter:
+    """Collects streamed pose frames into compact arrays for :func:`put`."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self._timestamps: list[int] = []
+        self._landmarks: list[np.ndarray] = []
+
+    def add(self, timestamp_ms: int, landmarks: np.ndarray) -> None:
+        self._timestamps.append(timestamp_ms)
+        self._landmarks.append(landmark_codec.to_array(landmarks))
+
+    def commit(self) -> None:
+        landmarks = (
+            np.stack(self._landmarks) if self._landmarks
+            else np.zeros((0, 33, 4), dtype=np.float32)
+        )
+        put(self.key, np.array(self._timestamps, dtype=np.int64), landmarks)
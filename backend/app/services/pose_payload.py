@@ -0,0 +1,59 @@
+"""Binary encoding of a pose track for ``GET /videos/{id}/poses``.
+
+Served instead of JSON when the client accepts ``MEDIA_TYPE`` or
+``application/octet-stream``.
+Layout (little-endian)::
+
+    header      magic "KPOS", version u16, landmarks u16, frames u32,
+                next_cursor i32 (-1 on the last page)              (16 bytes)
+    frame_index i32[frames]
+    timestamps  i32[frames]       in ms
+    landmarks   f32[frames, landmarks, 4]   x, y, z, visibility
+
+Every block starts on a 4-byte boundary, so a browser can wrap each one
+in an ``Int32Array``/``Float32Array`` view of the response buffer without
+copying.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+
+from app.services import landmark_codec
+
+MEDIA_TYPE = "application/vnd.kinstretch.poses"
+ACCEPTED_MEDIA_TYPES = (MEDIA_TYPE, "application/octet-stream")
+MAGIC = b"KPOS"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHIi")
+
+
+def encode(
+    frame_indices: np.ndarray,
+    timestamps_ms: np.ndarray,
+    landmarks: np.ndarray,
+    next_cursor: int | None = None,
+) -> bytes:
+    n = len(timestamps_ms)
+    return b"".join((
+        _HEADER.pack(MAGIC, VERSION, landmark_codec.NUM_LANDMARKS, n, -1 if next_cursor is None else next_cursor),
+        np.asarray(frame_indices, dtype="<i4").tobytes(),
+        np.asarray(timestamps_ms, dtype="<i4").tobytes(),
+        np.asarray(landmarks, dtype=landmark_codec.DTYPE).tobytes(),
+    ))
+
+
+def decode(data: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray, int | None]:
+    """Return ``(frame_indices, timestamps_ms, landmarks, next_cursor)`` from :func:`encode` output."""
+    magic, version, n_landmarks, n, next_cursor = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} pose payload")
+    offset = _HEADER.size
+    frame_indices = np.frombuffer(data, dtype="<i4", count=n, offset=offset)
+    timestamps_ms = np.frombuffer(data, dtype="<i4", count=n, offset=offset + 4 * n)
+    landmarks = np.frombuffer(
+        data, dtype=landmark_codec.DTYPE, count=n * n_landmarks * len(landmark_codec.FIELDS), offset=offset + 8 * n,
+    ).reshape(n, n_landmarks, len(landmark_codec.FIELDS))
+    return frame_indices, timestamps_ms, landmarks, None if next_cursor < 0 else next_cursor
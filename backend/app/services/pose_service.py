@@ -1,36 +1,231 @@
 from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    from kinstretch.model_pool import ModelPool
+    from kinstretch.timing import StageTimer
 
-def extract_poses_from_video(
+_model_pool: ModelPool | None = None
+
+
+def get_model_path(tier: str | None = None) -> Path:
+    """Path of the MediaPipe pose landmarker model for ``tier`` (default: the pre-loaded tier)."""
+    from kinstretch.pose_extraction import model_filename
+
+    from app.services import model_tiers
+
+    return settings.MODEL_DIR / model_filename(tier or model_tiers.default_tier())
+
+
+def model_pool_size() -> int:
+    """Idle landmarkers to keep per tier: ``MODEL_POOL_SIZE``, or as many as one job checks out."""
+    from kinstretch.model_pool import LANDMARKERS_PER_JOB
+
+    if settings.MODEL_POOL_SIZE is not None:
+        return settings.MODEL_POOL_SIZE
+    return LANDMARKERS_PER_JOB if settings.POSE_ADAPTIVE_SAMPLING else 1
+
+
+def get_model_pool() -> ModelPool:
+    """Return the process-wide pool of warm pose (and depth) models."""
+    global _model_pool
+    if _model_pool is None:
+        from kinstretch.model_pool import ModelPool
+
+        _model_pool = ModelPool(
+            max_idle=model_pool_size(),
+            max_idle_depth=settings.DEPTH_MODEL_POOL_SIZE,
+        )
+    return _model_pool
+
+
+def warm_model_pool() -> None:
+    """Load :func:`model_pool_size` landmarkers of the default tier (and ``WARM_DEPTH_MODEL``) ahead of the first job."""
+    get_model_pool().warm(
+        model_path=get_model_path(),
+        depth_model_name=settings.WARM_DEPTH_MODEL,
+    )
+
+
+def close_model_pool() -> None:
+    if _model_pool is not None:
+        _model_pool.close()
+
+
+def extraction_options() -> dict:
+    """Adaptive sampling and inference input options for ``iter_pose_arrays``, from settings."""
+    return {
+        "adaptive": settings.POSE_ADAPTIVE_SAMPLING,
+        "coarse_stride": settings.POSE_COARSE_STRIDE,
+        "motion_threshold": settings.POSE_MOTION_THRESHOLD,
+        "frame_diff_threshold": settings.POSE_FRAME_DIFF_THRESHOLD,
+        "max_side": settings.POSE_MAX_SIDE,
+        "roi": settings.POSE_ROI_CROP,
+        "roi_margin": settings.POSE_ROI_MARGIN,
+    }
+
+
+def iter_pose_records(
     video_path: str | Path,
     start_s: float | None = None,
     stop_s: float | None = None,
     frame_stride: int = 5,
-) -> list[dict]:
-    """Extract poses and return them as a list of dicts ready for DB storage.
+    workers: int | None = None,
+    sample_hz: float | None = None,
+    model_tier: str | None = None,
+    timer: StageTimer | None = None,
+) -> Iterator[tuple[int, int, np.ndarray]]:
+    """Extract poses and yield them one at a time for storage.
 
-    Each dict has: frame_index, timestamp_ms, landmarks (list of 33 dicts).
+    Each item is ``(frame_index, timestamp_ms, landmarks)`` with landmarks
+    as a (33, 4) float32 array, ready for :mod:`app.services.landmark_codec`.
+    ``workers`` defaults to ``settings.POSE_EXTRACTION_WORKERS``; values above
+    one extract time chunks of the video in parallel processes. ``sample_hz``
+    (default ``settings.POSE_SAMPLE_HZ``) overrides ``frame_stride`` with a
+    target sampling rate. Adaptive sampling, downscaling and subject crop
+    follow :func:`extraction_options`.
+    ``model_tier`` selects the lite, full or heavy landmarker. ``timer``
+    collects the extraction stage timings.
     """
-    from kinstretch.pose_extraction import extract_poses
+    from kinstretch.pose_extraction import iter_pose_arrays
 
-    model_path = settings.MODEL_DIR / "pose_landmarker_heavy.task"
-    pose_frames = extract_poses(
+    poses = iter_pose_arrays(
         video_path,
-        model_path=model_path,
+        model_path=get_model_path(model_tier),
         start_s=start_s,
         stop_s=stop_s,
         frame_stride=frame_stride,
+        workers=workers if workers is not None else settings.POSE_EXTRACTION_WORKERS,
+        sample_hz=sample_hz if sample_hz is not None else settings.POSE_SAMPLE_HZ,
+        pool=get_model_pool(),
+        pipelined=settings.POSE_PIPELINED,
+        decode_queue_size=settings.POSE_DECODE_QUEUE_SIZE,
+        detect_queue_size=settings.POSE_DETECT_QUEUE_SIZE,
+        output_queue_size=settings.POSE_OUTPUT_QUEUE_SIZE,
+        timer=timer,
+        **extraction_options(),
     )
 
-    results = []
-    for i, pf in enumerate(pose_frames):
-        results.append({
-            "frame_index": i,
-            "timestamp_ms": pf.timestamp_ms,
-            "landmarks": [lm.model_dump() for lm in pf.landmarks],
-        })
-    return results
+    for i, (timestamp_ms, landmarks) in enumerate(poses):
+        yield i, timestamp_ms, landmarks
+
+
+def extract_poses_from_video(
+    video_path: str | Path,
+    start_s: float | None = None,
+    stop_s: float | None = None,
+    frame_stride: int = 5,
+    workers: int | None = None,
+    sample_hz: float | None = None,
+    model_tier: str | None = None,
+) -> list[tuple[int, int, np.ndarray]]:
+    """Extract poses and return them as a list ready for storage.
+
+    See :func:`iter_pose_records` for the arguments and item layout.
+    """
+    return list(iter_pose_records(
+        video_path,
+        start_s=start_s,
+        stop_s=stop_s,
+        frame_stride=frame_stride,
+        workers=workers,
+        sample_hz=sample_hz,
+        model_tier=model_tier,
+    ))
+
+
+def transform_track(
+    frame_indices: Sequence[int],
+    timestamps_ms: Sequence[int],
+    landmarks: np.ndarray,
+    rate_hz: float | None = None,
+    smooth: bool = False,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Optionally smooth and/or resample a stored pose track, keeping it as arrays.
+
+    The arguments are a track as returned by ``track_store.load_track``:
+    frame indices, timestamps in ascending order and an (N, 33, 4) landmark
+    array. With ``smooth`` the landmark positions are filtered; with
+    ``rate_hz`` the track is interpolated onto a regular grid at that rate,
+    and ``frame_index`` is the position on that grid.
+    """
+    if len(timestamps_ms) and (smooth or rate_hz is not None):
+        from kinstretch.models import PoseSequence
+        from kinstretch.smoothing import resample
+        from kinstretch.smoothing import smooth as smooth_track
+
+        seq = PoseSequence(timestamps_ms, landmarks)
+        if smooth:
+            seq = smooth_track(seq)
+        if rate_hz is not None:
+            seq = resample(seq, rate_hz)
+            frame_indices = np.arange(len(seq), dtype=np.int32)
+        timestamps_ms, landmarks = seq.timestamps_ms, seq.landmarks
+    return np.asarray(frame_indices), np.asarray(timestamps_ms), landmarks
+
+
+def track_records(
+    frame_indices: Sequence[int],
+    timestamps_ms: Sequence[int],
+    landmarks: np.ndarray,
+) -> list[dict]:
+    """Turn a pose track into dicts in the layout of ``PoseFrameRead``."""
+    from app.services import landmark_codec
+
+    return [
+        {
+            "frame_index": int(frame_index),
+            "timestamp_ms": timestamp_ms,
+            "landmarks": landmark_codec.to_dicts(frame),
+        }
+        for frame_index, timestamp_ms, frame in zip(
+            frame_indices, np.asarray(timestamps_ms).tolist(), landmarks,
+        )
+    ]
+
+
+def process_track(
+    frame_indices: Sequence[int],
+    timestamps_ms: Sequence[int],
+    landmarks: np.ndarray,
+    rate_hz: float | None = None,
+    smooth: bool = False,
+) -> list[dict]:
+    """Turn a stored pose track into dicts for serving, optionally smoothed and/or resampled.
+
+    See :func:`transform_track` and :func:`track_records`.
+    """
+    return track_records(*transform_track(frame_indices, timestamps_ms, landmarks, rate_hz, smooth))
+
+
+def get_duration_ms(video_path: str | Path) -> int:
+    """Return the video's duration in milliseconds, or 0 if it can't be read."""
+    from kinstretch.pose_extraction import probe_video
+
+    fps, total_frames = probe_video(video_path)
+    return int(1000 * total_frames / fps)
+
+
+def estimate_inference_frames(
+    video_path: str | Path,
+    start_s: float | None = None,
+    stop_s: float | None = None,
+    frame_stride: int = 5,
+    sample_hz: float | None = None,
+) -> int:
+    """Number of frames an extraction with these options will run inference on."""
+    from kinstretch.pose_extraction import probe_video
+
+    fps, total_frames = probe_video(video_path)
+    duration_s = total_frames / fps
+    range_s = min(stop_s if stop_s is not None else duration_s, duration_s) - (start_s or 0.0)
+    sample_hz = sample_hz if sample_hz is not None else settings.POSE_SAMPLE_HZ
+    rate = sample_hz if sample_hz is not None else fps / frame_stride
+    return max(int(range_s * rate), 0)
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_sync_db
+from app.models.pose_frame import PoseFrame
+from app.models.pose_track import PoseTrack
+from app.models.session import AnalysisSession
+from app.models.video import Video
+from app.services import task_manager, track_cache
+
+# Counters since process start; read with metrics()
+_metrics = {
+    "runs": 0,
+    "errors": 0,
+    "videos_purged": 0,
+    "sessions_purged": 0,
+    "pose_frames_deleted": 0,
+    "files_removed": 0,
+    "bytes_reclaimed": 0,
+    "orphan_sweeps": 0,
+    "orphans_removed": 0,
+    "orphan_bytes_reclaimed": 0,
+    "last_run_at": None,
+    "last_sweep_at": None,
+    "last_error": None,
+}
+_metrics_lock = threading.Lock()
+
+_wake = threading.Event()
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+
+
+def metrics() -> dict:
+    """Purge counters since process start, plus the number of tombstones still pending."""
+    with _metrics_lock:
+        report = dict(_metrics)
+    db = get_sync_db()
+    try:
+        report["pending_videos"] = db.execute(
+            select(func.count()).select_from(Video).where(Video.deleted_at.is_not(None))
+        ).scalar()
+        report["pending_sessions"] = db.execute(
+            select(func.count()).select_from(AnalysisSession).where(AnalysisSession.deleted_at.is_not(None))
+        ).scalar()
+    finally:
+        db.close()
+    return report
+
+
+def _count(**increments: int) -> None:
+    with _metrics_lock:
+        for key, value in increments.items():
+            _metrics[key] += value
+
+
+def _managed_dirs() -> list[Path]:
+    return [settings.UPLOAD_DIR.resolve(), settings.POSE_TRACK_DIR.resolve()]
+
+
+def _remove_file(path: str | Path) -> int | None:
+    """Delete a file under UPLOAD_DIR or POSE_TRACK_DIR; return the bytes freed.
+
+    Returns None if nothing was removed. Paths outside those directories
+    are never touched.
+    """
+    path = Path(path).resolve()
+    if not any(path.is_relative_to(root) for root in _managed_dirs()):
+        return None
+    try:
+        size = path.stat().st_size
+        path.unlink()
+    except FileNotFoundError:
+        return None
+    return size
+
+
+# ---------------------------------------------------------------------------
+# Purging tombstoned rows
+# ---------------------------------------------------------------------------
+
+
+def _purge_video(db: Session, video: Video, batch_size: int) -> None:
+    """Delete one tombstoned video's pose frames in batches, then its files and row."""
+    while True:
+        batch = select(PoseFrame.id).where(PoseFrame.video_id == video.id).limit(batch_size)
+        deleted = db.execute(delete(PoseFrame).where(PoseFrame.id.in_(batch.scalar_subquery()))).rowcount
+        db.commit()
+        _count(pose_frames_deleted=deleted)
+        if deleted < batch_size:
+            break
+
+    track = db.get(PoseTrack, video.id)
+    track_path = track.path if track is not None else None
+    video_id, file_path = video.id, video.file_path
+    db.delete(video)
+    db.commit()
+    track_cache.invalidate(video_id)
+
+    freed = []
+    if track_path is not None:
+        freed.append(_remove_file(track_path))
+    if file_path:
+        # YouTube downloads are named by YouTube ID, so another video or a
+        # re-import still running can share the file. Checked right before
+        # the unlink, under the lock jobs take to claim a file
+        with task_manager.file_lock:
+            if not _file_in_use(db, file_path):
+                freed.append(_remove_file(file_path))
+    freed = [size for size in freed if size is not None]
+    _count(videos_purged=1, files_removed=len(freed), bytes_reclaimed=sum(freed))
+
+
+def _file_in_use(db: Session, file_path: str) -> bool:
+    """Whether a video row or a job in this process still uses ``file_path``."""
+    if Path(file_path).resolve() in task_manager.active_file_paths():
+        return True
+    shared = db.execute(select(Video.id).where(Video.file_path == file_path).limit(1)).first()
+    return shared is not None
+
+
+def purge_once(batch_size: int | None = None, max_videos: int = 100) -> None:
+    """Purge up to ``max_videos`` tombstoned videos, then empty tombstoned sessions.
+
+    Videos with a job still queued or running are left for a later pass.
+    """
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    db = get_sync_db()
+    try:
+        # A deleted session's videos are deleted with it
+        deleted_sessions = select(AnalysisSession.id).where(AnalysisSession.deleted_at.is_not(None))
+        db.execute(
+            update(Video)
+            .where(Video.deleted_at.is_(None), Video.session_id.in_(deleted_sessions))
+            .values(deleted_at=func.now())
+        )
+        db.commit()
+
+        videos = db.execute(
+            select(Video).where(Video.deleted_at.is_not(None)).order_by(Video.deleted_at).limit(max_videos)
+        ).scalars().all()
+        for video in videos:
+            if task_manager.is_task_active(video.id):
+                continue
+            _purge_video(db, video, batch_size)
+
+        sessions = db.execute(
+            select(AnalysisSession).where(
+                AnalysisSession.deleted_at.is_not(None),
+                ~select(Video.id).where(Video.session_id == AnalysisSession.id).exists(),
+            )
+        ).scalars().all()
+        for session in sessions:
+            db.delete(session)
+        db.commit()
+        _count(sessions_purged=len(sessions))
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Orphaned files
+# ---------------------------------------------------------------------------
+
+
+def sweep_orphans(min_age_s: float | None = None) -> None:
+    """Delete files in UPLOAD_DIR and POSE_TRACK_DIR that no video references.
+
+    Files younger than ``min_age_s`` are kept: an upload is saved before its
+    video row is committed, and a track file is written before its index row.
+    """
+    min_age_s = settings.ORPHAN_MIN_AGE_S if min_age_s is None else min_age_s
+    db = get_sync_db()
+    try:
+        referenced = {
+            Path(p).resolve()
+            for (p,) in db.execute(select(Video.file_path).where(Video.file_path.is_not(None)))
+        }
+        referenced |= {Path(p).resolve() for (p,) in db.execute(select(PoseTrack.path))}
+    finally:
+        db.close()
+
+    cutoff = time.time() - min_age_s
+    removed = reclaimed = 0
+    for root in (settings.UPLOAD_DIR, settings.POSE_TRACK_DIR):
+        for path in root.iterdir():
+            try:
+                if not path.is_file() or path.stat().st_mtime > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            if path.resolve() in referenced:
+                continue
+            # An old download can be claimed by a re-import whose row
+            # doesn't point at it yet
+            with task_manager.file_lock:
+                if path.resolve() in task_manager.active_file_paths():
+                    continue
+                size = _remove_file(path)
+            if size is not None:
+                removed += 1
+                reclaimed += size
+    _count(orphan_sweeps=1, orphans_removed=removed, orphan_bytes_reclaimed=reclaimed)
+    with _metrics_lock:
+        _metrics["last_sweep_at"] = time.time()
+
+
+# ---------------------------------------------------------------------------
+# Background thread
+# ---------------------------------------------------------------------------
+
+
+def wake() -> None:
+    """Ask the purger to run now instead of at its next interval."""
+    _wake.set()
+
+
+def _run() -> None:
+    next_sweep = time.monotonic() + settings.ORPHAN_SWEEP_INTERVAL_S
+    while not _stop.is_set():
+        _wake.wait(settings.PURGE_INTERVAL_S)
+        _wake.clear()
+        if _stop.is_set():
+            break
+        try:
+            purge_once()
+            if time.monotonic() >= next_sweep:
+                sweep_orphans()
+                next_sweep = time.monotonic() + settings.ORPHAN_SWEEP_INTERVAL_S
+        except Exception as e:
+            with _metrics_lock:
+                _metrics["errors"] += 1
+                _metrics["last_error"] = str(e)
+            traceback.print_exc()
+        with _metrics_lock:
+            _metrics["runs"] += 1
+            _metrics["last_run_at"] = time.time()
+
+
+def start_purger() -> threading.Thread:
+    """Start the purge loop in a daemon thread; it runs every PURGE_INTERVAL_S or on :func:`wake`."""
+    global _thread
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="purger", daemon=True)
+    _thread.start()
+    # Pick up tombstones left by a previous process
+    wake()
+    return _thread
+
+
+def stop_purger(timeout: float | None = 10.0) -> None:
+    _stop.set()
+    _wake.set()
+    if _thread is not None:
+        _thread.join(timeout)
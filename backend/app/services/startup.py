@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Seconds spent in each named startup phase, in the order they ran
+phase_timings: dict[str, float] = {}
+
+models_ready = threading.Event()
+models_error: str | None = None
+
+_import_report: list[dict] | None = None
+
+
+@contextmanager
+def timed_phase(name: str) -> Iterator[None]:
+    """Record how long the enclosed block takes under ``phase_timings[name]``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase_timings[name] = round(time.perf_counter() - start, 4)
+
+
+def _prepare_models() -> None:
+    global models_error
+    try:
+        from app.config import settings
+        from app.services import model_tiers, pose_service
+
+        with timed_phase("import_ml_stack"):
+            from kinstretch.pose_extraction import download_model
+        with timed_phase("download_model"):
+            for tier in model_tiers.available_tiers():
+                download_model(settings.MODEL_DIR, tier)
+        # Pre-load landmarkers so the first jobs don't pay the model load
+        with timed_phase("warm_model_pool"):
+            pose_service.warm_model_pool()
+    except Exception as e:
+        models_error = str(e)
+        traceback.print_exc()
+    finally:
+        models_ready.set()
+
+
+def start_model_preparation() -> threading.Thread:
+    """Download and warm the pose models in a daemon thread.
+
+    This keeps cv2/mediapipe (and torch, if a depth model is warmed) off the
+    startup critical path; ``/api/ready`` reports when the thread is done.
+    """
+    thread = threading.Thread(target=_prepare_models, name="model-preparation", daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for_models(timeout: float | None = None) -> None:
+    """Block until model preparation has finished; raise if it failed."""
+    if not models_ready.wait(timeout):
+        raise TimeoutError("Pose models are still loading")
+    if models_error is not None:
+        raise RuntimeError(f"Pose models failed to load: {models_error}")
+
+
+def import_time_report(module: str = "app.main", limit: int = 30) -> list[dict]:
+    """Import ``module`` in a fresh interpreter and return the slowest imports.
+
+    Parses the output of ``python -X importtime``; each entry has the module
+    name plus its own and cumulative import time in milliseconds.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=BACKEND_DIR,
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    entries.sort(key=lambda e: e["cumulative_ms"], reverse=True)
+    return entries[:limit]
+
+
+def cached_import_time_report() -> list[dict]:
+    """Return :func:`import_time_report` for ``app.main``, computed once per process."""
+    global _import_report
+    if _import_report is None:
+        _import_report = import_time_report()
+    return _import_report
+
+
+if __name__ == "__main__":
+    for entry in import_time_report(limit=40):
+        print(f"{entry['cumulative_ms']:9.1f} ms  {entry['self_ms']:9.1f} ms  {entry['module']}")
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import threading
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 
 
 class TaskStatus(str, Enum):
@@ -18,11 +20,18 @@ class TaskInfo:
     status: TaskStatus = TaskStatus.PENDING
     progress_pct: float = 0.0
     error: str | None = None
+    model_tier: str | None = None
+    file_path: str | None = None
 
 
 # Module-level dict — fine for single-process prototype
 _tasks: dict[uuid.UUID, TaskInfo] = {}
 
+# Held by a job while it claims an existing file for reuse and by the purger
+# while it checks a file is unused and deletes it, so neither happens between
+# the other's check and action
+file_lock = threading.Lock()
+
 
 def create_task(video_id: uuid.UUID) -> TaskInfo:
     info = TaskInfo(video_id=video_id)
@@ -34,9 +43,44 @@ def get_task(video_id: uuid.UUID) -> TaskInfo | None:
     return _tasks.get(video_id)
 
 
+def active_task_count() -> int:
+    """Number of jobs queued or running."""
+    return sum(
+        1 for info in _tasks.values()
+        if info.status in (TaskStatus.PENDING, TaskStatus.PROCESSING)
+    )
+
+
 def update_task(video_id: uuid.UUID, status: TaskStatus, progress_pct: float = 0.0, error: str | None = None):
     info = _tasks.get(video_id)
     if info:
         info.status = status
         info.progress_pct = progress_pct
         info.error = error
+
+
+def set_task_model_tier(video_id: uuid.UUID, model_tier: str):
+    info = _tasks.get(video_id)
+    if info:
+        info.model_tier = model_tier
+
+
+def is_task_active(video_id: uuid.UUID) -> bool:
+    """Whether a job for ``video_id`` is queued or running in this process."""
+    info = _tasks.get(video_id)
+    return info is not None and info.status in (TaskStatus.PENDING, TaskStatus.PROCESSING)
+
+
+def set_task_file_path(video_id: uuid.UUID, file_path: str):
+    """Record the video file a job reads, so the purger leaves it alone; hold ``file_lock``."""
+    info = _tasks.get(video_id)
+    if info:
+        info.file_path = file_path
+
+
+def active_file_paths() -> set[Path]:
+    """Resolved paths of the video files that jobs queued or running here use."""
+    return {
+        Path(info.file_path).resolve() for info in list(_tasks.values())
+        if info.file_path and info.status in (TaskStatus.PENDING, TaskStatus.PROCESSING)
+    }
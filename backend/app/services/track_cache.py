@@ -0,0 +1,106 @@
+"""In-process LRU cache of decoded pose tracks, keyed by video id.
+
+Entries are the ``(frame_indices, timestamps_ms, landmarks)`` arrays of a
+whole track, made read-only, and are evicted least-recently-used first once
+their total size exceeds ``settings.TRACK_CACHE_MAX_BYTES``. Writers call
+:func:`invalidate` after committing new frames; a load that started before
+the invalidation is not stored (see :func:`generation`).
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.services.track_store import Track
+
+_entries: OrderedDict[uuid.UUID, tuple[Track, int]] = OrderedDict()
+_generations: dict[uuid.UUID, int] = {}
+_bytes = 0
+_lock = threading.Lock()
+
+_metrics = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0, "invalidations": 0}
+
+
+def _nbytes(track: Track) -> int:
+    return sum(a.nbytes for a in track)
+
+
+def get(video_id: uuid.UUID) -> Track | None:
+    with _lock:
+        entry = _entries.get(video_id)
+        if entry is None:
+            _metrics["misses"] += 1
+            return None
+        _entries.move_to_end(video_id)
+        _metrics["hits"] += 1
+        return entry[0]
+
+
+def generation(video_id: uuid.UUID) -> int:
+    """Invalidation count of ``video_id``; read it before loading and pass it to :func:`put`."""
+    with _lock:
+        return _generations.get(video_id, 0)
+
+
+def fits(nbytes: int) -> bool:
+    """Whether a track of ``nbytes`` may be cached; one track can use at most a quarter of the budget."""
+    return nbytes <= settings.TRACK_CACHE_MAX_BYTES // 4
+
+
+def put(video_id: uuid.UUID, track: Track, generation_: int) -> None:
+    """Cache ``track`` unless it is too large or the video was invalidated since ``generation_``."""
+    global _bytes
+    size = _nbytes(track)
+    if not fits(size):
+        return
+    for a in track:
+        a.setflags(write=False)
+    with _lock:
+        if _generations.get(video_id, 0) != generation_:
+            return
+        old = _entries.pop(video_id, None)
+        if old is not None:
+            _bytes -= old[1]
+        _entries[video_id] = (track, size)
+        _bytes += size
+        _metrics["puts"] += 1
+        while _bytes > settings.TRACK_CACHE_MAX_BYTES:
+            _, (_, evicted) = _entries.popitem(last=False)
+            _bytes -= evicted
+            _metrics["evictions"] += 1
+
+
+def invalidate(video_id: uuid.UUID) -> None:
+    """Drop ``video_id``'s track and discard any load of it still in flight."""
+    global _bytes
+    with _lock:
+        _generations[video_id] = _generations.get(video_id, 0) + 1
+        entry = _entries.pop(video_id, None)
+        if entry is not None:
+            _bytes -= entry[1]
+        _metrics["invalidations"] += 1
+
+
+def clear() -> None:
+    global _bytes
+    with _lock:
+        for video_id in _entries:
+            _generations[video_id] = _generations.get(video_id, 0) + 1
+        _entries.clear()
+        _bytes = 0
+
+
+def metrics() -> dict:
+    """Hit/miss counters since process start and the cache's current size."""
+    with _lock:
+        report = dict(_metrics)
+        report.update(entries=len(_entries), bytes=_bytes, max_bytes=settings.TRACK_CACHE_MAX_BYTES)
+    lookups = report["hits"] + report["misses"]
+    report["hit_rate"] = round(report["hits"] / lookups, 4) if lookups else None
+    return report
@@ -0,0 +1,513 @@
+"""Per-video pose track files.
+
+A completed extraction is written once as a single file under
+``settings.POSE_TRACK_DIR``; the ``pose_tracks`` table only indexes it.
+Layout (little-endian)::
+
+    header      magic "KTRK", version u16, landmarks u16, frames u32,
+                chunk_frames u32, chunks u32, reserved u32   (24 bytes)
+    offsets     u64[chunks + 1]   absolute byte offset of each chunk, then EOF
+    frame_index i32[frames]
+    timestamps  i32[frames]       ascending, in ms
+    chunks      zlib(byte-shuffled float32[chunk_frames, landmarks, 4])
+
+The index arrays are read straight from a memory map, so a time range is
+located with a binary search and only the chunks it overlaps are
+decompressed. Byte shuffling groups the float32 exponent and high mantissa
+bytes together, which zlib compresses noticeably better than raw floats.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import mmap
+import os
+import struct
+import tempfile
+import uuid
+import zlib
+from collections.abc import AsyncIterator, Sequence
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_factory
+from app.models.pose_frame import PoseFrame
+from app.models.pose_track import PoseTrack
+from app.models.video import Video
+from app.services import landmark_codec, track_cache
+
+MAGIC = b"KTRK"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHIIII")
+
+# (frame_indices, timestamps_ms, landmarks) with shapes (N,), (N,), (N, 33, 4)
+Track = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def track_path(video_id: uuid.UUID) -> Path:
+    return settings.POSE_TRACK_DIR / f"{video_id}.ktrk"
+
+
+def empty_track() -> Track:
+    return (
+        np.zeros(0, dtype=np.int32),
+        np.zeros(0, dtype=np.int32),
+        np.zeros((0, landmark_codec.NUM_LANDMARKS, len(landmark_codec.FIELDS)), dtype=np.float32),
+    )
+
+
+def _positions(
+    frame_indices: np.ndarray,
+    timestamps_ms: np.ndarray,
+    start_ms: int | None,
+    stop_ms: int | None,
+    stride: int,
+    after_frame: int | None,
+    limit: int | None,
+) -> np.ndarray:
+    start = 0 if start_ms is None else int(np.searchsorted(timestamps_ms, start_ms, side="left"))
+    stop = len(timestamps_ms) if stop_ms is None else int(np.searchsorted(timestamps_ms, stop_ms, side="right"))
+    positions = np.arange(start, stop, stride)
+    if after_frame is not None:
+        positions = positions[np.searchsorted(frame_indices[positions], after_frame, side="right"):]
+    return positions[:limit]
+
+
+def _frame_position(frame_indices: np.ndarray, frame_index: int) -> int | None:
+    # frame_index increases with the timestamp, so it is sorted too
+    i = int(np.searchsorted(frame_indices, frame_index))
+    if i == len(frame_indices) or frame_indices[i] != frame_index:
+        return None
+    return i
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def _shuffle(block: np.ndarray) -> bytes:
+    return np.ascontiguousarray(block.astype("<f4", copy=False)).view(np.uint8).reshape(-1, 4).T.tobytes()
+
+
+def _unshuffle(data: bytes, n_frames: int) -> np.ndarray:
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(4, -1)
+    return (
+        np.ascontiguousarray(planes.T).view("<f4")
+        .reshape(n_frames, landmark_codec.NUM_LANDMARKS, len(landmark_codec.FIELDS))
+    )
+
+
+def write_track(
+    path: str | Path,
+    frame_indices: np.ndarray,
+    timestamps_ms: np.ndarray,
+    landmarks: np.ndarray,
+    chunk_frames: int | None = None,
+) -> int:
+    """Write a track file atomically and return its size in bytes."""
+    chunk_frames = chunk_frames or settings.POSE_TRACK_CHUNK_FRAMES
+    n = len(timestamps_ms)
+    if len(frame_indices) != n or len(landmarks) != n:
+        raise ValueError("frame_indices, timestamps_ms and landmarks must have the same length")
+
+    chunks = [
+        zlib.compress(_shuffle(landmarks[start:start + chunk_frames]), settings.POSE_TRACK_COMPRESSION_LEVEL)
+        for start in range(0, n, chunk_frames)
+    ]
+    data_start = _HEADER.size + 8 * (len(chunks) + 1) + 8 * n
+    offsets = np.cumsum([data_start] + [len(c) for c in chunks], dtype="<u8")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(
+                MAGIC, VERSION, landmark_codec.NUM_LANDMARKS, n, chunk_frames, len(chunks), 0,
+            ))
+            f.write(offsets.tobytes())
+            f.write(np.asarray(frame_indices, dtype="<i4").tobytes())
+            f.write(np.asarray(timestamps_ms, dtype="<i4").tobytes())
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return int(offsets[-1])
+
+
+class TrackWriter:
+    """Collects streamed pose frames for :func:`write_track`."""
+
+    def __init__(self) -> None:
+        self._frame_indices: list[int] = []
+        self._timestamps: list[int] = []
+        self._landmarks: list[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def add(self, frame_index: int, timestamp_ms: int, landmarks) -> None:
+        self._frame_indices.append(frame_index)
+        self._timestamps.append(timestamp_ms)
+        self._landmarks.append(landmark_codec.to_array(landmarks))
+
+    def write(self, path: str | Path) -> int:
+        landmarks = np.stack(self._landmarks) if self._landmarks else empty_track()[2]
+        return write_track(
+            path,
+            np.array(self._frame_indices, dtype=np.int32),
+            np.array(self._timestamps, dtype=np.int32),
+            landmarks,
+        )
+
+
+def remove_track(video_id: uuid.UUID) -> None:
+    track_path(video_id).unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def read_frame_count(path: str | Path) -> int:
+    """Number of frames in a track file, read from its header alone."""
+    with open(path, "rb") as f:
+        magic, version, _, n, *_ = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} track file")
+    return n
+
+
+class TrackReader:
+    """Memory-mapped reader for one track file; use as a context manager."""
+
+    def __init__(self, path: str | Path):
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, n_landmarks, n, chunk_frames, n_chunks, _ = _HEADER.unpack_from(self._mm)
+            if magic != MAGIC or version != VERSION or n_landmarks != landmark_codec.NUM_LANDMARKS:
+                raise ValueError(f"{path} is not a version {VERSION} track file")
+        except BaseException:
+            self._file.close()
+            raise
+        self.chunk_frames = chunk_frames
+        offset = _HEADER.size
+        self._offsets = np.frombuffer(self._mm, dtype="<u8", count=n_chunks + 1, offset=offset)
+        offset += 8 * (n_chunks + 1)
+        self.frame_indices = np.frombuffer(self._mm, dtype="<i4", count=n, offset=offset)
+        self.timestamps_ms = np.frombuffer(self._mm, dtype="<i4", count=n, offset=offset + 4 * n)
+
+    def __len__(self) -> int:
+        return len(self.timestamps_ms)
+
+    def __enter__(self) -> TrackReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Views into the map must go before it can be closed
+        self._offsets = self.frame_indices = self.timestamps_ms = None
+        self._mm.close()
+        self._file.close()
+
+    def _chunk(self, i: int) -> np.ndarray:
+        start, stop = int(self._offsets[i]), int(self._offsets[i + 1])
+        n_frames = min(self.chunk_frames, len(self) - i * self.chunk_frames)
+        return _unshuffle(zlib.decompress(self._mm[start:stop]), n_frames)
+
+    def landmarks(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Decode the (stop - start, 33, 4) landmarks of frames ``start:stop``."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return empty_track()[2]
+        first, last = start // self.chunk_frames, (stop - 1) // self.chunk_frames
+        block = np.concatenate([self._chunk(i) for i in range(first, last + 1)])
+        base = first * self.chunk_frames
+        return block[start - base:stop - base]
+
+    def time_range(self, start_ms: int | None = None, stop_ms: int | None = None) -> Track:
+        """Return the frames with ``start_ms <= timestamp_ms <= stop_ms``."""
+        start = 0 if start_ms is None else int(np.searchsorted(self.timestamps_ms, start_ms, side="left"))
+        stop = len(self) if stop_ms is None else int(np.searchsorted(self.timestamps_ms, stop_ms, side="right"))
+        return (
+            self.frame_indices[start:stop].copy(),
+            self.timestamps_ms[start:stop].copy(),
+            self.landmarks(start, stop),
+        )
+
+    def positions(
+        self,
+        start_ms: int | None = None,
+        stop_ms: int | None = None,
+        stride: int = 1,
+        after_frame: int | None = None,
+        limit: int | None = None,
+    ) -> np.ndarray:
+        """Positions of the frames :func:`load_track` selects with these arguments."""
+        return _positions(self.frame_indices, self.timestamps_ms, start_ms, stop_ms, stride, after_frame, limit)
+
+    def take(self, positions: np.ndarray) -> Track:
+        """Return the frames at sorted ``positions``, decoding only the chunks they fall in."""
+        positions = np.asarray(positions, dtype=np.intp)
+        if not len(positions):
+            return empty_track()
+        landmarks = np.empty(
+            (len(positions), landmark_codec.NUM_LANDMARKS, len(landmark_codec.FIELDS)), dtype=np.float32,
+        )
+        chunk_ids = positions // self.chunk_frames
+        bounds = np.flatnonzero(np.diff(chunk_ids)) + 1
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(positions)]):
+            i = int(chunk_ids[lo])
+            landmarks[lo:hi] = self._chunk(i)[positions[lo:hi] - i * self.chunk_frames]
+        return self.frame_indices[positions].copy(), self.timestamps_ms[positions].copy(), landmarks
+
+    def frame(self, frame_index: int) -> tuple[int, np.ndarray] | None:
+        """Return ``(timestamp_ms, landmarks)`` of one frame, or None."""
+        i = _frame_position(self.frame_indices, frame_index)
+        if i is None:
+            return None
+        return int(self.timestamps_ms[i]), self.landmarks(i, i + 1)[0]
+
+
+# ---------------------------------------------------------------------------
+# Loading a video's poses from its track file or pose_frames
+# ---------------------------------------------------------------------------
+
+
+def _frames_query(
+    video_id: uuid.UUID,
+    start_ms: int | None,
+    stop_ms: int | None,
+    stride: int,
+    after_frame: int | None,
+    limit: int | None,
+):
+    in_range = [PoseFrame.video_id == video_id]
+    if start_ms is not None:
+        in_range.append(PoseFrame.timestamp_ms >= start_ms)
+    if stop_ms is not None:
+        in_range.append(PoseFrame.timestamp_ms <= stop_ms)
+
+    if stride == 1:
+        stmt = select(PoseFrame.frame_index, PoseFrame.timestamp_ms, PoseFrame.landmarks).where(*in_range)
+    else:
+        # Number the range's rows positionally, so the stride is counted
+        # from the range's first frame as it is for a track file. The window
+        # still reads each row from the heap, but only the narrow id and
+        # timestamp columns; landmarks are fetched for the kept rows only
+        numbered = (
+            select(
+                PoseFrame.id,
+                func.row_number().over(order_by=PoseFrame.frame_index).label("rn"),
+            )
+            .where(*in_range)
+            .subquery()
+        )
+        stmt = (
+            select(PoseFrame.frame_index, PoseFrame.timestamp_ms, PoseFrame.landmarks)
+            .join(numbered, numbered.c.id == PoseFrame.id)
+            .where((numbered.c.rn - 1) % stride == 0)
+        )
+    if after_frame is not None:
+        stmt = stmt.where(PoseFrame.frame_index > after_frame)
+    return stmt.order_by(PoseFrame.frame_index).limit(limit)
+
+
+def _rows_to_track(rows: Sequence) -> Track:
+    if not rows:
+        return empty_track()
+    return (
+        np.array([r.frame_index for r in rows], dtype=np.int32),
+        np.array([r.timestamp_ms for r in rows], dtype=np.int32),
+        landmark_codec.decode_many(r.landmarks for r in rows),
+    )
+
+
+def _read_track_file(
+    path: str | Path,
+    start_ms: int | None,
+    stop_ms: int | None,
+    stride: int,
+    after_frame: int | None,
+    limit: int | None,
+) -> Track:
+    with TrackReader(path) as reader:
+        if stride == 1 and after_frame is None and limit is None:
+            return reader.time_range(start_ms, stop_ms)
+        return reader.take(reader.positions(start_ms, stop_ms, stride, after_frame, limit))
+
+
+def _read_frame_file(path: str | Path, frame_index: int) -> tuple[int, np.ndarray] | None:
+    with TrackReader(path) as reader:
+        return reader.frame(frame_index)
+
+
+async def _read_track(
+    db: AsyncSession,
+    video_id: uuid.UUID,
+    start_ms: int | None = None,
+    stop_ms: int | None = None,
+    stride: int = 1,
+    after_frame: int | None = None,
+    limit: int | None = None,
+) -> Track:
+    track = await db.get(PoseTrack, video_id)
+    if track is not None:
+        # Decompression and unshuffling run in a worker thread so long
+        # tracks don't stall the event loop
+        return await asyncio.to_thread(
+            _read_track_file, track.path, start_ms, stop_ms, stride, after_frame, limit,
+        )
+
+    stmt = _frames_query(video_id, start_ms, stop_ms, stride, after_frame, limit)
+    rows = (await db.execute(stmt)).all()
+    return await asyncio.to_thread(_rows_to_track, rows)
+
+
+# video_id -> (pose_version, pose_frames row count), so a track too large for
+# the cache is counted once per write, not on every request
+_row_counts: dict[uuid.UUID, tuple[int, int]] = {}
+
+
+async def _decoded_nbytes(db: AsyncSession, video: Video) -> int:
+    """Size of a video's decoded track, from its track file header or its pose_frames row count."""
+    track = await db.get(PoseTrack, video.id)
+    if track is not None:
+        n = read_frame_count(track.path)
+    else:
+        version, n = _row_counts.get(video.id, (None, 0))
+        if version != video.pose_version:
+            n = (await db.execute(
+                select(func.count()).select_from(PoseFrame).where(PoseFrame.video_id == video.id)
+            )).scalar()
+            _row_counts[video.id] = (video.pose_version, n)
+    return n * (landmark_codec.FRAME_BYTES + 8)
+
+
+async def _cached_track(db: AsyncSession, video_id: uuid.UUID) -> Track | None:
+    """Return a video's whole track from :mod:`track_cache`, reading it in on a miss.
+
+    Only completed videos are cached, as their frames no longer change, and
+    only tracks small enough for the cache. Otherwise returns None and the
+    caller reads just the frames it needs.
+    """
+    if not settings.TRACK_CACHE_ENABLED:
+        return None
+    track = track_cache.get(video_id)
+    if track is not None:
+        return track
+    video = await db.get(Video, video_id)
+    if video is None or video.status != "completed" or video.deleted_at is not None:
+        return None
+    if not track_cache.fits(await _decoded_nbytes(db, video)):
+        return None
+    generation = track_cache.generation(video_id)
+    track = await _read_track(db, video_id)
+    track_cache.put(video_id, track, generation)
+    return track
+
+
+async def load_track(
+    db: AsyncSession,
+    video_id: uuid.UUID,
+    start_ms: int | None = None,
+    stop_ms: int | None = None,
+    stride: int = 1,
+    after_frame: int | None = None,
+    limit: int | None = None,
+) -> Track:
+    """Return a video's poses in ``[start_ms, stop_ms]``.
+
+    Served from the in-process track cache when possible. Otherwise reads
+    the track file when the video has one, and the ``pose_frames`` rows
+    (webcam recordings, videos processed before track files existed) when
+    it doesn't. The returned arrays may be read-only.
+
+    ``stride`` keeps every stride-th frame of the range, counted from its
+    first frame. ``after_frame`` and ``limit`` page through the result by
+    frame_index: only frames after ``after_frame`` are returned, at most
+    ``limit`` of them. Frames that are skipped are never decoded, and on the
+    ``pose_frames`` path their landmarks are never read.
+    """
+    cached = await _cached_track(db, video_id)
+    if cached is None:
+        return await _read_track(db, video_id, start_ms, stop_ms, stride, after_frame, limit)
+    if start_ms is None and stop_ms is None and stride == 1 and after_frame is None and limit is None:
+        return cached
+    positions = _positions(cached[0], cached[1], start_ms, stop_ms, stride, after_frame, limit)
+    return tuple(a[positions] for a in cached)
+
+
+async def iter_track(
+    video_id: uuid.UUID,
+    start_ms: int | None = None,
+    stop_ms: int | None = None,
+    stride: int = 1,
+    after_frame: int | None = None,
+    limit: int | None = None,
+    batch_frames: int | None = None,
+) -> AsyncIterator[Track]:
+    """Yield the frames :func:`load_track` would return, ``batch_frames`` at a time.
+
+    ``pose_frames`` rows are read through a server-side cursor, so only one
+    batch is held in memory. The generator opens its own session because it
+    is consumed by a streaming response, after the request's session closes.
+    """
+    batch_frames = batch_frames or settings.POSE_STREAM_BATCH_FRAMES
+    # Use a cached track, but don't read a whole one in just to stream it
+    cached = track_cache.get(video_id) if settings.TRACK_CACHE_ENABLED else None
+    if cached is not None:
+        positions = _positions(cached[0], cached[1], start_ms, stop_ms, stride, after_frame, limit)
+        for start in range(0, len(positions), batch_frames):
+            batch = positions[start:start + batch_frames]
+            yield tuple(a[batch] for a in cached)
+        return
+
+    async with async_session_factory() as db:
+        track = await db.get(PoseTrack, video_id)
+        if track is not None:
+            with TrackReader(track.path) as reader:
+                positions = reader.positions(start_ms, stop_ms, stride, after_frame, limit)
+                for start in range(0, len(positions), batch_frames):
+                    yield await asyncio.to_thread(reader.take, positions[start:start + batch_frames])
+            return
+
+        stmt = _frames_query(video_id, start_ms, stop_ms, stride, after_frame, limit)
+        result = await db.stream(stmt.execution_options(yield_per=batch_frames))
+        async for rows in result.partitions():
+            yield await asyncio.to_thread(_rows_to_track, rows)
+
+
+async def load_frame(
+    db: AsyncSession, video_id: uuid.UUID, frame_index: int,
+) -> tuple[int, np.ndarray] | None:
+    """Return ``(timestamp_ms, landmarks)`` of one frame, or None if it doesn't exist."""
+    cached = await _cached_track(db, video_id)
+    if cached is not None:
+        i = _frame_position(cached[0], frame_index)
+        return None if i is None else (int(cached[1][i]), cached[2][i])
+
+    track = await db.get(PoseTrack, video_id)
+    if track is not None:
+        return await asyncio.to_thread(_read_frame_file, track.path, frame_index)
+
+    row = (await db.execute(
+        select(PoseFrame.timestamp_ms, PoseFrame.landmarks).where(
+            PoseFrame.video_id == video_id,
+            PoseFrame.frame_index == frame_index,
+        )
+    )).one_or_none()
+    if row is None:
+        return None
+    return row.timestamp_ms, landmark_codec.decode(row.landmarks)
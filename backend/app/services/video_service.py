@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 import shutil
 import uuid
 from pathlib import Path
@@ -19,3 +20,12 @@ def download_youtube_video(url: str) -> tuple[Path, str | None, str | None]:
     """Download a YouTube video. Returns (file_path, video_title, channel_name)."""
     from kinstretch.youtube import download_video
     return download_video(url, out_dir=settings.UPLOAD_DIR)
+
+
+_YOUTUBE_ID_RE = re.compile(r"(?:v=|/shorts/|/embed/|/live/|youtu\.be/)([A-Za-z0-9_-]{11})")
+
+
+def youtube_video_id(url: str) -> str | None:
+    """Extract the 11-character video ID from a YouTube URL, if present."""
+    match = _YOUTUBE_ID_RE.search(url)
+    return match.group(1) if match else None
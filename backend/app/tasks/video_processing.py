@@ -1,13 +1,114 @@
 from __future__ import annotations
 
+import time
 import uuid
 import traceback
+from typing import TYPE_CHECKING
 
+import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
 from app.database import get_sync_db
+from app.models.job_stats import JobStats
 from app.models.pose_frame import PoseFrame as PoseFrameORM
+from app.models.pose_track import PoseTrack as PoseTrackORM
 from app.models.video import Video as VideoORM
-from app.services import pose_service, video_service
-from app.services.task_manager import TaskStatus, update_task
+from app.services import (
+    frame_writer, model_tiers, pose_cache, pose_service, startup, track_store, video_service,
+)
+from app.services import task_manager
+from app.services.task_manager import TaskStatus, set_task_file_path, set_task_model_tier, update_task
+
+if TYPE_CHECKING:
+    from kinstretch.timing import StageTimer
+
+
+def _record_job_stats(
+    db: Session,
+    video_id: uuid.UUID,
+    status: str,
+    timer: StageTimer,
+    wall_s: float,
+    model_tier: str | None,
+    cache_hit: bool,
+    frame_count: int,
+) -> None:
+    """Store the stage timings of one run; failures here never fail the job."""
+    try:
+        db.add(JobStats(
+            video_id=video_id,
+            status=status,
+            model_tier=model_tier,
+            cache_hit=cache_hit,
+            frame_count=frame_count,
+            wall_s=round(wall_s, 4),
+            stages=timer.summary(),
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        traceback.print_exc()
+
+
+class _TimedIterator:
+    """Iterates ``records`` and adds up the time spent waiting for each item.
+
+    Around the extraction generator this is the extraction's own time, without
+    the writes done between frames.
+    """
+
+    def __init__(self, records):
+        self._records = iter(records)
+        self.seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self._records)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+
+def _cache_key(
+    source_id: str,
+    model_tier: str,
+    sample_hz: float | None,
+    start_s: float | None,
+    stop_s: float | None,
+) -> str | None:
+    """Pose cache key of an extraction, or None if the tier's model isn't downloaded yet."""
+    try:
+        return pose_cache.cache_key(
+            source_id,
+            pose_service.get_model_path(model_tier),
+            frame_stride=5,
+            sample_hz=sample_hz if sample_hz is not None else settings.POSE_SAMPLE_HZ,
+            start_s=start_s,
+            stop_s=stop_s,
+            options=pose_service.extraction_options(),
+        )
+    except FileNotFoundError:
+        return None
+
+
+def _copy_youtube_metadata(db: Session, video: VideoORM) -> None:
+    """Fill in title and channel from another import of the same downloaded file."""
+    other = db.execute(
+        select(VideoORM.title, VideoORM.creator)
+        .where(VideoORM.file_path == video.file_path, VideoORM.id != video.id)
+        .limit(1)
+    ).first()
+    if other is None:
+        return
+    if other.title and not video.title:
+        video.title = other.title
+    if other.creator and not video.creator:
+        video.creator = other.creator
 
 
 def process_video_task(
@@ -17,30 +118,76 @@ def process_video_task(
     file_path: str | None,
     start_s: float | None = None,
     stop_s: float | None = None,
+    sample_hz: float | None = None,
+    model_tier: str | None = None,
 ):
     """Background task: download video (if YouTube), extract poses, store in DB.
 
-    Called from FastAPI BackgroundTasks so runs in a thread.
+    Called from FastAPI BackgroundTasks so runs in a thread. ``sample_hz``
+    samples poses at a fixed rate instead of every 5th frame. ``model_tier``
+    is lite/full/heavy, "auto" to choose from the video length and queue
+    depth, or None for ``settings.POSE_MODEL_TIER``. With
+    ``settings.POSE_TRACK_FILES`` the poses are written to one track file
+    indexed by a PoseTrack row; otherwise frames are bulk-inserted and
+    committed every ``settings.POSE_INSERT_BATCH_SIZE`` poses. Progress tracks the extraction
+    position either way.
+
+    With ``settings.JOB_STATS_ENABLED`` the time spent in each stage
+    (download, decode, inference, DB insert, ...) is stored as a JobStats row.
     """
+    from kinstretch.timing import NULL_TIMER, StageTimer
+
+    timer = StageTimer() if settings.JOB_STATS_ENABLED else NULL_TIMER
+    job_start = time.perf_counter()
+    status = None
+    cached = None
+    frame_count = 0
     db = get_sync_db()
     try:
         video = db.get(VideoORM, video_id)
-        if not video:
+        if not video or video.deleted_at is not None:
             return
 
         video.status = "processing"
         db.commit()
         update_task(video_id, TaskStatus.PROCESSING, progress_pct=5.0)
 
+        youtube_id = video_service.youtube_video_id(url) if source_type == "youtube" and url else None
+        cache_key = None
+        # A YouTube video with a fixed tier is keyed by its ID alone, so a
+        # re-import can be answered from the pose cache before downloading
+        # or waiting for models
+        if settings.POSE_CACHE_ENABLED and youtube_id and (model_tier or settings.POSE_MODEL_TIER) != "auto":
+            with timer.stage("cache_lookup"):
+                model_tier = model_tiers.resolve_tier(model_tier, 0)
+                cache_key = _cache_key(f"youtube:{youtube_id}", model_tier, sample_hz, start_s, stop_s)
+                cached = pose_cache.get(cache_key) if cache_key else None
+
         # Step 1: Get the video file
         if source_type == "youtube" and url:
             update_task(video_id, TaskStatus.PROCESSING, progress_pct=10.0)
-            path, yt_title, yt_creator = video_service.download_youtube_video(url)
-            video.file_path = str(path)
-            if yt_title and not video.title:
-                video.title = yt_title
-            if yt_creator and not video.creator:
-                video.creator = yt_creator
+            downloaded = settings.UPLOAD_DIR / f"{youtube_id}.mp4" if youtube_id else None
+            reuse = False
+            if downloaded is not None:
+                # Claim the file before looking for it, so the purger can't
+                # delete an earlier import's copy once this job relies on it
+                with task_manager.file_lock:
+                    set_task_file_path(video_id, str(downloaded))
+                    reuse = cached is not None and downloaded.exists()
+            if reuse:
+                # The poses are cached and an earlier import's file is still
+                # there for playback
+                path = downloaded
+                video.file_path = str(path)
+                _copy_youtube_metadata(db, video)
+            else:
+                with timer.stage("download"):
+                    path, yt_title, yt_creator = video_service.download_youtube_video(url)
+                video.file_path = str(path)
+                if yt_title and not video.title:
+                    video.title = yt_title
+                if yt_creator and not video.creator:
+                    video.creator = yt_creator
             db.commit()
             update_task(video_id, TaskStatus.PROCESSING, progress_pct=30.0)
         elif file_path:
@@ -49,35 +196,139 @@ def process_video_task(
         else:
             raise ValueError("No video source available")
 
-        # Step 2: Extract poses
-        update_task(video_id, TaskStatus.PROCESSING, progress_pct=35.0)
-        pose_data = pose_service.extract_poses_from_video(str(path), start_s=start_s, stop_s=stop_s, frame_stride=5)
-        update_task(video_id, TaskStatus.PROCESSING, progress_pct=85.0)
+        # Step 2: Extract poses (or replay a cached extraction of the same
+        # content), storing them in batches as they are produced
+        cache_writer = None
+        if cached is None:
+            with timer.stage("wait_for_models"):
+                startup.wait_for_models()
+            update_task(video_id, TaskStatus.PROCESSING, progress_pct=35.0)
+            with timer.stage("probe"):
+                range_start_ms = int(start_s * 1000) if start_s is not None else 0
+                range_stop_ms = (
+                    int(stop_s * 1000) if stop_s is not None else pose_service.get_duration_ms(str(path))
+                )
+                range_ms = max(range_stop_ms - range_start_ms, 1)
+
+                model_tier = model_tiers.resolve_tier(
+                    model_tier,
+                    pose_service.estimate_inference_frames(str(path), start_s, stop_s, sample_hz=sample_hz),
+                )
+
+            if settings.POSE_CACHE_ENABLED and cache_key is None:
+                with timer.stage("cache_lookup"):
+                    source_id = (
+                        f"youtube:{youtube_id}" if youtube_id else f"sha256:{pose_cache.file_digest(path)}"
+                    )
+                    cache_key = _cache_key(source_id, model_tier, sample_hz, start_s, stop_s)
+                    cached = pose_cache.get(cache_key) if cache_key else None
+            if cache_key is not None and cached is None:
+                cache_writer = pose_cache.CacheWriter(cache_key)
+        set_task_model_tier(video_id, model_tier)
+
+        track_file = byte_size = None
+        last_timestamp_ms = None
+        if cached is not None:
+            # Cache hit: store the cached arrays as they are
+            timestamps_ms, landmarks = cached
+            frame_indices = np.arange(len(timestamps_ms), dtype=np.int32)
+            frame_count = len(timestamps_ms)
+            last_timestamp_ms = int(timestamps_ms[-1]) if frame_count else None
+            if settings.POSE_TRACK_FILES:
+                with timer.stage("track_write"):
+                    track_file = track_store.track_path(video_id)
+                    byte_size = track_store.write_track(track_file, frame_indices, timestamps_ms, landmarks)
+            else:
+                with timer.stage("db_insert"):
+                    frame_writer.insert_track(db, video_id, frame_indices, timestamps_ms, landmarks)
+        else:
+            records = pose_service.iter_pose_records(
+                str(path), start_s=start_s, stop_s=stop_s, frame_stride=5, sample_hz=sample_hz,
+                model_tier=model_tier, timer=timer,
+            )
+            records = _TimedIterator(records)
+
+            # With track files the poses go to one file written at the end;
+            # otherwise they are inserted as pose_frames rows in batches
+            track_writer = track_store.TrackWriter() if settings.POSE_TRACK_FILES else None
+            row_writer = None if track_writer is not None else frame_writer.FrameWriter(db, video_id)
+            for frame_index, timestamp_ms, landmarks in records:
+                if track_writer is not None:
+                    with timer.stage("track_write"):
+                        track_writer.add(frame_index, timestamp_ms, landmarks)
+                else:
+                    with timer.stage("db_insert"):
+                        row_writer.add(frame_index, timestamp_ms, landmarks)
+                if cache_writer is not None:
+                    with timer.stage("cache_write"):
+                        cache_writer.add(timestamp_ms, landmarks)
+                frame_count += 1
+                last_timestamp_ms = timestamp_ms
+                done = min(max((last_timestamp_ms - range_start_ms) / range_ms, 0.0), 1.0)
+                update_task(video_id, TaskStatus.PROCESSING, progress_pct=35.0 + 60.0 * done)
+
+            if row_writer is not None:
+                with timer.stage("db_insert"):
+                    row_writer.flush()
+            if cache_writer is not None:
+                with timer.stage("cache_write"):
+                    cache_writer.commit()
+            model_tiers.record_throughput(model_tier, frame_count, records.seconds)
+
+            if track_writer is not None:
+                with timer.stage("track_write"):
+                    track_file = track_store.track_path(video_id)
+                    byte_size = track_writer.write(track_file)
 
-        # Step 3: Store in DB
-        for frame in pose_data:
-            db.add(PoseFrameORM(
+        if track_file is not None:
+            db.merge(PoseTrackORM(
                 video_id=video_id,
-                frame_index=frame["frame_index"],
-                timestamp_ms=frame["timestamp_ms"],
-                landmarks=frame["landmarks"],
+                path=str(track_file),
+                frame_count=frame_count,
+                duration_ms=last_timestamp_ms or 0,
+                byte_size=byte_size,
             ))
+            frame_writer.bump_pose_version(db, video_id)
 
-        video.frame_count = len(pose_data)
-        if pose_data:
-            video.duration_ms = pose_data[-1]["timestamp_ms"]
+        video.frame_count = frame_count
+        if last_timestamp_ms is not None:
+            video.duration_ms = last_timestamp_ms
         video.status = "completed"
-        db.commit()
+        with timer.stage("db_commit"):
+            db.commit()
         update_task(video_id, TaskStatus.COMPLETED, progress_pct=100.0)
+        status = "completed"
 
     except Exception as e:
+        traceback.print_exc()
         db.rollback()
-        video = db.get(VideoORM, video_id)
-        if video:
-            video.status = "failed"
-            video.error_message = str(e)
+        # The failure may have come from the database itself, so the cleanup
+        # and the status update are each allowed to fail without skipping
+        # what follows
+        try:
+            # Drop the batches that were already committed
+            db.execute(delete(PoseFrameORM).where(PoseFrameORM.video_id == video_id))
             db.commit()
+            track_store.remove_track(video_id)
+        except Exception:
+            db.rollback()
+            traceback.print_exc()
+        video = None
+        try:
+            video = db.get(VideoORM, video_id)
+            if video:
+                video.status = "failed"
+                video.error_message = str(e)
+            db.commit()
+        except Exception:
+            db.rollback()
+            traceback.print_exc()
         update_task(video_id, TaskStatus.FAILED, error=str(e))
-        traceback.print_exc()
+        status = "failed" if video else None
     finally:
+        if settings.JOB_STATS_ENABLED and status is not None:
+            _record_job_stats(
+                db, video_id, status, timer, time.perf_counter() - job_start,
+                model_tier, cached is not None, frame_count,
+            )
         db.close()
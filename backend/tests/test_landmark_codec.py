@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.services import landmark_codec
+
+
+def _landmarks(seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).random((33, 4), dtype=np.float32)
+
+
+def test_round_trip_from_array():
+    landmarks = _landmarks()
+    data = landmark_codec.encode(landmarks)
+    assert len(data) == landmark_codec.FRAME_BYTES == 528
+    np.testing.assert_array_equal(landmark_codec.decode(data), landmarks)
+
+
+def test_round_trip_from_api_dicts():
+    landmarks = _landmarks()
+    dicts = landmark_codec.to_dicts(landmarks)
+    assert len(dicts) == 33 and set(dicts[0]) == {"x", "y", "z", "visibility"}
+    np.testing.assert_array_equal(landmark_codec.decode(landmark_codec.encode(dicts)), landmarks)
+
+
+def test_decode_many_stacks_frames():
+    frames = [_landmarks(seed) for seed in range(3)]
+    decoded = landmark_codec.decode_many(landmark_codec.encode(f) for f in frames)
+    np.testing.assert_array_equal(decoded, np.stack(frames))
+
+
+@pytest.mark.parametrize("landmarks", [
+    np.zeros((32, 4)),
+    np.zeros((33, 3)),
+    [{"x": 0.0, "y": 0.0, "z": 0.0, "visibility": 1.0}] * 5,
+])
+def test_to_array_rejects_wrong_shapes(landmarks):
+    with pytest.raises(ValueError):
+        landmark_codec.to_array(landmarks)
+
+
+def test_decode_rejects_partial_frames():
+    with pytest.raises(ValueError):
+        landmark_codec.decode(b"\0" * 100)
+    with pytest.raises(ValueError):
+        landmark_codec.decode_many([b"\0" * (landmark_codec.FRAME_BYTES + 4)])
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.services import pose_payload
+
+
+def _track(n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(n)
+    return (
+        np.arange(n, dtype=np.int32) * 3,
+        np.arange(n, dtype=np.int32) * 100,
+        rng.random((n, 33, 4), dtype=np.float32),
+    )
+
+
+@pytest.mark.parametrize("n, next_cursor", [(0, None), (1, None), (250, 747)])
+def test_round_trip(n, next_cursor):
+    frame_indices, timestamps_ms, landmarks = _track(n)
+    data = pose_payload.encode(frame_indices, timestamps_ms, landmarks, next_cursor)
+    assert len(data) == 16 + 8 * n + 528 * n
+    decoded = pose_payload.decode(data)
+    np.testing.assert_array_equal(decoded[0], frame_indices)
+    np.testing.assert_array_equal(decoded[1], timestamps_ms)
+    np.testing.assert_array_equal(decoded[2], landmarks)
+    assert decoded[3] == next_cursor
+
+
+def test_decode_rejects_other_payloads():
+    data = bytearray(pose_payload.encode(*_track(2)))
+    data[:4] = b"NOPE"
+    with pytest.raises(ValueError):
+        pose_payload.decode(bytes(data))
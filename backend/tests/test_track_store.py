@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.services import track_store
+
+
+@pytest.fixture
+def track(tmp_path):
+    n = 1000
+    rng = np.random.default_rng(0)
+    frame_indices = np.arange(n, dtype=np.int32)
+    timestamps_ms = (np.arange(n) * 167).astype(np.int32)
+    landmarks = rng.random((n, 33, 4), dtype=np.float32)
+    path = tmp_path / "track.ktrk"
+    track_store.write_track(path, frame_indices, timestamps_ms, landmarks, chunk_frames=64)
+    return path, frame_indices, timestamps_ms, landmarks
+
+
+def _assert_track_equal(actual, expected):
+    for a, e in zip(actual, expected):
+        np.testing.assert_array_equal(a, e)
+
+
+def test_write_read_round_trip(track):
+    path, frame_indices, timestamps_ms, landmarks = track
+    assert track_store.read_frame_count(path) == len(frame_indices)
+    with track_store.TrackReader(path) as reader:
+        _assert_track_equal(reader.time_range(), (frame_indices, timestamps_ms, landmarks))
+
+
+def test_time_range_is_inclusive(track):
+    path, frame_indices, timestamps_ms, landmarks = track
+    with track_store.TrackReader(path) as reader:
+        got = reader.time_range(timestamps_ms[100], timestamps_ms[300])
+    _assert_track_equal(got, (frame_indices[100:301], timestamps_ms[100:301], landmarks[100:301]))
+
+
+def test_empty_track(tmp_path):
+    path = tmp_path / "empty.ktrk"
+    track_store.write_track(path, *track_store.empty_track())
+    with track_store.TrackReader(path) as reader:
+        assert len(reader) == 0
+        assert reader.time_range()[2].shape == (0, 33, 4)
+
+
+def test_take_decodes_scattered_positions(track):
+    path, frame_indices, timestamps_ms, landmarks = track
+    positions = np.array([0, 1, 63, 64, 65, 500, 999])
+    with track_store.TrackReader(path) as reader:
+        got = reader.take(positions)
+    _assert_track_equal(got, (frame_indices[positions], timestamps_ms[positions], landmarks[positions]))
+
+
+def test_frame(track):
+    path, _, timestamps_ms, landmarks = track
+    with track_store.TrackReader(path) as reader:
+        timestamp_ms, frame = reader.frame(130)
+        assert reader.frame(5000) is None
+    assert timestamp_ms == timestamps_ms[130]
+    np.testing.assert_array_equal(frame, landmarks[130])
+
+
+@pytest.mark.parametrize("stride", [1, 3, 7])
+@pytest.mark.parametrize("start_ms, stop_ms", [(None, None), (10_000, 90_000)])
+def test_pages_concatenate_to_the_unpaged_read(track, stride, start_ms, stop_ms):
+    path, frame_indices, timestamps_ms, landmarks = track
+    with track_store.TrackReader(path) as reader:
+        unpaged = reader.take(reader.positions(start_ms, stop_ms, stride))
+        pages, cursor = [], None
+        while True:
+            page = reader.take(reader.positions(start_ms, stop_ms, stride, after_frame=cursor, limit=40))
+            if not len(page[0]):
+                break
+            pages.append(page)
+            cursor = int(page[0][-1])
+
+    # The stride is counted from the first frame of the range
+    first = 0 if start_ms is None else int(np.searchsorted(timestamps_ms, start_ms))
+    assert unpaged[0][0] == frame_indices[first]
+    assert np.all(np.diff(unpaged[0]) == stride)
+    _assert_track_equal(unpaged, [np.concatenate(parts) for parts in zip(*pages)])
@@ -0,0 +1,140 @@
+"""Benchmark writing pose frames to Postgres with each insert strategy.
+
+Usage (from the repository root, with the docker-compose database running
+and migrated)::
+
+    python -m benchmarks.bulk_insert --frames 50000
+    python -m benchmarks.bulk_insert --strategies insert copy --batch-size 2000
+
+Every strategy writes the same synthetic frames for its own scratch video,
+committing every ``--batch-size`` frames like ``process_video_task`` does,
+then upserts them a second time to time the conflict path. "orm" is the
+per-frame ``db.add`` unit-of-work path, for comparison. The scratch user,
+session and videos are deleted afterwards. The database is taken from
+``KINSTRETCH_DATABASE_URL_SYNC``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+STRATEGIES = ("orm", "insert", "copy")
+
+
+def synthetic_frames(n: int, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    landmarks = rng.random((n, 33, 4), dtype=np.float32)
+    return [
+        {"frame_index": i, "timestamp_ms": i * 33, "landmarks": landmarks[i]}
+        for i in range(n)
+    ]
+
+
+def _write(db, video_id: uuid.UUID, frames: list[dict], strategy: str, batch_size: int, upsert: bool) -> None:
+    from app.models.pose_frame import PoseFrame
+    from app.services import frame_writer, landmark_codec
+
+    if strategy == "orm":
+        for i, f in enumerate(frames, 1):
+            row = PoseFrame(
+                video_id=video_id,
+                frame_index=f["frame_index"],
+                timestamp_ms=f["timestamp_ms"],
+                landmarks=landmark_codec.encode(f["landmarks"]),
+            )
+            if upsert:
+                # No unique-key merge in the ORM: look the row up and update it
+                existing = db.query(PoseFrame).filter_by(
+                    video_id=video_id, frame_index=f["frame_index"],
+                ).one()
+                existing.timestamp_ms, existing.landmarks = row.timestamp_ms, row.landmarks
+            else:
+                db.add(row)
+            if i % batch_size == 0:
+                db.commit()
+        db.commit()
+        return
+
+    writer = frame_writer.FrameWriter(db, video_id, batch_size=batch_size, strategy=strategy)
+    for f in frames:
+        writer.add(f["frame_index"], f["timestamp_ms"], f["landmarks"])
+    writer.flush()
+
+
+def run(n_frames: int, strategies: list[str], batch_size: int) -> dict:
+    from sqlalchemy import delete
+
+    from app.database import get_sync_db
+    from app.models import AnalysisSession, User, Video
+
+    frames = synthetic_frames(n_frames)
+    results = {}
+    db = get_sync_db()
+    user = User(email=f"bench-{uuid.uuid4()}@kinstretch.invalid", name="bulk insert benchmark")
+    db.add(user)
+    db.flush()
+    session = AnalysisSession(user_id=user.id, title="bulk insert benchmark")
+    db.add(session)
+    db.commit()
+    try:
+        for strategy in strategies:
+            video = Video(session_id=session.id, source_type="upload", status="completed")
+            db.add(video)
+            db.commit()
+            timings = {}
+            for phase in ("insert", "upsert"):
+                print(f"{strategy} {phase}...", end=" ", flush=True)
+                if strategy == "orm" and phase == "upsert":
+                    # One SELECT per row; only time a slice of it
+                    sample = frames[:2000]
+                else:
+                    sample = frames
+                start = time.perf_counter()
+                _write(db, video.id, sample, strategy, batch_size, upsert=phase == "upsert")
+                seconds = time.perf_counter() - start
+                timings[phase] = {
+                    "rows": len(sample),
+                    "seconds": round(seconds, 3),
+                    "rows_per_s": round(len(sample) / seconds, 1) if seconds > 0 else 0.0,
+                }
+                print(f"{timings[phase]['rows_per_s']:.0f} rows/s")
+            results[strategy] = timings
+    finally:
+        db.rollback()
+        db.execute(delete(User).where(User.id == user.id))
+        db.commit()
+        db.close()
+
+    return {"frames": n_frames, "batch_size": batch_size, "strategies": results}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--strategies", nargs="*", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = run(args.frames, args.strategies, args.batch_size)
+    print(f"{'strategy':<10} {'insert rows/s':>14} {'upsert rows/s':>14}")
+    for name, timings in report["strategies"].items():
+        print(f"{name:<10} {timings['insert']['rows_per_s']:>14.0f} {timings['upsert']['rows_per_s']:>14.0f}")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""Benchmark ``kinstretch.pose_extraction`` on deterministic synthetic videos.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.extraction --stub --output bench.json
+    python -m benchmarks.extraction --stub --baseline benchmarks/baseline.json
+
+Each case runs in a fresh process, so peak RSS is per case and model
+loading is excluded from the timings (models are warmed first). ``--stub``
+replaces the MediaPipe landmarker with one that returns a fixed pose, which
+isolates decode and pipeline overhead from model cost and needs no model
+download.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from benchmarks.synthetic import DEFAULT_SPECS, ensure_videos
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_VIDEO_DIR = BENCH_DIR / "videos"
+REPORT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Case:
+    """One benchmark run: a synthetic video plus ``extract_poses`` options."""
+
+    name: str
+    video: str
+    model_tier: str = "heavy"
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+def default_cases(stub: bool) -> list[Case]:
+    """The standard case matrix.
+
+    Model tiers only differ with the real landmarker, so stub runs cover a
+    single tier.
+    """
+    cases = []
+    for spec in DEFAULT_SPECS:
+        for stride in (1, 5):
+            cases.append(Case(f"{spec.name}-stride{stride}", spec.name, options={"frame_stride": stride}))
+    cases += [
+        Case("hd-stride1-serial", "hd", options={"frame_stride": 1, "pipelined": False}),
+        Case("hd-adaptive", "hd", options={"frame_stride": 1, "adaptive": True}),
+        Case("fhd-maxside640", "fhd", options={"frame_stride": 1, "max_side": 640}),
+        Case("fhd-roi", "fhd", options={"frame_stride": 1, "roi": True}),
+        Case("sd-depth", "sd", options={"frame_stride": 5, "enhance_depth": True}),
+    ]
+    if not stub:
+        cases += [
+            Case(f"hd-stride5-{tier}", "hd", model_tier=tier, options={"frame_stride": 5})
+            for tier in ("lite", "full")
+        ]
+    return cases
+
+
+# ---------------------------------------------------------------------------
+# Model stub
+# ---------------------------------------------------------------------------
+
+
+class _StubLandmark:
+    __slots__ = ("x", "y", "z", "visibility")
+
+    def __init__(self, x: float, y: float):
+        self.x, self.y, self.z, self.visibility = x, y, 0.0, 0.9
+
+
+class StubLandmarker:
+    """Stands in for a VIDEO-mode PoseLandmarker; always finds the same pose."""
+
+    def __init__(self) -> None:
+        pose = [_StubLandmark(0.4 + 0.2 * (i % 2), 0.2 + 0.6 * i / 32) for i in range(33)]
+        self._result = types.SimpleNamespace(pose_landmarks=[pose])
+        self._last_ms = -1
+
+    def detect_for_video(self, image: Any, timestamp_ms: int) -> Any:
+        if timestamp_ms <= self._last_ms:
+            raise ValueError("Input timestamp must be monotonically increasing.")
+        self._last_ms = timestamp_ms
+        return self._result
+
+    def close(self) -> None:
+        pass
+
+
+def install_stub() -> None:
+    """Make every landmarker created through ``kinstretch.model_pool`` a stub."""
+    import kinstretch.model_pool
+
+    kinstretch.model_pool.create_landmarker = lambda model_path, **options: StubLandmarker()
+
+
+# ---------------------------------------------------------------------------
+# Running cases
+# ---------------------------------------------------------------------------
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _run_case(video_path: str, model_path: str, options: dict[str, Any], stub: bool) -> dict:
+    """Run one case in the current (fresh) process and return its measurements."""
+    if stub:
+        install_stub()
+
+    from kinstretch.model_pool import ModelPool
+    from kinstretch.pose_extraction import iter_poses
+
+    pool = ModelPool()
+    pool.warm(
+        model_path,
+        depth_model_name=options.get("depth_model_name", "depth-anything/Depth-Anything-V2-Small-hf")
+        if options.get("enhance_depth") else None,
+        count=2 if options.get("adaptive") else 1,
+    )
+
+    latencies = []
+    start = last = time.perf_counter()
+    for _ in iter_poses(video_path, model_path, pool=pool, **options):
+        now = time.perf_counter()
+        latencies.append(now - last)
+        last = now
+    wall_s = time.perf_counter() - start
+    pool.close()
+
+    latencies_ms = sorted(1000 * x for x in latencies)
+    return {
+        "frames": len(latencies),
+        "wall_s": round(wall_s, 4),
+        "fps": round(len(latencies) / wall_s, 2) if wall_s > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies_ms, 50), 3),
+            "p90": round(_percentile(latencies_ms, 90), 3),
+            "p99": round(_percentile(latencies_ms, 99), 3),
+            "max": round(latencies_ms[-1], 3) if latencies_ms else 0.0,
+        },
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def run_case(case: Case, video_path: Path, model_dir: Path, stub: bool, repeat: int = 1) -> dict:
+    """Run ``case`` ``repeat`` times, each in a fresh process; keep the median-fps run."""
+    if stub:
+        model_path = model_dir / "stub.task"
+    else:
+        from kinstretch.pose_extraction import download_model
+
+        model_path = download_model(model_dir, case.model_tier)
+
+    runs = []
+    ctx = multiprocessing.get_context("spawn")
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+            runs.append(executor.submit(
+                _run_case, str(video_path), str(model_path), case.options, stub,
+            ).result())
+    runs.sort(key=lambda r: r["fps"])
+    result = runs[len(runs) // 2]
+    result["fps_runs"] = [r["fps"] for r in runs]
+    return result
+
+
+def environment() -> dict:
+    import cv2
+    import numpy as np
+
+    try:
+        import mediapipe
+        mediapipe_version = mediapipe.__version__
+    except ImportError:
+        mediapipe_version = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "mediapipe": mediapipe_version,
+    }
+
+
+def run(
+    cases: list[Case],
+    video_dir: Path = DEFAULT_VIDEO_DIR,
+    model_dir: Path = Path("models"),
+    stub: bool = False,
+    repeat: int = 1,
+) -> dict:
+    """Run ``cases`` and return the JSON report."""
+    specs = [s for s in DEFAULT_SPECS if s.name in {c.video for c in cases}]
+    videos = ensure_videos(video_dir, specs)
+
+    results = {}
+    for case in cases:
+        print(f"{case.name}...", end=" ", flush=True)
+        results[case.name] = {
+            "video": videos[case.video].name,
+            "model_tier": "stub" if stub else case.model_tier,
+            "options": case.options,
+            **run_case(case, videos[case.video], model_dir, stub, repeat),
+        }
+        print(f"{results[case.name]['fps']:.1f} fps")
+
+    return {
+        "version": REPORT_VERSION,
+        "stub": stub,
+        "environment": environment(),
+        "cases": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.1) -> list[dict]:
+    """Compare a report with a baseline; return the cases that regressed.
+
+    A case regresses when its fps drops, or its p90 latency or peak RSS
+    grows, by more than ``tolerance`` (a fraction) relative to the baseline.
+    Cases missing from either report are skipped.
+    """
+    regressions = []
+    for name, result in report["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            continue
+        checks = [
+            ("fps", base["fps"], result["fps"], result["fps"] < base["fps"] * (1 - tolerance)),
+            (
+                "latency_p90_ms",
+                base["latency_ms"]["p90"],
+                result["latency_ms"]["p90"],
+                result["latency_ms"]["p90"] > base["latency_ms"]["p90"] * (1 + tolerance),
+            ),
+            (
+                "peak_rss_mb",
+                base["peak_rss_mb"],
+                result["peak_rss_mb"],
+                result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance),
+            ),
+        ]
+        for metric, before, after, regressed in checks:
+            if regressed:
+                regressions.append({"case": name, "metric": metric, "baseline": before, "current": after})
+    return regressions
+
+
+def print_comparison(report: dict, baseline: dict) -> None:
+    print(f"{'case':<24} {'fps':>10} {'base':>10} {'change':>8}")
+    for name, result in report["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            print(f"{name:<24} {result['fps']:>10.1f} {'-':>10} {'new':>8}")
+            continue
+        change = (result["fps"] / base["fps"] - 1) * 100 if base["fps"] else 0.0
+        print(f"{name:<24} {result['fps']:>10.1f} {base['fps']:>10.1f} {change:>+7.1f}%")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stub", action="store_true", help="use a stub landmarker instead of MediaPipe")
+    parser.add_argument("--cases", nargs="*", help="only run cases whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case; the median is reported")
+    parser.add_argument("--video-dir", type=Path, default=DEFAULT_VIDEO_DIR)
+    parser.add_argument("--model-dir", type=Path, default=Path("models"))
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="compare against this JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed regression, as a fraction")
+    args = parser.parse_args(argv)
+
+    cases = default_cases(args.stub)
+    if args.cases:
+        cases = [c for c in cases if any(pattern in c.name for pattern in args.cases)]
+    if not cases:
+        parser.error("no cases selected")
+
+    report = run(cases, args.video_dir, args.model_dir, stub=args.stub, repeat=args.repeat)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Report written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("stub") != report["stub"]:
+            print("Warning: baseline and report differ in --stub; timings are not comparable")
+        print_comparison(report, baseline)
+        regressions = compare(report, baseline, args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['case']}: {r['metric']} {r['baseline']} -> {r['current']}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+@dataclass(frozen=True)
+class VideoSpec:
+    """Resolution, frame rate and length of one synthetic benchmark video."""
+
+    name: str
+    width: int
+    height: int
+    fps: float
+    seconds: float
+
+    @property
+    def n_frames(self) -> int:
+        return int(round(self.fps * self.seconds))
+
+    @property
+    def filename(self) -> str:
+        return f"{self.name}_{self.width}x{self.height}_{self.fps:g}fps_{self.seconds:g}s.mp4"
+
+
+DEFAULT_SPECS = [
+    VideoSpec("sd", 640, 360, 30, 20),
+    VideoSpec("hd", 1280, 720, 30, 20),
+    VideoSpec("fhd", 1920, 1080, 30, 10),
+    VideoSpec("fhd60", 1920, 1080, 60, 10),
+    VideoSpec("uhd", 3840, 2160, 30, 5),
+]
+
+# Limb segments of the stick figure, as (from, to) joint names
+_BONES = [
+    ("head", "neck"), ("neck", "pelvis"),
+    ("neck", "l_elbow"), ("l_elbow", "l_wrist"),
+    ("neck", "r_elbow"), ("r_elbow", "r_wrist"),
+    ("pelvis", "l_knee"), ("l_knee", "l_ankle"),
+    ("pelvis", "r_knee"), ("r_knee", "r_ankle"),
+]
+
+
+def _joints(t: float, width: int, height: int) -> dict[str, tuple[int, int]]:
+    """Joint pixel positions of the stick figure at time ``t`` (seconds).
+
+    Alternates a slow hold-like phase with a faster arm and leg sweep, so
+    the clip has the mix of static and moving sections found in class footage.
+    """
+    unit = height / 8
+    cx = width / 2 + unit * 0.5 * math.sin(2 * math.pi * t / 10)
+    neck = (cx, height * 0.3)
+    pelvis = (cx, neck[1] + 2.2 * unit)
+    # Slow for 3 s, fast for 2 s
+    phase = t % 5
+    swing = 0.2 * math.sin(2 * math.pi * phase / 3) if phase < 3 else math.sin(2 * math.pi * phase)
+
+    def limb(origin: tuple[float, float], angle: float, length: float) -> tuple[float, float]:
+        return origin[0] + length * math.sin(angle), origin[1] + length * math.cos(angle)
+
+    l_elbow = limb(neck, 1.2 + 0.9 * swing, 1.2 * unit)
+    r_elbow = limb(neck, -1.2 - 0.9 * swing, 1.2 * unit)
+    l_knee = limb(pelvis, 0.3 + 0.4 * swing, 1.5 * unit)
+    r_knee = limb(pelvis, -0.3 - 0.4 * swing, 1.5 * unit)
+    joints = {
+        "head": (cx, neck[1] - 0.8 * unit),
+        "neck": neck,
+        "pelvis": pelvis,
+        "l_elbow": l_elbow,
+        "l_wrist": limb(l_elbow, 1.6 + 0.6 * swing, unit),
+        "r_elbow": r_elbow,
+        "r_wrist": limb(r_elbow, -1.6 - 0.6 * swing, unit),
+        "l_knee": l_knee,
+        "l_ankle": limb(l_knee, 0.1, 1.5 * unit),
+        "r_knee": r_knee,
+        "r_ankle": limb(r_knee, -0.1, 1.5 * unit),
+    }
+    return {name: (int(round(x)), int(round(y))) for name, (x, y) in joints.items()}
+
+
+def render_frame(t: float, width: int, height: int, background: np.ndarray) -> np.ndarray:
+    """Draw the stick figure at time ``t`` over ``background`` (BGR)."""
+    frame = background.copy()
+    joints = _joints(t, width, height)
+    thickness = max(2, height // 90)
+    for a, b in _BONES:
+        cv2.line(frame, joints[a], joints[b], (40, 40, 40), thickness, cv2.LINE_AA)
+    cv2.circle(frame, joints["head"], max(4, height // 25), (40, 40, 40), -1, cv2.LINE_AA)
+    return frame
+
+
+def _background(width: int, height: int, seed: int) -> np.ndarray:
+    """A fixed, lightly textured background, so frames aren't trivially compressible."""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 24, size=(height // 8 + 1, width // 8 + 1, 1), dtype=np.uint8)
+    noise = cv2.resize(noise, (width, height), interpolation=cv2.INTER_LINEAR)
+    return (np.full((height, width, 3), 200, np.uint8) - noise[..., None]).astype(np.uint8)
+
+
+def write_video(spec: VideoSpec, path: str | Path, seed: int = 0) -> Path:
+    """Render ``spec`` to an mp4 file. The same spec and seed give the same frames."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = path.with_suffix(".part.mp4")
+    writer = cv2.VideoWriter(
+        str(part_path), cv2.VideoWriter_fourcc(*"mp4v"), spec.fps, (spec.width, spec.height),
+    )
+    if not writer.isOpened():
+        raise RuntimeError(f"Could not open a video writer for {part_path}")
+    background = _background(spec.width, spec.height, seed)
+    try:
+        for i in range(spec.n_frames):
+            writer.write(render_frame(i / spec.fps, spec.width, spec.height, background))
+    finally:
+        writer.release()
+    part_path.replace(path)
+    return path
+
+
+def ensure_videos(video_dir: str | Path, specs: list[VideoSpec] = DEFAULT_SPECS) -> dict[str, Path]:
+    """Render any of ``specs`` not already in ``video_dir``; return name -> path."""
+    video_dir = Path(video_dir)
+    paths = {}
+    for spec in specs:
+        path = video_dir / spec.filename
+        if not path.exists():
+            print(f"Rendering {path.name}...")
+            write_video(spec, path)
+        paths[spec.name] = path
+    return paths
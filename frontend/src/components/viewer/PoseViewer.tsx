@@ -15,7 +15,7 @@ interface Props {
 }
 
 export default function PoseViewer({ video }: Props) {
-  const { loading, error } = usePoseData(video.id);
+  const { loading, streaming, error } = usePoseData(video.id);
   const frames = useAppStore((s) => s.frames);
   const currentFrameIndex = useAppStore((s) => s.currentFrameIndex);
   const selectedEdges = useAppStore((s) => s.selectedEdges);
@@ -72,6 +72,13 @@ export default function PoseViewer({ video }: Props) {
               Planes
             </button>
           </div>
+
+          {/* Frames still arriving from the pose stream */}
+          {streaming && (
+            <div className="absolute top-2 right-2 z-10 text-xs px-2.5 py-1 rounded-full bg-black/40 text-brand-400 border border-white/10">
+              Loading poses... {frames.length} frames
+            </div>
+          )}
         </div>
 
         {/* Video panel — 20% default, 50% when expanded */}
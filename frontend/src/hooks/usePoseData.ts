@@ -1,27 +1,50 @@
 import { useEffect, useState } from 'react';
 import { getPoses } from '../services/api';
 import { useAppStore } from '../stores/appStore';
+import { trackFrames } from '../utils/poseTrack';
+
+// Frames per binary page: about 2.7 MB, so the first page renders quickly
+const POSE_PAGE_FRAMES = 5000;
 
 export function usePoseData(videoId: string | null) {
   const [loading, setLoading] = useState(false);
+  const [streaming, setStreaming] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const setFrames = useAppStore((s) => s.setFrames);
+  const appendFrames = useAppStore((s) => s.appendFrames);
 
   useEffect(() => {
     if (!videoId) return;
 
+    const controller = new AbortController();
     setLoading(true);
+    setStreaming(true);
     setError(null);
+    setFrames([]);
 
-    getPoses(videoId)
-      .then((data) => {
-        setFrames(data.frames);
-      })
+    // The track is fetched in the binary layout, a page at a time; the
+    // viewer renders from the first page while later pages are appended
+    (async () => {
+      let cursor: number | undefined;
+      do {
+        const track = await getPoses(videoId, { limit: POSE_PAGE_FRAMES, cursor }, controller.signal);
+        appendFrames(trackFrames(track));
+        setLoading(false);
+        cursor = track.nextCursor ?? undefined;
+      } while (cursor !== undefined);
+    })()
       .catch((err) => {
+        if (controller.signal.aborted) return;
         setError(err.message || 'Failed to load pose data');
       })
-      .finally(() => setLoading(false));
-  }, [videoId, setFrames]);
+      .finally(() => {
+        if (controller.signal.aborted) return;
+        setLoading(false);
+        setStreaming(false);
+      });
+
+    return () => controller.abort();
+  }, [videoId, setFrames, appendFrames]);
 
-  return { loading, error };
+  return { loading, streaming, error };
 }
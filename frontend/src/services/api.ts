@@ -3,12 +3,15 @@ import type {
   AngleCalcRequest,
   AngleCalcResponse,
   Measurement,
+  ModelTier,
   PoseDataResponse,
   Session,
   TaskStatus,
   User,
   Video,
 } from '../types/api';
+import type { PoseTrack } from '../types/pose';
+import { decodePoseTrack, POSE_BINARY_MEDIA_TYPE } from '../utils/poseTrack';
 
 const api = axios.create({ baseURL: '/api' });
 
@@ -39,18 +42,19 @@ export const deleteSession = (id: string) =>
   api.delete(`/sessions/${id}`);
 
 // Videos
-export const uploadVideo = (sessionId: string, file: File, title?: string, startS?: number, stopS?: number) => {
+export const uploadVideo = (sessionId: string, file: File, title?: string, startS?: number, stopS?: number, modelTier?: ModelTier) => {
   const form = new FormData();
   form.append('session_id', sessionId);
   form.append('file', file);
   if (title) form.append('title', title);
   if (startS !== undefined) form.append('start_s', String(startS));
   if (stopS !== undefined) form.append('stop_s', String(stopS));
+  if (modelTier) form.append('model_tier', modelTier);
   return api.post<Video>('/videos/upload', form).then(r => r.data);
 };
 
-export const importYouTube = (sessionId: string, url: string, title?: string, startS?: number, stopS?: number) =>
-  api.post<Video>('/videos/youtube', { session_id: sessionId, url, title, start_s: startS, stop_s: stopS }).then(r => r.data);
+export const importYouTube = (sessionId: string, url: string, title?: string, startS?: number, stopS?: number, modelTier?: ModelTier) =>
+  api.post<Video>('/videos/youtube', { session_id: sessionId, url, title, start_s: startS, stop_s: stopS, model_tier: modelTier }).then(r => r.data);
 
 export const createWebcamVideo = (sessionId: string, title?: string) =>
   api.post<Video>('/videos/webcam', { session_id: sessionId, title }).then(r => r.data);
@@ -71,8 +75,16 @@ export const deleteVideo = (id: string) =>
   api.delete(`/videos/${id}`);
 
 // Poses
-export const getPoses = (videoId: string, params?: { start_ms?: number; stop_ms?: number; stride?: number }) =>
-  api.get<PoseDataResponse>(`/videos/${videoId}/poses`, { params }).then(r => r.data);
+export type PoseQuery = { start_ms?: number; stop_ms?: number; stride?: number; rate_hz?: number; smooth?: boolean; limit?: number; cursor?: number };
+
+// Fetches the track in the binary layout and decodes it into typed-array views
+export const getPoses = (videoId: string, params?: PoseQuery, signal?: AbortSignal) =>
+  api.get<ArrayBuffer>(`/videos/${videoId}/poses`, {
+    params,
+    responseType: 'arraybuffer',
+    headers: { Accept: POSE_BINARY_MEDIA_TYPE },
+    signal,
+  }).then((r): PoseTrack => decodePoseTrack(r.data));
 
 export const getSingleFrame = (videoId: string, frameIndex: number) =>
   api.get<PoseDataResponse['frames'][0]>(`/videos/${videoId}/poses/${frameIndex}`).then(r => r.data);
@@ -20,6 +20,7 @@ interface AppState {
   // Pose viewer state
   frames: PoseFrame[];
   setFrames: (f: PoseFrame[]) => void;
+  appendFrames: (f: PoseFrame[]) => void;
   currentFrameIndex: number;
   setCurrentFrameIndex: (i: number) => void;
   isPlaying: boolean;
@@ -67,6 +68,7 @@ export const useAppStore = create<AppState>((set) => ({
 
   frames: [],
   setFrames: (frames) => set({ frames, currentFrameIndex: 0 }),
+  appendFrames: (more) => set((s) => ({ frames: s.frames.concat(more) })),
   currentFrameIndex: 0,
   setCurrentFrameIndex: (i) => set({ currentFrameIndex: i }),
   isPlaying: false,
@@ -32,17 +32,21 @@ export interface Video {
   created_at: string;
 }
 
+export type ModelTier = 'auto' | 'lite' | 'full' | 'heavy';
+
 export interface TaskStatus {
   video_id: string;
   status: string;
   progress_pct: number;
   error: string | null;
+  model_tier?: string | null;
 }
 
 export interface PoseDataResponse {
   video_id: string;
   frame_count: number;
   frames: PoseFrame[];
+  next_cursor?: number | null;
 }
 
 export interface AngleCalcRequest {
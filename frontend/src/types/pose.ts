@@ -10,3 +10,14 @@ export interface PoseFrame {
   timestamp_ms: number;
   landmarks: Landmark[];
 }
+
+/** A pose track decoded from the binary poses payload; arrays are views of the response buffer. */
+export interface PoseTrack {
+  frameIndices: Int32Array;
+  timestampsMs: Int32Array;
+  /** frameCount × landmarkCount × (x, y, z, visibility) */
+  landmarks: Float32Array;
+  frameCount: number;
+  landmarkCount: number;
+  nextCursor: number | null;
+}
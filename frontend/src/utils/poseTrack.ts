@@ -0,0 +1,49 @@
+import type { PoseFrame, PoseTrack } from '../types/pose';
+
+export const POSE_BINARY_MEDIA_TYPE = 'application/octet-stream';
+
+const HEADER_BYTES = 16;
+const FIELDS = 4;
+
+/**
+ * Decode the binary poses payload (see backend app/services/pose_payload.py)
+ * without copying: every block is 4-byte aligned, so the typed arrays are
+ * views of `buffer`. The payload is little-endian, as are all browsers' typed arrays.
+ */
+export function decodePoseTrack(buffer: ArrayBuffer): PoseTrack {
+  const header = new DataView(buffer, 0, HEADER_BYTES);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  const version = header.getUint16(4, true);
+  if (magic !== 'KPOS' || version !== 1) throw new Error('Unsupported pose payload');
+  const landmarkCount = header.getUint16(6, true);
+  const frameCount = header.getUint32(8, true);
+  const nextCursor = header.getInt32(12, true);
+
+  return {
+    frameIndices: new Int32Array(buffer, HEADER_BYTES, frameCount),
+    timestampsMs: new Int32Array(buffer, HEADER_BYTES + 4 * frameCount, frameCount),
+    landmarks: new Float32Array(buffer, HEADER_BYTES + 8 * frameCount, frameCount * landmarkCount * FIELDS),
+    frameCount,
+    landmarkCount,
+    nextCursor: nextCursor < 0 ? null : nextCursor,
+  };
+}
+
+/** Frame `i` of a decoded track in the JSON layout. */
+export function trackFrame(track: PoseTrack, i: number): PoseFrame {
+  const base = i * track.landmarkCount * FIELDS;
+  const landmarks = [];
+  for (let j = 0; j < track.landmarkCount; j++) {
+    const k = base + j * FIELDS;
+    const lm = track.landmarks;
+    landmarks.push({ x: lm[k], y: lm[k + 1], z: lm[k + 2], visibility: lm[k + 3] });
+  }
+  return { frame_index: track.frameIndices[i], timestamp_ms: track.timestampsMs[i], landmarks };
+}
+
+/** Every frame of a decoded track in the JSON layout, for the viewer's store. */
+export function trackFrames(track: PoseTrack): PoseFrame[] {
+  const frames = new Array<PoseFrame>(track.frameCount);
+  for (let i = 0; i < track.frameCount; i++) frames[i] = trackFrame(track, i);
+  return frames;
+}
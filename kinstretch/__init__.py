@@ -1 +1 @@
-from kinstretch.models import Landmark, PoseFrame, VideoMetadata, VideoAnalysis
+from kinstretch.models import Landmark, PoseFrame, PoseSequence, VideoMetadata, VideoAnalysis
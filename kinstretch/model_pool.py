@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import mediapipe as mp
+import numpy as np
+
+
+# Landmarkers one extraction job checks out at once: the main one, plus the
+# fill-in one in adaptive mode
+LANDMARKERS_PER_JOB = 2
+
+
+def create_landmarker(model_path: str | Path, **options: Any) -> Any:
+    """Create a VIDEO-mode MediaPipe PoseLandmarker.
+
+    Extra keyword arguments are passed to ``PoseLandmarkerOptions``
+    (e.g. ``num_poses``, ``min_pose_detection_confidence``).
+    """
+    pose_options = mp.tasks.vision.PoseLandmarkerOptions(
+        base_options=mp.tasks.BaseOptions(model_asset_path=str(model_path)),
+        running_mode=mp.tasks.vision.RunningMode.VIDEO,
+        **options,
+    )
+    return mp.tasks.vision.PoseLandmarker.create_from_options(pose_options)
+
+
+class PooledLandmarker:
+    """A PoseLandmarker that can be handed to a sequence of jobs.
+
+    VIDEO mode rejects timestamps that do not increase, and every job starts
+    its own clock near zero. Each checkout therefore shifts the job's
+    timestamps past the last one the underlying landmarker has seen.
+    """
+
+    def __init__(self, landmarker: Any):
+        self._landmarker = landmarker
+        self._offset_ms = 0
+        self._last_ms = -1
+
+    def detect_for_video(self, image: mp.Image, timestamp_ms: int) -> Any:
+        timestamp_ms += self._offset_ms
+        result = self._landmarker.detect_for_video(image, timestamp_ms)
+        self._last_ms = timestamp_ms
+        return result
+
+    def reset(self) -> None:
+        """Prepare for a new job whose timestamps restart from zero.
+
+        A detection on a blank frame drops the pose being tracked from the
+        previous job, so the next job starts with a fresh detection.
+        """
+        blank = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.zeros((64, 64, 3), np.uint8))
+        self._landmarker.detect_for_video(blank, self._last_ms + 1)
+        self._offset_ms = self._last_ms + 2
+        self._last_ms += 1
+
+    def close(self) -> None:
+        self._landmarker.close()
+
+
+class ModelPool:
+    """Process-level pool of pre-initialized pose landmarkers and depth models.
+
+    Models are keyed by model path (or HuggingFace name) and options and are
+    checked out for the length of one job. Up to ``max_idle`` instances per
+    key are kept for reuse (by default enough for one adaptive job); extra
+    concurrent checkouts get a new instance that is closed when it is
+    returned, so callers never wait on the pool.
+    """
+
+    def __init__(self, max_idle: int = LANDMARKERS_PER_JOB, max_idle_depth: int = 1):
+        self.max_idle = max_idle
+        self.max_idle_depth = max_idle_depth
+        self._lock = threading.Lock()
+        self._landmarkers: dict[tuple, list[PooledLandmarker]] = {}
+        self._depth_models: dict[str, list[tuple[Any, Any, str | None]]] = {}
+
+    @staticmethod
+    def _landmarker_key(model_path: str | Path, options: dict[str, Any]) -> tuple:
+        return (str(Path(model_path).resolve()), tuple(sorted(options.items())))
+
+    @contextmanager
+    def landmarker(self, model_path: str | Path, **options: Any) -> Iterator[PooledLandmarker]:
+        """Check out a landmarker for ``model_path``, creating one if none is idle."""
+        key = self._landmarker_key(model_path, options)
+        with self._lock:
+            idle = self._landmarkers.get(key)
+            landmarker = idle.pop() if idle else None
+        if landmarker is None:
+            landmarker = PooledLandmarker(create_landmarker(model_path, **options))
+
+        try:
+            yield landmarker
+        except Exception:
+            # The job failed mid-frame; don't hand this landmarker to another
+            landmarker.close()
+            raise
+        except BaseException:
+            # e.g. GeneratorExit from a consumer that stopped early
+            self._release_landmarker(key, landmarker)
+            raise
+        self._release_landmarker(key, landmarker)
+
+    def _release_landmarker(self, key: tuple, landmarker: PooledLandmarker) -> None:
+        landmarker.reset()
+        with self._lock:
+            idle = self._landmarkers.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(landmarker)
+                return
+        landmarker.close()
+
+    @contextmanager
+    def depth_model(self, model_name: str) -> Iterator[tuple[Any, Any, str | None]]:
+        """Check out a Depth Anything ``(processor, model, device)`` triple.
+
+        Yields ``(None, None, None)`` if torch/transformers are not installed.
+        """
+        from kinstretch.pose_extraction import _load_depth_model
+
+        with self._lock:
+            idle = self._depth_models.get(model_name)
+            depth = idle.pop() if idle else None
+        if depth is None:
+            depth = _load_depth_model(model_name)
+
+        try:
+            yield depth
+        finally:
+            with self._lock:
+                idle = self._depth_models.setdefault(model_name, [])
+                if len(idle) < self.max_idle_depth:
+                    idle.append(depth)
+
+    def warm(
+        self,
+        model_path: str | Path | None = None,
+        depth_model_name: str | None = None,
+        count: int | None = None,
+        **options: Any,
+    ) -> None:
+        """Pre-load ``count`` landmarkers (default ``max_idle``) and depth models."""
+        if model_path is not None:
+            key = self._landmarker_key(model_path, options)
+            n = self.max_idle if count is None else count
+            with self._lock:
+                missing = n - len(self._landmarkers.get(key, []))
+            created = [
+                PooledLandmarker(create_landmarker(model_path, **options))
+                for _ in range(max(missing, 0))
+            ]
+            with self._lock:
+                self._landmarkers.setdefault(key, []).extend(created)
+
+        if depth_model_name is not None:
+            from kinstretch.pose_extraction import _load_depth_model
+
+            with self._lock:
+                missing = self.max_idle_depth - len(self._depth_models.get(depth_model_name, []))
+            created_depth = [_load_depth_model(depth_model_name) for _ in range(max(missing, 0))]
+            with self._lock:
+                self._depth_models.setdefault(depth_model_name, []).extend(created_depth)
+
+    def close(self) -> None:
+        """Close and drop every idle model."""
+        with self._lock:
+            landmarkers = [lm for idle in self._landmarkers.values() for lm in idle]
+            self._landmarkers.clear()
+            self._depth_models.clear()
+        for landmarker in landmarkers:
+            landmarker.close()
+
+
+# Shared pool for the current process. Worker processes of a parallel
+# extraction each get their own, reused across the chunks they handle.
+default_pool = ModelPool()
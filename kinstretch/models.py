@@ -1,3 +1,8 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
+import numpy as np
 from pydantic import BaseModel
 
 
@@ -33,3 +38,90 @@ class VideoAnalysis(BaseModel):
         if not self.poses:
             return 0.0
         return self.poses[-1].timestamp_ms / 1000.0
+
+    def pose_sequence(self) -> PoseSequence:
+        """Return the poses as an array-backed PoseSequence."""
+        return PoseSequence.from_frames(self.poses)
+
+
+class PoseSequence:
+    """Array-backed sequence of pose frames.
+
+    Holds N frames as an ``(N, L, 4)`` float32 ``landmarks`` array of
+    (x, y, z, visibility) rows, with L = 33 for MediaPipe, plus an ``(N,)``
+    int64 ``timestamps_ms`` array sorted ascending. Slicing returns views
+    that share memory with the parent; PoseFrame models are only built when
+    a single frame is indexed or :meth:`to_frames` is called.
+    """
+
+    __slots__ = ("timestamps_ms", "landmarks")
+
+    def __init__(self, timestamps_ms: np.ndarray, landmarks: np.ndarray):
+        timestamps_ms = np.asarray(timestamps_ms, dtype=np.int64)
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        if landmarks.ndim != 3 or landmarks.shape[2] != 4:
+            raise ValueError(f"landmarks must have shape (N, L, 4), got {landmarks.shape}")
+        if timestamps_ms.shape != (landmarks.shape[0],):
+            raise ValueError(
+                f"timestamps_ms has shape {timestamps_ms.shape}, "
+                f"expected ({landmarks.shape[0]},)"
+            )
+        self.timestamps_ms = timestamps_ms
+        self.landmarks = landmarks
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[PoseFrame], n_landmarks: int = 33) -> PoseSequence:
+        """Pack PoseFrame models (or a stream of them) into arrays."""
+        timestamps: list[int] = []
+        rows: list[tuple[float, float, float, float]] = []
+        for frame in frames:
+            timestamps.append(frame.timestamp_ms)
+            rows.extend((lm.x, lm.y, lm.z, lm.visibility) for lm in frame.landmarks)
+            n_landmarks = len(frame.landmarks)
+        landmarks = np.array(rows, dtype=np.float32).reshape(len(timestamps), n_landmarks, 4)
+        return cls(np.array(timestamps, dtype=np.int64), landmarks)
+
+    def to_frames(self) -> list[PoseFrame]:
+        """Convert back to a list of PoseFrame models."""
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.timestamps_ms)
+
+    def __iter__(self) -> Iterator[PoseFrame]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index: int | slice) -> PoseFrame | PoseSequence:
+        if isinstance(index, slice):
+            return PoseSequence(self.timestamps_ms[index], self.landmarks[index])
+        return PoseFrame.model_construct(
+            timestamp_ms=int(self.timestamps_ms[index]),
+            landmarks=[
+                Landmark.model_construct(x=x, y=y, z=z, visibility=v)
+                for x, y, z, v in self.landmarks[index].tolist()
+            ],
+        )
+
+    def time_slice(self, start_ms: float | None = None, stop_ms: float | None = None) -> PoseSequence:
+        """Return the frames with ``start_ms <= timestamp_ms <= stop_ms`` as a view.
+
+        Uses a binary search on the sorted timestamps, so this is O(log N).
+        """
+        lo = 0 if start_ms is None else int(np.searchsorted(self.timestamps_ms, start_ms, side="left"))
+        hi = len(self) if stop_ms is None else int(np.searchsorted(self.timestamps_ms, stop_ms, side="right"))
+        return self[lo:hi]
+
+    def joint(self, index: int) -> np.ndarray:
+        """Return an ``(N, 4)`` view of one landmark's (x, y, z, visibility) over time."""
+        return self.landmarks[:, index, :]
+
+    @property
+    def duration_seconds(self) -> float:
+        if not len(self):
+            return 0.0
+        return float(self.timestamps_ms[-1]) / 1000.0
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps_ms.nbytes + self.landmarks.nbytes
@@ -1,31 +1,61 @@
 from __future__ import annotations
 
+import multiprocessing
+import queue
+import threading
 import urllib.request
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 import cv2
 import mediapipe as mp
 import numpy as np
 
+from kinstretch.model_pool import ModelPool, default_pool
 from kinstretch.models import Landmark, PoseFrame
+from kinstretch.timing import NULL_TIMER, StageTimer
 
-POSE_MODEL_URL = (
-    "https://storage.googleapis.com/mediapipe-models/"
-    "pose_landmarker/pose_landmarker_heavy/float16/1/pose_landmarker_heavy.task"
-)
+T = TypeVar("T")
+
+# MediaPipe pose landmarker variants, fastest and least accurate first
+MODEL_TIERS = ("lite", "full", "heavy")
+DEFAULT_MODEL_TIER = "heavy"
+
+POSE_MODEL_URLS = {
+    tier: (
+        "https://storage.googleapis.com/mediapipe-models/"
+        f"pose_landmarker/pose_landmarker_{tier}/float16/1/pose_landmarker_{tier}.task"
+    )
+    for tier in MODEL_TIERS
+}
+POSE_MODEL_URL = POSE_MODEL_URLS[DEFAULT_MODEL_TIER]
 DEFAULT_MODEL_DIR = Path("models")
 
 
-def download_model(model_dir: str | Path = DEFAULT_MODEL_DIR) -> Path:
-    """Download the MediaPipe pose landmarker model if it doesn't already exist."""
+def model_filename(tier: str = DEFAULT_MODEL_TIER) -> str:
+    """File name of the pose landmarker model for ``tier``."""
+    if tier not in POSE_MODEL_URLS:
+        raise ValueError(f"Unknown model tier {tier!r}; expected one of {', '.join(MODEL_TIERS)}")
+    return f"pose_landmarker_{tier}.task"
+
+
+def download_model(model_dir: str | Path = DEFAULT_MODEL_DIR, tier: str = DEFAULT_MODEL_TIER) -> Path:
+    """Download the MediaPipe pose landmarker model for ``tier`` if it doesn't already exist."""
     model_dir = Path(model_dir)
     model_dir.mkdir(parents=True, exist_ok=True)
-    model_path = model_dir / "pose_landmarker_heavy.task"
+    model_path = model_dir / model_filename(tier)
 
     if not model_path.exists():
         print(f"Downloading pose landmarker model to {model_path}...")
-        urllib.request.urlretrieve(POSE_MODEL_URL, model_path)
+        # Download beside the target and rename, so a concurrent reader never
+        # sees a partially written model file
+        part_path = model_path.with_suffix(".part")
+        urllib.request.urlretrieve(POSE_MODEL_URLS[tier], part_path)
+        part_path.replace(model_path)
         print("Download complete.")
 
     return model_path
@@ -62,51 +92,77 @@ def _load_depth_model(
     return processor, model, device
 
 
-def _estimate_depth(
-    rgb_frame: np.ndarray,
+# Depth Anything V2 works at a 518 px short side; frames are shrunk to this
+# before batching so buffered frames and preprocessing stay small.
+DEPTH_INPUT_SIZE = 518
+
+
+def _prepare_depth_input(bgr_frame: np.ndarray) -> np.ndarray:
+    """Downscale a BGR frame so its short side is at most DEPTH_INPUT_SIZE and convert it to RGB."""
+    H, W = bgr_frame.shape[:2]
+    scale = DEPTH_INPUT_SIZE / min(H, W)
+    if scale < 1.0:
+        size = (max(1, round(W * scale)), max(1, round(H * scale)))
+        bgr_frame = cv2.resize(bgr_frame, size, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
+
+
+def _estimate_depth_batch(
+    rgb_frames: list[np.ndarray],
     processor: Any,
     model: Any,
     device: str,
 ) -> np.ndarray:
-    """Run Depth Anything V2 on one RGB frame; return an (H, W) float32 depth map.
+    """Run Depth Anything V2 on a batch of RGB frames in one forward pass.
+
+    Returns a (K, H', W') float32 array at the model's output resolution. The
+    processor keeps the aspect ratio without cropping, so normalised landmark
+    coordinates index these maps directly and no full-frame upsample is
+    needed. Frames must share one size, which holds for frames of one video.
 
     The model outputs inverse-depth / disparity values: higher value = closer
     to the camera.
     """
     import torch
-    import torch.nn.functional as F
-    from PIL import Image
 
-    H, W = rgb_frame.shape[:2]
-    inputs = processor(images=Image.fromarray(rgb_frame), return_tensors="pt")
+    inputs = processor(images=rgb_frames, return_tensors="pt")
     inputs = {k: v.to(device) for k, v in inputs.items()}
 
     with torch.no_grad():
-        predicted_depth = model(**inputs).predicted_depth  # [1, H', W']
+        predicted_depth = model(**inputs).predicted_depth  # [K, H', W']
 
-    depth = F.interpolate(
-        predicted_depth.unsqueeze(1),
-        size=(H, W),
-        mode="bicubic",
-        align_corners=False,
-    ).squeeze().cpu().numpy()
+    return predicted_depth.cpu().numpy().astype(np.float32)
 
-    return depth.astype(np.float32)
 
+def _sample_depth(depth_map: np.ndarray, xy: np.ndarray) -> np.ndarray:
+    """Bilinearly sample ``depth_map`` at normalised (x, y) points.
 
-def _sample_depth(depth_map: np.ndarray, lm: Landmark) -> float:
+    ``xy`` is an (N, 2) array; returns an (N,) float32 array.
+    """
     H, W = depth_map.shape
-    px = int(min(max(lm.x * W, 0), W - 1))
-    py = int(min(max(lm.y * H, 0), H - 1))
-    return float(depth_map[py, px])
+    # Pixel centres sit at half-integer positions in normalised coordinates
+    fx = np.clip(xy[:, 0] * W - 0.5, 0.0, W - 1.0)
+    fy = np.clip(xy[:, 1] * H - 0.5, 0.0, H - 1.0)
+    x0 = fx.astype(np.intp)
+    y0 = fy.astype(np.intp)
+    x1 = np.minimum(x0 + 1, W - 1)
+    y1 = np.minimum(y0 + 1, H - 1)
+    wx = fx - x0
+    wy = fy - y0
+    top = depth_map[y0, x0] * (1 - wx) + depth_map[y0, x1] * wx
+    bottom = depth_map[y1, x0] * (1 - wx) + depth_map[y1, x1] * wx
+    return (top * (1 - wy) + bottom * wy).astype(np.float32)
 
 
 def _apply_depth_z(
-    landmarks: list[Landmark],
+    landmarks: np.ndarray,
     depth_map: np.ndarray,
-) -> list[Landmark]:
+) -> np.ndarray:
     """Replace each landmark's z with a value derived from the Depth Anything map.
 
+    ``landmarks`` is an (N, 4) array of (x, y, z, visibility) rows; a new array
+    is returned.
+
     Convention: the model outputs disparity (higher = closer to camera).
     MediaPipe z convention: larger z = farther from camera.
     We therefore invert: z_new = (hip_depth − d) * scale, so landmarks
@@ -116,37 +172,722 @@ def _apply_depth_z(
     If the resulting depth looks front-to-back inverted, flip the sign of
     z_scale below.
     """
-    pose_count = min(33, len(landmarks))
-    pose_depths = np.array(
-        [_sample_depth(depth_map, landmarks[i]) for i in range(pose_count)],
-        dtype=np.float32,
-    )
+    depths = _sample_depth(depth_map, landmarks[:, :2])
+    pose_depths = depths[:33]
 
     hip_depth = float(
         (pose_depths[23] + pose_depths[24]) / 2.0
-        if pose_count > 24
+        if len(pose_depths) > 24
         else np.median(pose_depths)
     )
 
     depth_std = float(np.std(pose_depths))
     z_scale = 0.15 / (depth_std + 1e-6)
 
-    result: list[Landmark] = []
-    for lm in landmarks:
-        if lm.visibility > 0:
-            d = _sample_depth(depth_map, lm)
-            z_new = float(np.clip((hip_depth - d) * z_scale, -1.0, 1.0))
-            result.append(Landmark(x=lm.x, y=lm.y, z=z_new, visibility=lm.visibility))
+    result = landmarks.copy()
+    visible = landmarks[:, 3] > 0
+    result[visible, 2] = np.clip((hip_depth - depths[visible]) * z_scale, -1.0, 1.0)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Landmark arrays
+# ---------------------------------------------------------------------------
+
+def _landmarks_to_array(pose_landmarks: list[Any]) -> np.ndarray:
+    """Pack MediaPipe landmarks into an (N, 4) float32 (x, y, z, visibility) array."""
+    return np.array(
+        [(lm.x, lm.y, lm.z, lm.visibility) for lm in pose_landmarks],
+        dtype=np.float32,
+    )
+
+
+def _array_to_pose_frame(timestamp_ms: int, landmarks: np.ndarray) -> PoseFrame:
+    """Build a PoseFrame from an (N, 4) landmark array.
+
+    The values come straight from the model, so validation is skipped.
+    """
+    return PoseFrame.model_construct(
+        timestamp_ms=timestamp_ms,
+        landmarks=[
+            Landmark.model_construct(x=x, y=y, z=z, visibility=v)
+            for x, y, z, v in landmarks.tolist()
+        ],
+    )
+
+
+# ---------------------------------------------------------------------------
+# Frame sampling
+# ---------------------------------------------------------------------------
+
+# Gaps longer than this are crossed with a (keyframe) seek instead of grab()s.
+SEEK_THRESHOLD_FRAMES = 120
+
+
+def stride_for_sample_rate(fps: float, sample_hz: float) -> int:
+    """Return the whole-frame stride closest to ``sample_hz`` samples per second."""
+    if sample_hz <= 0:
+        raise ValueError(f"sample_hz must be positive, got {sample_hz}")
+    return max(1, round(fps / sample_hz))
+
+
+class _FrameReader:
+    """Reads frames of a capture at increasing indices.
+
+    Frames between two reads are skipped with ``grab()``, which demuxes
+    without the colour conversion and copy of ``retrieve()``; gaps longer
+    than ``seek_threshold`` frames are crossed with a seek instead.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, seek_threshold: int = SEEK_THRESHOLD_FRAMES):
+        self.cap = cap
+        self.seek_threshold = seek_threshold
+        self.pos = 0
+
+    def read(self, frame_idx: int) -> np.ndarray | None:
+        """Return the BGR frame at ``frame_idx``, or None past the end of the video."""
+        gap = frame_idx - self.pos
+        if gap < 0 or gap > self.seek_threshold:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
         else:
-            result.append(lm)
+            for _ in range(gap):
+                if not self.cap.grab():
+                    return None
+
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        self.pos = frame_idx + 1
+        return frame
+
+
+def _iter_sampled_frames(
+    cap: cv2.VideoCapture,
+    fps: float,
+    start_frame: int,
+    stop_frame: int | None,
+    stop_ms: float,
+    frame_stride: int,
+    seek_threshold: int = SEEK_THRESHOLD_FRAMES,
+    offset: int = 0,
+    timer: StageTimer = NULL_TIMER,
+) -> Iterator[tuple[int, int, np.ndarray]]:
+    """Yield ``(frame_idx, timestamp_ms, bgr_frame)`` for each sampled frame.
+
+    Only frames whose absolute index is ``offset`` plus a multiple of
+    ``frame_stride`` are decoded; see :class:`_FrameReader` for how the
+    frames in between are skipped.
+    """
+    reader = _FrameReader(cap, seek_threshold)
+    # First sampled index >= start_frame
+    target = offset + -(-(start_frame - offset) // frame_stride) * frame_stride
+
+    while stop_frame is None or target < stop_frame:
+        timestamp_ms = int(1000 * target / fps)
+        if timestamp_ms > stop_ms:
+            return
+
+        with timer.stage("decode"):
+            frame = reader.read(target)
+        if frame is None:
+            return
+
+        yield target, timestamp_ms, frame
+        target += frame_stride
+
+
+# ---------------------------------------------------------------------------
+# Inference input: downscaling and subject crop
+# ---------------------------------------------------------------------------
+
+# Landmarks below this visibility don't count towards the subject's bounding box
+ROI_MIN_VISIBILITY = 0.3
+
+# Crops covering more than this fraction of the frame are not worth making
+ROI_MAX_AREA_FRACTION = 0.8
+
+# A pose this close (in crop-normalised units) to a crop edge is treated as
+# cut off by the crop
+ROI_EDGE_TOLERANCE = 0.02
+
+# Smallest margin around the pose, in normalised units, so small or distant
+# subjects still have room to move between samples
+ROI_MIN_MARGIN = 0.05
+
+
+def _downscale(bgr: np.ndarray, max_side: int | None) -> np.ndarray:
+    """Shrink a frame so its long side is at most ``max_side`` pixels."""
+    if max_side is None:
+        return bgr
+    H, W = bgr.shape[:2]
+    scale = max_side / max(H, W)
+    if scale >= 1.0:
+        return bgr
+    size = (max(1, round(W * scale)), max(1, round(H * scale)))
+    return cv2.resize(bgr, size, interpolation=cv2.INTER_AREA)
+
+
+def _roi_box(
+    landmarks: np.ndarray,
+    width: int,
+    height: int,
+    margin: float,
+) -> tuple[int, int, int, int] | None:
+    """Pixel box ``(x0, y0, x1, y1)`` around a pose, or None to use the whole frame.
+
+    The box is the bounding box of the visible landmarks, grown by ``margin``
+    times its size (at least ``ROI_MIN_MARGIN``) on every side so the subject
+    can move before the next crop is computed.
+    """
+    visible = landmarks[landmarks[:, 3] > ROI_MIN_VISIBILITY, :2]
+    if len(visible) < 2:
+        return None
+    lo = np.clip(visible.min(axis=0), 0.0, 1.0)
+    hi = np.clip(visible.max(axis=0), 0.0, 1.0)
+    pad = np.maximum((hi - lo) * margin, ROI_MIN_MARGIN)
+    lo = np.clip(lo - pad, 0.0, 1.0)
+    hi = np.clip(hi + pad, 0.0, 1.0)
+    if np.prod(hi - lo) > ROI_MAX_AREA_FRACTION:
+        return None
+
+    x0, x1 = int(lo[0] * width), int(np.ceil(hi[0] * width))
+    y0, y1 = int(lo[1] * height), int(np.ceil(hi[1] * height))
+    if x1 - x0 < 16 or y1 - y0 < 16:
+        return None
+    return x0, y0, x1, y1
+
+
+def _cut_off_by_crop(
+    landmarks: np.ndarray,
+    box: tuple[int, int, int, int],
+    width: int,
+    height: int,
+) -> bool:
+    """Whether a pose found in a crop reaches a crop edge that is inside the frame.
+
+    That usually means the subject moved out of the crop and part of the
+    pose is missing, so the full frame should be used instead.
+    """
+    x0, y0, x1, y1 = box
+    visible = landmarks[landmarks[:, 3] > ROI_MIN_VISIBILITY, :2]
+    if not len(visible):
+        return False
+    lo = visible.min(axis=0)
+    hi = visible.max(axis=0)
+    return bool(
+        (x0 > 0 and lo[0] < ROI_EDGE_TOLERANCE)
+        or (y0 > 0 and lo[1] < ROI_EDGE_TOLERANCE)
+        or (x1 < width and hi[0] > 1.0 - ROI_EDGE_TOLERANCE)
+        or (y1 < height and hi[1] > 1.0 - ROI_EDGE_TOLERANCE)
+    )
+
+
+def _uncrop_landmarks(
+    landmarks: np.ndarray,
+    box: tuple[int, int, int, int],
+    width: int,
+    height: int,
+) -> np.ndarray:
+    """Map landmarks detected in a crop back to full-frame normalised coordinates.
+
+    MediaPipe's z shares the scale of x, so it is rescaled by the crop width.
+    """
+    x0, y0, x1, y1 = box
+    result = landmarks.copy()
+    result[:, 0] = (landmarks[:, 0] * (x1 - x0) + x0) / width
+    result[:, 1] = (landmarks[:, 1] * (y1 - y0) + y0) / height
+    result[:, 2] = landmarks[:, 2] * (x1 - x0) / width
     return result
 
 
+class _PoseDetector:
+    """Runs a VIDEO-mode landmarker on frames, optionally shrunk and cropped.
+
+    With ``max_side`` set, frames are downscaled before colour conversion
+    and inference; normalised landmarks don't depend on resolution. With
+    ``roi`` set, each frame is cropped to the previous frame's pose plus
+    ``roi_margin`` and the landmarks are mapped back to the full frame. When
+    nothing is found in the crop, or the pose runs into its edge, the full
+    frame is tried at once, one millisecond later, since VIDEO mode needs
+    increasing timestamps.
+    """
+
+    def __init__(
+        self,
+        landmarker: Any,
+        max_side: int | None = None,
+        roi: bool = False,
+        roi_margin: float = 0.25,
+        timer: StageTimer = NULL_TIMER,
+    ):
+        self.landmarker = landmarker
+        self.max_side = max_side
+        self.roi = roi
+        self.roi_margin = roi_margin
+        self.timer = timer
+        self._prev: np.ndarray | None = None
+
+    def _run(self, bgr: np.ndarray, timestamp_ms: int) -> np.ndarray | None:
+        with self.timer.stage("cvt_color"):
+            rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        with self.timer.stage("detect"):
+            result = self.landmarker.detect_for_video(mp_image, timestamp_ms)
+        if not result.pose_landmarks:
+            return None
+        return _landmarks_to_array(result.pose_landmarks[0])
+
+    def seed(self, landmarks: np.ndarray | None) -> None:
+        """Use ``landmarks`` as the previous pose when cropping the next frame."""
+        self._prev = landmarks
+
+    def detect(self, bgr: np.ndarray, timestamp_ms: int) -> tuple[np.ndarray, np.ndarray | None]:
+        """Return ``(frame, landmarks or None)``; ``frame`` is the downscaled BGR input."""
+        if self.max_side is not None:
+            with self.timer.stage("resize"):
+                bgr = _downscale(bgr, self.max_side)
+        frame = bgr
+        H, W = frame.shape[:2]
+
+        box = None
+        if self.roi and self._prev is not None:
+            box = _roi_box(self._prev, W, H, self.roi_margin)
+
+        landmarks = None
+        if box is not None:
+            x0, y0, x1, y1 = box
+            landmarks = self._run(frame[y0:y1, x0:x1], timestamp_ms)
+            if landmarks is not None and not _cut_off_by_crop(landmarks, box, W, H):
+                landmarks = _uncrop_landmarks(landmarks, box, W, H)
+            else:
+                landmarks = None
+                timestamp_ms += 1
+        if landmarks is None:
+            landmarks = self._run(frame, timestamp_ms)
+
+        self._prev = landmarks
+        return frame, landmarks
+
+
+# ---------------------------------------------------------------------------
+# Motion-adaptive sampling
+# ---------------------------------------------------------------------------
+
+# Grayscale thumbnail size used to measure frame-difference energy
+MOTION_THUMBNAIL_SIZE = (64, 36)
+
+# Landmarks below this visibility are ignored when measuring displacement
+MOTION_MIN_VISIBILITY = 0.5
+
+
+def _motion_thumbnail(bgr: np.ndarray) -> np.ndarray:
+    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, MOTION_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+def _landmark_displacement(a: np.ndarray, b: np.ndarray) -> float:
+    """Mean 2-D distance moved by the joints visible in both poses.
+
+    Distances are in normalized image units. Returns inf when no joint is
+    visible in both, since nothing can then be said about the motion.
+    """
+    visible = np.minimum(a[:, 3], b[:, 3]) > MOTION_MIN_VISIBILITY
+    if not visible.any():
+        return float("inf")
+    return float(np.linalg.norm(b[visible, :2] - a[visible, :2], axis=1).mean())
+
+
+def _is_moving(
+    prev_landmarks: np.ndarray | None,
+    landmarks: np.ndarray | None,
+    prev_thumbnail: np.ndarray,
+    thumbnail: np.ndarray,
+    motion_threshold: float,
+    frame_diff_threshold: float,
+) -> bool:
+    """Whether the interval between two coarse samples should be densified."""
+    if (prev_landmarks is None) != (landmarks is None):
+        # The pose appeared or was lost somewhere in between
+        return True
+    if (
+        landmarks is not None
+        and _landmark_displacement(prev_landmarks, landmarks) > motion_threshold
+    ):
+        return True
+    return float(np.abs(thumbnail - prev_thumbnail).mean()) > frame_diff_threshold
+
+
+def _iter_adaptive_detections(
+    coarse_frames: Iterable[tuple[int, int, np.ndarray]],
+    fill_cap: cv2.VideoCapture,
+    detector: _PoseDetector,
+    fill_detector: _PoseDetector,
+    fps: float,
+    frame_stride: int,
+    motion_threshold: float,
+    frame_diff_threshold: float,
+    stop_frame: int | None = None,
+    stop_ms: float = float("inf"),
+    timer: StageTimer = NULL_TIMER,
+) -> Iterator[tuple[int, np.ndarray, np.ndarray | None]]:
+    """Yield ``(timestamp_ms, frame, landmarks or None)`` with motion-adaptive sampling.
+
+    ``detector`` runs on ``coarse_frames``, the ``(frame_idx, timestamp_ms,
+    frame)`` samples of a coarse pass whose indices lie on the
+    ``frame_stride`` grid. When two consecutive coarse samples differ by more
+    than ``motion_threshold``
+    (landmark displacement) or ``frame_diff_threshold`` (mean absolute
+    grayscale difference, 0-255), the frames between them are filled in at
+    ``frame_stride`` from ``fill_cap`` by ``fill_detector``. The fill side
+    trails the coarse side and only moves forward, so both landmarkers see
+    increasing timestamps and results come out in timestamp order.
+
+    Only frames before ``stop_frame`` (and up to ``stop_ms``) are yielded. A
+    coarse sample at or past ``stop_frame`` (the next range's first one) is
+    only used to decide whether to fill the last interval, so ranges split on
+    the coarse grid give the same result as one pass over the whole video.
+    Without such a sample, the range's last frame on the ``frame_stride``
+    grid closes the last interval instead.
+    """
+    fill_reader = _FrameReader(fill_cap)
+    prev: tuple[int, np.ndarray | None, np.ndarray] | None = None
+
+    def fill(frame_idx: int, landmarks: np.ndarray | None, thumbnail: np.ndarray) -> Iterator[tuple]:
+        """Fill the frames between ``prev`` and ``frame_idx`` if the pose moved."""
+        prev_idx, prev_landmarks, prev_thumbnail = prev
+        with timer.stage("motion"):
+            moving = _is_moving(
+                prev_landmarks, landmarks, prev_thumbnail, thumbnail,
+                motion_threshold, frame_diff_threshold,
+            )
+        if not moving:
+            return
+        # The fill detector last saw an earlier interval; crop from the pose
+        # at the start of this one instead
+        fill_detector.seed(prev_landmarks)
+        for fill_idx in range(prev_idx + frame_stride, frame_idx, frame_stride):
+            with timer.stage("decode"):
+                fill_frame = fill_reader.read(fill_idx)
+            if fill_frame is None:
+                break
+            fill_ms = int(1000 * fill_idx / fps)
+            yield (fill_ms, *fill_detector.detect(fill_frame, fill_ms))
+
+    for frame_idx, timestamp_ms, frame in coarse_frames:
+        with timer.stage("motion"):
+            thumbnail = _motion_thumbnail(frame)
+        frame, landmarks = detector.detect(frame, timestamp_ms)
+
+        if prev is not None:
+            yield from fill(frame_idx, landmarks, thumbnail)
+        if stop_frame is not None and frame_idx >= stop_frame:
+            return
+        yield timestamp_ms, frame, landmarks
+        prev = (frame_idx, landmarks, thumbnail)
+
+    if prev is None:
+        return
+    # No coarse sample closes the last interval: find the range's last frame
+    # on the fine grid (keeping only that one decoded) and close it with that
+    last: tuple[int, int, np.ndarray] | None = None
+    last_idx = prev[0] + frame_stride
+    while stop_frame is None or last_idx < stop_frame:
+        last_ms = int(1000 * last_idx / fps)
+        if last_ms > stop_ms:
+            break
+        with timer.stage("decode"):
+            frame = fill_reader.read(last_idx)
+        if frame is None:
+            break
+        last = (last_idx, last_ms, frame)
+        last_idx += frame_stride
+    if last is None:
+        return
+    frame_idx, timestamp_ms, frame = last
+    with timer.stage("motion"):
+        thumbnail = _motion_thumbnail(frame)
+    frame, landmarks = detector.detect(frame, timestamp_ms)
+    yield from fill(frame_idx, landmarks, thumbnail)
+    yield timestamp_ms, frame, landmarks
+
+
+# ---------------------------------------------------------------------------
+# Pipeline stages
+# ---------------------------------------------------------------------------
+
+# Queue entry kinds
+_ITEM, _DONE, _ERROR = range(3)
+
+
+class _Pipeline:
+    """Runs generator stages in background threads joined by bounded queues.
+
+    Each :meth:`stage` call moves iteration of a generator to its own thread
+    and returns an iterator over its results; a full queue blocks the
+    producer, so memory is bounded by the queue sizes. An exception in a
+    stage is re-raised in whichever thread reads that stage's output.
+    :meth:`close` stops and joins every thread, which must happen before the
+    captures and models the stages use are released.
+
+    With ``threaded=False`` stages run inline in the consumer's thread,
+    which is easier to debug and profile.
+    """
+
+    # How often blocked threads check whether the pipeline was closed
+    POLL_INTERVAL_S = 0.1
+
+    def __init__(self, threaded: bool = True):
+        self.threaded = threaded
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def stage(self, items: Iterator[T], maxsize: int, name: str) -> Iterator[T]:
+        """Produce ``items`` in a new thread, at most ``maxsize`` ahead of the consumer."""
+        if not self.threaded:
+            return items
+
+        q: queue.Queue = queue.Queue(max(maxsize, 1))
+
+        def run() -> None:
+            try:
+                for item in items:
+                    if not self._put(q, (_ITEM, item)):
+                        return
+                self._put(q, (_DONE, None))
+            except BaseException as e:
+                self._put(q, (_ERROR, e))
+            finally:
+                close = getattr(items, "close", None)
+                if close is not None:
+                    close()
+
+        thread = threading.Thread(target=run, name=f"pose-{name}", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return self._drain(q)
+
+    def _put(self, q: queue.Queue, entry: tuple[int, Any]) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(entry, timeout=self.POLL_INTERVAL_S)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _drain(self, q: queue.Queue) -> Iterator[Any]:
+        while True:
+            try:
+                kind, value = q.get(timeout=self.POLL_INTERVAL_S)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise value
+            yield value
+
+    def close(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+
 # ---------------------------------------------------------------------------
 # Main extraction function
 # ---------------------------------------------------------------------------
 
-def extract_poses(
+# Default coarse stride of adaptive sampling, as a multiple of frame_stride
+DEFAULT_COARSE_FACTOR = 4
+
+# Upper bound on the frames one parallel chunk covers (5 min at 30 fps), so a
+# finished chunk waiting to be consumed holds a bounded number of poses.
+MAX_CHUNK_FRAMES = 9000
+
+
+def probe_video(video_path: str | Path) -> tuple[float, int]:
+    """Return ``(fps, frame_count)`` for a video; frame_count is 0 if unknown."""
+    cap = cv2.VideoCapture(str(video_path))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    cap.release()
+    return fps, total_frames
+
+
+def _iter_frame_range(
+    video_path: str | Path,
+    model_path: str | Path,
+    start_frame: int,
+    stop_frame: int | None,
+    stop_ms: float,
+    frame_stride: int,
+    enhance_depth: bool,
+    depth_model_name: str,
+    depth_batch_size: int,
+    adaptive: bool = False,
+    coarse_stride: int | None = None,
+    motion_threshold: float = 0.02,
+    frame_diff_threshold: float = 6.0,
+    max_side: int | None = None,
+    roi: bool = False,
+    roi_margin: float = 0.25,
+    pipelined: bool = True,
+    decode_queue_size: int = 4,
+    detect_queue_size: int = 8,
+    output_queue_size: int = 64,
+    timer: StageTimer = NULL_TIMER,
+    pool: ModelPool | None = None,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield ``(timestamp_ms, (33, 4) landmarks)`` from frames ``[start_frame, stop_frame)`` of one video.
+
+    Opens its own capture and checks a VIDEO-mode landmarker (and depth
+    model) out of ``pool``; without a pool they are created for this call and
+    closed afterwards. A ``stop_frame`` of None reads until the end of the
+    video. Frames are sampled on the absolute frame index, so adjacent ranges
+    never sample the same frame twice or skip one at their shared boundary.
+    In adaptive mode a second capture and landmarker fill in the moving
+    intervals (see :func:`_iter_adaptive_detections`). Frames are shrunk and
+    cropped for inference as described in :class:`_PoseDetector`. With depth enabled,
+    detected frames are held back and sent through the depth model
+    ``depth_batch_size`` at a time.
+
+    Work is split into three stages: decoding, landmark inference, and
+    post-processing (depth). With ``pipelined``
+    each runs in its own thread and the stages are joined by queues of the
+    given sizes, so decoding the next frames overlaps inference on the
+    current one; OpenCV and MediaPipe release the GIL while they work.
+    Time spent in each step is recorded on ``timer``.
+    """
+    if pool is None:
+        # A pool that keeps nothing: models are created here and closed on exit
+        pool = ModelPool(max_idle=0, max_idle_depth=0)
+
+    def detector(landmarker: Any) -> _PoseDetector:
+        return _PoseDetector(
+            landmarker, max_side=max_side, roi=roi, roi_margin=roi_margin, timer=timer,
+        )
+
+    def postprocess(
+        detections: Iterable[tuple[int, np.ndarray, np.ndarray | None]],
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        # (timestamp_ms, landmarks, depth input) awaiting one batched depth pass
+        depth_pending: list[tuple[int, np.ndarray, np.ndarray]] = []
+
+        def flush_depth() -> Iterator[tuple[int, np.ndarray]]:
+            with timer.stage("depth"):
+                depth_maps = _estimate_depth_batch(
+                    [item[2] for item in depth_pending], depth_processor, depth_model_hf, depth_device,
+                )
+                batch = [
+                    (timestamp_ms, _apply_depth_z(landmarks, depth_map))
+                    for (timestamp_ms, landmarks, _), depth_map in zip(depth_pending, depth_maps)
+                ]
+            depth_pending.clear()
+            yield from batch
+
+        for timestamp_ms, frame, landmarks in detections:
+            if landmarks is None:
+                continue
+
+            if depth_processor is None:
+                yield timestamp_ms, landmarks
+                continue
+
+            with timer.stage("depth_prep"):
+                depth_input = _prepare_depth_input(frame)
+            depth_pending.append((timestamp_ms, landmarks, depth_input))
+            if len(depth_pending) >= depth_batch_size:
+                yield from flush_depth()
+
+        if depth_pending:
+            yield from flush_depth()
+
+    with ExitStack() as stack:
+        landmarker = stack.enter_context(pool.landmarker(model_path))
+        depth_processor, depth_model_hf, depth_device = (
+            stack.enter_context(pool.depth_model(depth_model_name))
+            if enhance_depth else (None, None, None)
+        )
+
+        cap = cv2.VideoCapture(str(video_path))
+        stack.callback(cap.release)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+        if adaptive:
+            fill_landmarker = stack.enter_context(pool.landmarker(model_path))
+            fill_cap = cv2.VideoCapture(str(video_path))
+            stack.callback(fill_cap.release)
+
+        # Registered last so the stage threads stop before anything they use
+        # is released
+        pipeline = _Pipeline(threaded=pipelined)
+        stack.callback(pipeline.close)
+
+        if adaptive:
+            # Coarse samples lie on the fine grid, starting at its first frame
+            # in range. One sample past stop_frame is read too, to decide
+            # whether the interval across the boundary is filled
+            first = -(-start_frame // frame_stride) * frame_stride
+            frames = pipeline.stage(_iter_sampled_frames(
+                cap, fps, first, None if stop_frame is None else stop_frame + 1, stop_ms,
+                coarse_stride or frame_stride * DEFAULT_COARSE_FACTOR, offset=first, timer=timer,
+            ), decode_queue_size, "decode")
+            detections = _iter_adaptive_detections(
+                frames, fill_cap, detector(landmarker), detector(fill_landmarker), fps,
+                frame_stride, motion_threshold, frame_diff_threshold,
+                stop_frame=stop_frame, stop_ms=stop_ms, timer=timer,
+            )
+        else:
+            frames = pipeline.stage(_iter_sampled_frames(
+                cap, fps, start_frame, stop_frame, stop_ms, frame_stride, timer=timer,
+            ), decode_queue_size, "decode")
+            pose_detector = detector(landmarker)
+            detections = (
+                (timestamp_ms, *pose_detector.detect(frame, timestamp_ms))
+                for _, timestamp_ms, frame in frames
+            )
+
+        detections = pipeline.stage(detections, detect_queue_size, "inference")
+        yield from pipeline.stage(postprocess(detections), output_queue_size, "postprocess")
+
+
+def _extract_frame_range(
+    *args: Any, timed: bool = False, **kwargs: Any,
+) -> tuple[list[tuple[int, np.ndarray]], dict[str, dict]]:
+    """Worker-process entry point: collect ``_iter_frame_range`` into a list.
+
+    Uses the worker's own default pool, so models loaded for one chunk are
+    reused for the next chunk the same worker picks up. Returns the poses
+    and, with ``timed``, the chunk's stage timings to merge in the parent.
+    """
+    timer = StageTimer() if timed else NULL_TIMER
+    poses = list(_iter_frame_range(*args, **kwargs, timer=timer, pool=default_pool))
+    return poses, timer.summary()
+
+
+def _split_frame_range(
+    start_frame: int,
+    stop_frame: int,
+    n_chunks: int,
+    grid: int = 1,
+    offset: int = 0,
+) -> list[tuple[int, int]]:
+    """Split ``[start_frame, stop_frame)`` into up to ``n_chunks`` contiguous ranges.
+
+    Inner boundaries are rounded to ``offset`` plus a multiple of ``grid``,
+    so that e.g. every adaptive chunk starts on a coarse sample.
+    """
+    n_chunks = max(1, min(n_chunks, stop_frame - start_frame))
+    bounds = np.linspace(start_frame, stop_frame, n_chunks + 1)
+    bounds[1:-1] = offset + np.round((bounds[1:-1] - offset) / grid) * grid
+    bounds = np.clip(bounds.round(), start_frame, stop_frame).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def iter_pose_arrays(
     video_path: str | Path,
     model_path: str | Path | None = None,
     start_s: float | None = None,
@@ -154,86 +895,229 @@ def extract_poses(
     frame_stride: int = 5,
     enhance_depth: bool = False,
     depth_model_name: str = "depth-anything/Depth-Anything-V2-Small-hf",
-) -> list[PoseFrame]:
-    """Extract pose landmarks from a video file using MediaPipe.
+    workers: int = 1,
+    sample_hz: float | None = None,
+    depth_batch_size: int = 8,
+    adaptive: bool = False,
+    coarse_stride: int | None = None,
+    motion_threshold: float = 0.02,
+    frame_diff_threshold: float = 6.0,
+    max_side: int | None = None,
+    roi: bool = False,
+    roi_margin: float = 0.25,
+    pipelined: bool = True,
+    decode_queue_size: int = 4,
+    detect_queue_size: int = 8,
+    output_queue_size: int = 64,
+    timer: StageTimer | None = None,
+    pool: ModelPool | None = None,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield ``(timestamp_ms, landmarks)`` from a video file as they are extracted.
 
-    Args:
-        video_path: Path to the video file.
-        model_path: Path to the MediaPipe pose landmarker model.
-        start_s / stop_s: Time range to process (seconds).
-        frame_stride: Process every Nth frame.
-        enhance_depth: Replace MediaPipe z with depth values from Depth
-            Anything V2, giving more accurate 3-D depth.
-        depth_model_name: HuggingFace model ID for Depth Anything V2.
-
-    Returns:
-        List of PoseFrame objects with 33 landmarks each.
+    Takes the same arguments as :func:`extract_poses`. ``landmarks`` is a
+    (33, 4) float32 (x, y, z, visibility) array, so callers that store or
+    encode the poses never build PoseFrame models. Poses are yielded in
+    timestamp order, so memory stays flat regardless of video length; in
+    parallel mode only about ``workers`` finished chunks are buffered at once.
     """
     if model_path is None:
         model_path = download_model()
     model_path = Path(model_path)
 
-    start_ms = int(start_s * 1000) if start_s is not None else 0
     stop_ms = int(stop_s * 1000) if stop_s is not None else float("inf")
+    fps, total_frames = probe_video(video_path)
 
-    pose_options = mp.tasks.vision.PoseLandmarkerOptions(
-        base_options=mp.tasks.BaseOptions(model_asset_path=str(model_path)),
-        running_mode=mp.tasks.vision.RunningMode.VIDEO,
-    )
+    if sample_hz is not None:
+        frame_stride = stride_for_sample_rate(fps, sample_hz)
 
-    # Load depth model once before the frame loop
-    depth_processor, depth_model_hf, depth_device = (
-        _load_depth_model(depth_model_name) if enhance_depth else (None, None, None)
+    start_frame = int(start_s * fps) if start_s is not None and start_s > 0 else 0
+    stop_frame = total_frames
+    if stop_s is not None:
+        # Last frame whose timestamp is still within stop_ms, plus one
+        last_frame = int(stop_ms * fps / 1000) + 1
+        stop_frame = min(stop_frame, last_frame) if stop_frame else last_frame
+
+    if coarse_stride is not None:
+        # Coarse samples must lie on the fine grid the gaps are filled from
+        coarse_stride = max(1, round(coarse_stride / frame_stride)) * frame_stride
+    elif adaptive:
+        coarse_stride = frame_stride * DEFAULT_COARSE_FACTOR
+
+    extract_kwargs = dict(
+        frame_stride=frame_stride,
+        enhance_depth=enhance_depth,
+        depth_model_name=depth_model_name,
+        depth_batch_size=depth_batch_size,
+        adaptive=adaptive,
+        coarse_stride=coarse_stride,
+        motion_threshold=motion_threshold,
+        frame_diff_threshold=frame_diff_threshold,
+        max_side=max_side,
+        roi=roi,
+        roi_margin=roi_margin,
+        pipelined=pipelined,
+        decode_queue_size=decode_queue_size,
+        detect_queue_size=detect_queue_size,
+        output_queue_size=output_queue_size,
     )
 
-    poses: list[PoseFrame] = []
-    cap = cv2.VideoCapture(str(video_path))
-    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    if workers <= 1 or stop_frame - start_frame <= 1:
+        yield from _iter_frame_range(
+            video_path, model_path, start_frame, None, stop_ms, **extract_kwargs,
+            timer=timer or NULL_TIMER, pool=pool,
+        )
+        return
 
-    if start_s is not None and start_s > 0:
-        start_frame = int(start_s * fps)
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-        frame_idx = start_frame
+    n_chunks = max(workers, -(-(stop_frame - start_frame) // MAX_CHUNK_FRAMES))
+    if adaptive:
+        # Chunks start on the coarse grid of a serial pass, so each one
+        # samples the same coarse frames and the boundary intervals are
+        # decided from the same pair of samples
+        first = -(-start_frame // frame_stride) * frame_stride
+        chunks = _split_frame_range(start_frame, stop_frame, n_chunks, grid=coarse_stride, offset=first)
     else:
-        frame_idx = 0
+        chunks = _split_frame_range(start_frame, stop_frame, n_chunks)
+    # The container's frame count is only an estimate for some codecs, so the
+    # last chunk reads on to the real end of the stream.
+    chunks[-1] = (chunks[-1][0], None)
 
-    with mp.tasks.vision.PoseLandmarker.create_from_options(pose_options) as landmarker:
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
+    # spawn, not fork: MediaPipe and OpenCV keep native threads that do not
+    # survive a fork of a multithreaded parent (e.g. the FastAPI thread pool).
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=ctx) as executor:
+        pending: deque[Future[tuple[list[tuple[int, np.ndarray]], dict[str, dict]]]] = deque()
 
-            timestamp_ms = int(1000 * frame_idx / fps)
+        def next_chunk() -> list[tuple[int, np.ndarray]]:
+            poses, timings = pending.popleft().result()
+            if timer is not None:
+                timer.merge(timings)
+            return poses
 
-            if timestamp_ms > stop_ms:
-                break
+        for chunk_start, chunk_stop in chunks:
+            pending.append(executor.submit(
+                _extract_frame_range,
+                video_path, model_path, chunk_start, chunk_stop, stop_ms, **extract_kwargs,
+                timed=timer is not None,
+            ))
+            if len(pending) > workers:
+                yield from next_chunk()
+        while pending:
+            yield from next_chunk()
 
-            if frame_idx % frame_stride != 0:
-                frame_idx += 1
-                continue
 
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
-            result = landmarker.detect_for_video(mp_image, timestamp_ms)
-
-            if result.pose_landmarks:
-                landmarks: list[Landmark] = [
-                    Landmark(
-                        x=lm.x,
-                        y=lm.y,
-                        z=lm.z,
-                        visibility=lm.visibility,
-                    )
-                    for lm in result.pose_landmarks[0]
-                ]
+def iter_poses(*args: Any, timer: StageTimer | None = None, **kwargs: Any) -> Iterator[PoseFrame]:
+    """Yield PoseFrame models from a video file as they are extracted.
 
-                if depth_processor is not None:
-                    depth_map = _estimate_depth(rgb, depth_processor, depth_model_hf, depth_device)
-                    landmarks = _apply_depth_z(landmarks, depth_map)
+    Takes the same arguments as :func:`extract_poses`; see :func:`iter_pose_arrays`.
+    """
+    stage_timer = timer or NULL_TIMER
+    for timestamp_ms, landmarks in iter_pose_arrays(*args, timer=timer, **kwargs):
+        with stage_timer.stage("pose_frame"):
+            pose_frame = _array_to_pose_frame(timestamp_ms, landmarks)
+        yield pose_frame
 
-                poses.append(PoseFrame(timestamp_ms=timestamp_ms, landmarks=landmarks))
 
-            frame_idx += 1
+def extract_poses(
+    video_path: str | Path,
+    model_path: str | Path | None = None,
+    start_s: float | None = None,
+    stop_s: float | None = None,
+    frame_stride: int = 5,
+    enhance_depth: bool = False,
+    depth_model_name: str = "depth-anything/Depth-Anything-V2-Small-hf",
+    workers: int = 1,
+    sample_hz: float | None = None,
+    depth_batch_size: int = 8,
+    adaptive: bool = False,
+    coarse_stride: int | None = None,
+    motion_threshold: float = 0.02,
+    frame_diff_threshold: float = 6.0,
+    max_side: int | None = None,
+    roi: bool = False,
+    roi_margin: float = 0.25,
+    pipelined: bool = True,
+    decode_queue_size: int = 4,
+    detect_queue_size: int = 8,
+    output_queue_size: int = 64,
+    timer: StageTimer | None = None,
+    pool: ModelPool | None = None,
+) -> list[PoseFrame]:
+    """Extract pose landmarks from a video file using MediaPipe.
 
-    cap.release()
-    return poses
+    Args:
+        video_path: Path to the video file.
+        model_path: Path to the MediaPipe pose landmarker model. Defaults to
+            the heavy tier, downloaded if needed (see :func:`download_model`).
+        start_s / stop_s: Time range to process (seconds).
+        frame_stride: Process every Nth frame. Ignored when ``sample_hz``
+            is given.
+        enhance_depth: Replace MediaPipe z with depth values from Depth
+            Anything V2, giving more accurate 3-D depth.
+        depth_model_name: HuggingFace model ID for Depth Anything V2.
+        depth_batch_size: Frames per Depth Anything forward pass when
+            ``enhance_depth`` is set.
+        pool: ModelPool to check the landmarker and depth model out of, so
+            they are reused across calls. Without one they are loaded for
+            this call only. Parallel workers always use their own pools.
+        workers: Number of worker processes. With more than one, the time
+            range is cut into contiguous chunks that are extracted in
+            parallel (each worker owns its capture and landmarker) and
+            stitched back together in timestamp order.
+        sample_hz: Target sampling rate in samples per second. Converted to
+            the nearest whole-frame stride for the video's frame rate, so
+            24 fps and 60 fps sources get the same temporal density.
+        adaptive: Sample at ``coarse_stride`` first and fall back to
+            ``frame_stride`` only between coarse samples where the pose
+            moved, so static holds cost far fewer inference calls.
+        coarse_stride: Stride of the first adaptive pass, rounded to a
+            multiple of ``frame_stride``. Defaults to four times it.
+        motion_threshold: Mean joint displacement (normalized image units)
+            between coarse samples above which the interval is densified.
+        frame_diff_threshold: Mean absolute grayscale difference (0-255)
+            between coarse samples above which the interval is densified,
+            which also catches motion the landmarks miss.
+        max_side: Downscale frames so their long side is at most this many
+            pixels before inference. Landmarks are normalised, so stored
+            coordinates are unaffected.
+        roi: Crop each frame to the previous frame's pose before inference
+            and map the landmarks back to full-frame coordinates.
+        roi_margin: Margin added around the previous pose's bounding box,
+            as a fraction of its size.
+        pipelined: Run decoding, inference and post-processing in separate
+            threads connected by bounded queues, so they overlap.
+        decode_queue_size / detect_queue_size / output_queue_size: Maximum
+            number of decoded frames, detections and finished poses each
+            stage may run ahead of the next. Decoded frames are full size,
+            so keep the first small for high-resolution sources.
+        timer: StageTimer that collects the time spent decoding, resizing,
+            converting colour, detecting, estimating depth and building
+            PoseFrames; parallel workers' timings are merged into it.
+
+    Returns:
+        List of PoseFrame objects with 33 landmarks each.
+    """
+    return list(iter_poses(
+        video_path,
+        model_path=model_path,
+        start_s=start_s,
+        stop_s=stop_s,
+        frame_stride=frame_stride,
+        enhance_depth=enhance_depth,
+        depth_model_name=depth_model_name,
+        workers=workers,
+        sample_hz=sample_hz,
+        depth_batch_size=depth_batch_size,
+        adaptive=adaptive,
+        coarse_stride=coarse_stride,
+        motion_threshold=motion_threshold,
+        frame_diff_threshold=frame_diff_threshold,
+        max_side=max_side,
+        roi=roi,
+        roi_margin=roi_margin,
+        pipelined=pipelined,
+        decode_queue_size=decode_queue_size,
+        detect_queue_size=detect_queue_size,
+        output_queue_size=output_queue_size,
+        timer=timer,
+        pool=pool,
+    ))
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import numpy as np
+
+from kinstretch.models import PoseSequence
+
+# Gaps between consecutive samples wider than this (frames with no detected
+# pose) are not bridged by interpolation when resampling.
+DEFAULT_MAX_GAP_MS = 500
+
+
+# ---------------------------------------------------------------------------
+# Smoothing
+# ---------------------------------------------------------------------------
+
+
+def smooth(seq: PoseSequence, window: int = 7, polyorder: int = 2) -> PoseSequence:
+    """Smooth landmark positions with a Savitzky-Golay style local polynomial fit.
+
+    Each frame's x, y, z are replaced by the value at that frame of a
+    least-squares polynomial fitted over the ``window`` nearest frames. The fit
+    is done against the actual timestamps, so tracks with uneven spacing
+    (adaptive sampling, dropped detections) are handled; on evenly spaced
+    frames it is the classic Savitzky-Golay filter. Near the ends the window
+    shifts inwards rather than padding. Visibility is left unchanged.
+
+    Args:
+        seq: Pose track to smooth.
+        window: Number of frames in each fit.
+        polyorder: Degree of the fitted polynomial; must be below ``window``.
+
+    Returns:
+        A new PoseSequence with the same timestamps.
+    """
+    if polyorder >= window:
+        raise ValueError(f"polyorder ({polyorder}) must be less than window ({window})")
+    n = len(seq)
+    if n < 3:
+        return PoseSequence(seq.timestamps_ms.copy(), seq.landmarks.copy())
+    window = min(window, n)
+    polyorder = min(polyorder, window - 1)
+
+    # (N, W) indices of the frames in each fit
+    starts = np.clip(np.arange(n) - window // 2, 0, n - window)
+    idx = starts[:, None] + np.arange(window)
+
+    # Time offsets from the centre frame, scaled per row to keep the
+    # Vandermonde matrices well conditioned
+    t = seq.timestamps_ms.astype(np.float64)
+    dt = t[idx] - t[:, None]
+    scale = np.abs(dt).max(axis=1, keepdims=True)
+    scale[scale == 0] = 1.0
+    vander = (dt / scale)[..., None] ** np.arange(polyorder + 1)
+
+    # Row 0 of each pseudo-inverse gives the fitted value at dt = 0
+    weights = np.linalg.pinv(vander)[:, 0, :].astype(np.float32)
+
+    landmarks = seq.landmarks.copy()
+    landmarks[:, :, :3] = np.einsum("nw,nwlc->nlc", weights, seq.landmarks[idx, :, :3])
+    return PoseSequence(seq.timestamps_ms.copy(), landmarks)
+
+
+# ---------------------------------------------------------------------------
+# Resampling
+# ---------------------------------------------------------------------------
+
+
+def resample(
+    seq: PoseSequence,
+    rate_hz: float,
+    max_gap_ms: float = DEFAULT_MAX_GAP_MS,
+) -> PoseSequence:
+    """Resample a sparse pose track to ``rate_hz`` frames per second.
+
+    Positions use cubic Hermite interpolation with tangents from finite
+    differences over the actual timestamps (a Catmull-Rom spline for evenly
+    spaced frames), so motion stays smooth between the extracted frames.
+    Visibility is interpolated linearly. Output frames that fall in a gap
+    wider than ``max_gap_ms`` are dropped instead of being invented.
+
+    Args:
+        seq: Pose track with ascending timestamps. Of several frames with
+            the same timestamp only the first is used.
+        rate_hz: Output frame rate.
+        max_gap_ms: Widest gap between input frames to interpolate across.
+
+    Returns:
+        A new PoseSequence on a regular ``1000 / rate_hz`` ms grid starting at
+        the first input timestamp.
+    """
+    if rate_hz <= 0:
+        raise ValueError(f"rate_hz must be positive, got {rate_hz}")
+    if np.any(np.diff(seq.timestamps_ms) < 0):
+        raise ValueError("timestamps_ms must be ascending")
+    # Repeated timestamps would give zero-length segments to divide by
+    _, first = np.unique(seq.timestamps_ms, return_index=True)
+    if len(first) < len(seq):
+        seq = PoseSequence(seq.timestamps_ms[first], seq.landmarks[first])
+    n = len(seq)
+    if n < 2:
+        return PoseSequence(seq.timestamps_ms.copy(), seq.landmarks.copy())
+
+    t = seq.timestamps_ms.astype(np.float64)
+    out_t = np.arange(t[0], t[-1] + 1e-6, 1000.0 / rate_hz)
+
+    # Segment [t[i], t[i + 1]] containing each output time
+    i = np.clip(np.searchsorted(t, out_t, side="right") - 1, 0, n - 2)
+    h = t[i + 1] - t[i]
+    u = (out_t - t[i]) / h
+    keep = (h <= max_gap_ms) | (u <= 0.0) | (u >= 1.0)
+    i, h, u, out_t = i[keep], h[keep], u[keep], out_t[keep]
+
+    positions = seq.landmarks[:, :, :3].astype(np.float64)
+    tangents = np.gradient(positions, t, axis=0)
+
+    u2, u3 = u * u, u * u * u
+    h00 = (2 * u3 - 3 * u2 + 1)[:, None, None]
+    h10 = ((u3 - 2 * u2 + u) * h)[:, None, None]
+    h01 = (-2 * u3 + 3 * u2)[:, None, None]
+    h11 = ((u3 - u2) * h)[:, None, None]
+
+    landmarks = np.empty((len(out_t), seq.landmarks.shape[1], 4), dtype=np.float32)
+    landmarks[:, :, :3] = (
+        h00 * positions[i] + h10 * tangents[i] + h01 * positions[i + 1] + h11 * tangents[i + 1]
+    )
+    visibility = seq.landmarks[:, :, 3]
+    landmarks[:, :, 3] = (
+        (1 - u)[:, None] * visibility[i] + u[:, None] * visibility[i + 1]
+    )
+    return PoseSequence(np.rint(out_t).astype(np.int64), landmarks)
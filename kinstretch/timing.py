@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """Accumulates wall-clock time per named processing stage.
+
+    Each stage keeps its total time, number of timed calls and slowest call,
+    so per-frame costs can be read off stages that run once per frame.
+    Thread-safe: pipeline stages running in different threads can share
+    one timer.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # name -> [total_s, count, max_s]
+        self._stages: dict[str, list[float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one call of stage ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float, count: int = 1) -> None:
+        """Record ``count`` calls of stage ``name`` that took ``seconds`` in total."""
+        with self._lock:
+            entry = self._stages.setdefault(name, [0.0, 0, 0.0])
+            entry[0] += seconds
+            entry[1] += count
+            entry[2] = max(entry[2], seconds / max(count, 1))
+
+    def merge(self, summary: dict[str, dict]) -> None:
+        """Add the stages of another timer's :meth:`summary` (e.g. from a worker process)."""
+        with self._lock:
+            for name, s in summary.items():
+                entry = self._stages.setdefault(name, [0.0, 0, 0.0])
+                entry[0] += s["total_s"]
+                entry[1] += s["count"]
+                entry[2] = max(entry[2], s["max_ms"] / 1000)
+
+    def summary(self) -> dict[str, dict]:
+        """Return ``{stage: {total_s, count, mean_ms, max_ms}}`` in first-seen order."""
+        with self._lock:
+            return {
+                name: {
+                    "total_s": round(total, 6),
+                    "count": int(count),
+                    "mean_ms": round(1000 * total / count, 4) if count else 0.0,
+                    "max_ms": round(1000 * max_s, 4),
+                }
+                for name, (total, count, max_s) in self._stages.items()
+            }
+
+
+class NullTimer(StageTimer):
+    """A StageTimer that records nothing, used when timing is off."""
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        yield
+
+    def add(self, name: str, seconds: float, count: int = 1) -> None:
+        pass
+
+
+NULL_TIMER = NullTimer()
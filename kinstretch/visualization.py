@@ -6,7 +6,7 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from IPython.display import HTML, display
 
-from kinstretch.models import Landmark, PoseFrame
+from kinstretch.models import Landmark, PoseFrame, PoseSequence
 
 # Full MediaPipe 33-landmark pose connections
 POSE_CONNECTIONS: list[tuple[int, int]] = [
@@ -30,13 +30,18 @@ VISIBILITY_THRESHOLD = 0.3
 
 
 def _filter_by_time(
-    poses: list[PoseFrame],
+    poses: list[PoseFrame] | PoseSequence,
     start_s: float | None,
     stop_s: float | None,
-) -> list[PoseFrame]:
-    """Return the subset of poses within [start_s, stop_s] (in seconds)."""
+) -> list[PoseFrame] | PoseSequence:
+    """Return the subset of poses within [start_s, stop_s] (in seconds).
+
+    A PoseSequence is sliced with a binary search and returned as a view.
+    """
     start_ms = int(start_s * 1000) if start_s is not None else 0
     stop_ms = int(stop_s * 1000) if stop_s is not None else float("inf")
+    if isinstance(poses, PoseSequence):
+        return poses.time_slice(start_ms, stop_ms)
     return [p for p in poses if start_ms <= p.timestamp_ms <= stop_ms]
 
 
@@ -95,7 +100,7 @@ def plot_pose(
 
 
 def animate_poses(
-    poses: list[PoseFrame],
+    poses: list[PoseFrame] | PoseSequence,
     start_s: float | None = None,
     stop_s: float | None = None,
     interval: int = 200,
@@ -106,7 +111,7 @@ def animate_poses(
     """Animate a sequence of pose frames with 2D wireframe and 3D scatter views.
 
     Args:
-        poses: List of PoseFrame objects.
+        poses: List of PoseFrame objects or a PoseSequence.
         start_s: Start time in seconds. If None, starts from the beginning.
         stop_s: Stop time in seconds. If None, goes to the end.
         interval: Milliseconds between frames in the animation.
@@ -118,7 +123,7 @@ def animate_poses(
         The FuncAnimation object (keep a reference to prevent garbage collection).
     """
     poses = _filter_by_time(poses, start_s, stop_s)
-    if not poses:
+    if not len(poses):
         raise ValueError(
             f"No poses found in range [{start_s}s, {stop_s}s]. "
             f"Video timestamps may not overlap with this range."
@@ -189,7 +194,7 @@ def animate_poses(
 
 
 def plot_joint_progression(
-    poses: list[PoseFrame],
+    poses: list[PoseFrame] | PoseSequence,
     joint_indices: list[int] | None = None,
     start_s: float | None = None,
     stop_s: float | None = None,
@@ -198,7 +203,7 @@ def plot_joint_progression(
     """Plot X/Y trajectories of selected joints over time.
 
     Args:
-        poses: List of PoseFrame objects.
+        poses: List of PoseFrame objects or a PoseSequence.
         joint_indices: Landmark indices to plot. Defaults to shoulders and hips
             [11, 12, 23, 24].
         start_s: Start time in seconds. If None, starts from the beginning.
@@ -208,6 +213,8 @@ def plot_joint_progression(
     Returns:
         The Figure object.
     """
+    if not isinstance(poses, PoseSequence):
+        poses = PoseSequence.from_frames(poses)
     poses = _filter_by_time(poses, start_s, stop_s)
     if joint_indices is None:
         joint_indices = [11, 12, 23, 24]
@@ -224,17 +231,13 @@ def plot_joint_progression(
         27: "Left Ankle", 28: "Right Ankle",
     }
 
+    times = poses.timestamps_ms / 1000
     for i, joint_idx in enumerate(joint_indices[:4]):
-        times, xs, ys = [], [], []
-        for pose in poses:
-            lm = pose.landmarks[joint_idx]
-            times.append(pose.timestamp_ms / 1000)
-            xs.append(lm.x)
-            ys.append(lm.y)
+        joint = poses.joint(joint_idx)
 
         name = joint_names.get(joint_idx, f"Joint {joint_idx}")
-        axes_flat[i].plot(times, xs, "o-", label="X", alpha=0.7, markersize=2)
-        axes_flat[i].plot(times, ys, "s-", label="Y", alpha=0.7, markersize=2)
+        axes_flat[i].plot(times, joint[:, 0], "o-", label="X", alpha=0.7, markersize=2)
+        axes_flat[i].plot(times, joint[:, 1], "s-", label="Y", alpha=0.7, markersize=2)
         axes_flat[i].set_title(name)
         axes_flat[i].set_xlabel("Time (s)")
         axes_flat[i].legend()
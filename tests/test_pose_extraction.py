@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+import kinstretch.model_pool
+from benchmarks.extraction import StubLandmarker, install_stub
+from benchmarks.synthetic import VideoSpec, write_video
+from kinstretch import pose_extraction
+from kinstretch.pose_extraction import _split_frame_range, iter_pose_arrays
+
+
+@pytest.mark.parametrize("start, stop, n_chunks", [(0, 100, 3), (7, 1000, 4), (0, 5, 10), (10, 11, 2)])
+def test_split_frame_range_covers_the_range(start, stop, n_chunks):
+    chunks = _split_frame_range(start, stop, n_chunks)
+    assert chunks[0][0] == start and chunks[-1][1] == stop
+    assert all(a < b for a, b in chunks)
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(chunks, chunks[1:]))
+    assert len(chunks) == min(n_chunks, stop - start)
+
+
+def test_split_frame_range_aligns_inner_bounds_to_the_grid():
+    chunks = _split_frame_range(3, 1003, 4, grid=20, offset=5)
+    assert chunks[0][0] == 3 and chunks[-1][1] == 1003
+    assert all((a - 5) % 20 == 0 for a, _ in chunks[1:])
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(chunks, chunks[1:]))
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    return write_video(VideoSpec("test", 160, 120, 30, 10), tmp_path_factory.mktemp("videos") / "test.mp4")
+
+
+@pytest.fixture
+def stub_landmarker(monkeypatch):
+    monkeypatch.setattr(kinstretch.model_pool, "create_landmarker", lambda model_path, **options: StubLandmarker())
+    # Spawned workers start from a fresh interpreter, so they install it too
+    workers = functools.partial(ProcessPoolExecutor, initializer=install_stub)
+    monkeypatch.setattr(pose_extraction, "ProcessPoolExecutor", workers)
+    # Several chunks per worker even on a short video
+    monkeypatch.setattr(pose_extraction, "MAX_CHUNK_FRAMES", 70)
+
+
+def _extract(video, **options) -> tuple[list[int], np.ndarray]:
+    poses = list(iter_pose_arrays(video, "stub.task", **options))
+    return [t for t, _ in poses], np.stack([lm for _, lm in poses])
+
+
+@pytest.mark.usefixtures("stub_landmarker")
+@pytest.mark.parametrize("options", [
+    {},
+    {"start_s": 1.1, "stop_s": 8.3},
+    {"adaptive": True, "frame_diff_threshold": 2.0},
+    {"adaptive": True, "frame_diff_threshold": 0.5, "coarse_stride": 15},
+    {"adaptive": True, "frame_diff_threshold": 1.0, "start_s": 1.1, "stop_s": 8.3},
+])
+def test_parallel_extraction_matches_serial(video, options):
+    serial_ms, serial_landmarks = _extract(video, **options)
+    for workers in (2, 3):
+        parallel_ms, parallel_landmarks = _extract(video, workers=workers, **options)
+        assert parallel_ms == serial_ms
+        np.testing.assert_array_equal(parallel_landmarks, serial_landmarks)
+
+
+@pytest.mark.usefixtures("stub_landmarker")
+def test_adaptive_closes_the_last_interval(video):
+    fine_ms, _ = _extract(video, frame_stride=5)
+    adaptive_ms, _ = _extract(video, frame_stride=5, adaptive=True, frame_diff_threshold=1e9)
+    # Nothing moves by that threshold, so only the coarse samples and the
+    # range's last fine-grid frame are detected
+    assert len(adaptive_ms) < len(fine_ms)
+    assert adaptive_ms[-1] == fine_ms[-1]
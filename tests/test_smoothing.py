@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from kinstretch.models import PoseSequence
+from kinstretch.smoothing import resample, smooth
+
+
+def _sequence(timestamps_ms: list[int], seed: int = 0) -> PoseSequence:
+    rng = np.random.default_rng(seed)
+    return PoseSequence(np.array(timestamps_ms), rng.random((len(timestamps_ms), 33, 4), dtype=np.float32))
+
+
+def test_resample_regular_grid_hits_input_samples():
+    seq = _sequence([0, 100, 200, 300])
+    out = resample(seq, rate_hz=20)
+    assert out.timestamps_ms.tolist() == [0, 50, 100, 150, 200, 250, 300]
+    np.testing.assert_allclose(out.landmarks[::2], seq.landmarks, atol=1e-6)
+
+
+def test_resample_keeps_first_of_repeated_timestamps():
+    seq = _sequence([0, 33, 33, 66, 100])
+    out = resample(seq, rate_hz=30)
+    assert np.isfinite(out.landmarks).all()
+    assert out.timestamps_ms.tolist() == [0, 33, 67, 100]
+    np.testing.assert_allclose(out.landmarks[1], seq.landmarks[1], atol=1e-2)
+
+
+def test_resample_all_repeated_timestamps_returns_one_frame():
+    out = resample(_sequence([5, 5, 5]), rate_hz=30)
+    assert out.timestamps_ms.tolist() == [5]
+
+
+def test_resample_rejects_out_of_order_timestamps():
+    with pytest.raises(ValueError, match="ascending"):
+        resample(_sequence([0, 50, 20, 60]), rate_hz=30)
+
+
+def test_resample_does_not_bridge_wide_gaps():
+    out = resample(_sequence([0, 100, 2000, 2100]), rate_hz=10, max_gap_ms=500)
+    assert out.timestamps_ms.tolist() == [0, 100, 2000, 2100]
+
+
+def test_smooth_keeps_timestamps_and_visibility():
+    seq = _sequence([0, 40, 80, 160, 200, 240, 280, 320])
+    out = smooth(seq, window=5, polyorder=2)
+    np.testing.assert_array_equal(out.timestamps_ms, seq.timestamps_ms)
+    np.testing.assert_array_equal(out.landmarks[:, :, 3], seq.landmarks[:, :, 3])